@@ -1,32 +1,100 @@
-from PySide6.QtWidgets import QMainWindow, QSplitter, QWidget, QMessageBox
-from PySide6.QtCore import Qt, QThread, Signal, Slot
+from PySide6.QtWidgets import QLabel, QMainWindow, QSplitter, QWidget, QMessageBox
+from PySide6.QtCore import Qt, QEvent, QThread, QTimer, Signal, Slot
 
-from dataclasses import asdict
-import selectors
+from dataclasses import asdict, replace
+import os
+import select
 import threading
-from API.src.TempSensor import TempSensor
-from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_THR_EDGE, SimTempError, SimTempTimeoutError
-
+import time
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+
+from API.src.AcquisitionProcess import AcquisitionOptions, AcquisitionProcess
+from API.src.AlertEngine import AlertTransition
+from API.src.AnomalyDetector import AnomalyEvent
+from API.src.DriverStats import StatsPoller, StatsSnapshot
+from API.src.LoadShedding import BackpressureMonitor, FrameLoadMonitor
+from API.src.NoiseSpectrum import SpectrumStage
+from API.src.RemoteTempSensor import RemoteTempSensor
+from API.src.SampleBatch import SampleBatch, SampleRecord
+from API.src.SampleBus import SampleBus
+from API.src.SamplePipeline import AlertStage, AnomalyStage, BusSink, SamplePipeline
+from API.src.TempSensor import ConfigApplyError, DriverConfig, TempSensor
+from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_THR_EDGE, SimTempError
+
+from API.views.Dashboard.dashboard_page import SensorTile
+from API.views.render_scheduler import RenderScheduler
 from API.views.side_menu import SideMenu
 from API.views.work_area import WorkArea
 
+# How long a dashboard feed waits before trying to reconnect to its broadcaster.
+_DASHBOARD_RETRY_MS = 5000
+
+
+class _Wakeup:
+    """A descriptor a selector can wait on; `notify()` makes it readable from any thread."""
+
+    def __init__(self) -> None:
+        if hasattr(os, "eventfd"):
+            self._read_fd = self._write_fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        else:
+            self._read_fd, self._write_fd = os.pipe()
+            os.set_blocking(self._read_fd, False)
+            os.set_blocking(self._write_fd, False)
+
+    def fileno(self) -> int:
+        return self._read_fd
+
+    def notify(self) -> None:
+        try:
+            if self._read_fd == self._write_fd:
+                os.eventfd_write(self._write_fd, 1)
+            else:
+                os.write(self._write_fd, b"\0")
+        except BlockingIOError:
+            pass  # already readable
+
+    def clear(self) -> None:
+        try:
+            while os.read(self._read_fd, 64):
+                pass
+        except BlockingIOError:
+            pass
+
 
 class _ContinuousStreamWorker(QThread):
-    """Background worker that listens for POLLIN events and emits samples."""
+    """Background worker that listens for POLLIN/POLLPRI events and runs sample batches through the pipeline."""
 
-    sample_ready = Signal(dict)
     error = Signal(str)
-
-    def __init__(self, sensor: TempSensor, parent: QWidget | None = None) -> None:
+    # Threshold crossings bypass the bus; the payload is the crossing SampleRecord.
+    threshold_alert = Signal(object)
+
+    def __init__(
+        self,
+        sensor: TempSensor | RemoteTempSensor,
+        pipeline: SamplePipeline,
+        parent: QWidget | None = None,
+        *,
+        acquisition: Optional[AcquisitionProcess] = None,
+    ) -> None:
         super().__init__(parent)
+        # With an acquisition process the device is read there and this thread only collects its output;
+        # stop_stream() only pauses the process, so restarting the stream does not respawn it.
         self._sensor = sensor
+        self._acquisition = acquisition
+        self._pipeline = pipeline
         self._stop_event = threading.Event()
+        # Lets stop_stream() interrupt poll() at once, so the loop can wait without a timeout.
+        self._wakeup = _Wakeup()
 
     def start_stream(self) -> None:
         """Initialize and start the worker thread if not running."""
         if self.isRunning():
             return
         self._stop_event.clear()
+        self._wakeup.clear()
         self.start()
 
     def stop_stream(self) -> None:
@@ -34,46 +102,79 @@ class _ContinuousStreamWorker(QThread):
         if not self.isRunning():
             return
         self._stop_event.set()
+        self._wakeup.notify()
         self.wait(1000)
 
+    def release(self) -> None:
+        """Stop the worker and the acquisition process for good."""
+        self.stop_stream()
+        if self._acquisition is not None:
+            self._acquisition.close()
+
     def run(self) -> None:
-        try:
-            fd = self._sensor.driver.fileno()
-        except SimTempError as exc:
-            self.error.emit(f"Failed to obtain the driver file descriptor: {exc}")
+        if self._acquisition is None:
+            self._run(self._sensor)
             return
-
-        selector = selectors.DefaultSelector()
         try:
-            selector.register(fd, selectors.EVENT_READ)
+            self._acquisition.resume()
         except OSError as exc:
-            selector.close()
-            self.error.emit(f"Failed to register the descriptor for reading: {exc}")
+            self.error.emit(f"Failed to start the acquisition process: {exc}")
             return
-
         try:
-            while not self._stop_event.is_set():
-                events = selector.select(timeout=0.5)
-                if not events:
-                    continue
-
-                for _, mask in events:
-                    if mask & selectors.EVENT_READ:
-                        try:
-                            sample = self._sensor.driver.read_sample(timeout=0)
-                        except SimTempTimeoutError:
-                            continue
-                        except SimTempError as exc:
-                            self.error.emit(f"Error while reading samples: {exc}")
-                            self._stop_event.set()
-                            return
-                        self.sample_ready.emit(asdict(sample))
+            self._run(self._acquisition)
         finally:
+            # Release the device for one-shot reads, then hand over what the process wrote before
+            # pausing; the cursor ends at the pause, so the next session starts with its own samples.
+            self._acquisition.pause()
             try:
-                selector.unregister(fd)
-            except Exception:
+                batch = self._acquisition.read_available()
+                if batch:
+                    self._pipeline.process(batch)
+            except SimTempError:
                 pass
-            selector.close()
+
+    def _run(self, source: TempSensor | RemoteTempSensor | AcquisitionProcess) -> None:
+        try:
+            fd = source.fileno()
+        except SimTempError as exc:
+            self.error.emit(f"Failed to obtain the driver file descriptor: {exc}")
+            return
+
+        # poll() rather than selectors: the driver reports threshold crossings as POLLPRI.
+        poller = select.poll()
+        poller.register(fd, select.POLLIN | select.POLLPRI)
+        poller.register(self._wakeup, select.POLLIN)
+        while not self._stop_event.is_set():
+            for event_fd, mask in poller.poll():
+                if event_fd != fd:
+                    continue
+                # Drain everything that is queued so consumers get one batch per wakeup.
+                try:
+                    batch = source.read_available()
+                except SimTempError as exc:
+                    self.error.emit(f"Error while reading samples: {exc}")
+                    self._stop_event.set()
+                    return
+                if batch:
+                    self._emit_threshold_alert(batch, mask)
+                    self._pipeline.process(batch)
+                if mask & (select.POLLHUP | select.POLLERR | select.POLLNVAL):
+                    self.error.emit("The sample source closed the stream.")
+                    self._stop_event.set()
+                    return
+
+    def _emit_threshold_alert(self, batch: SampleBatch, mask: int) -> None:
+        # Emitted before the pipeline runs so neither its stages nor a backlogged bus can delay it.
+        # The latest crossing decides; the receiver ignores falling ones. POLLPRI is only seen when
+        # reading the device directly, the acquisition process reports batches as plain wakeups.
+        edges = np.flatnonzero(batch.flags & SIMTEMP_FLAG_THR_EDGE)
+        if edges.size:
+            self.threshold_alert.emit(batch[int(edges[-1])])
+        elif mask & select.POLLPRI:
+            self.threshold_alert.emit(batch[len(batch) - 1])
+
+# Sample rate assumed by the spectrum until the driver configuration is known.
+_DEFAULT_SAMPLE_PERIOD_MS = 100
 
 api_information = {
     "name": "Temperature Panel Control",
@@ -82,17 +183,68 @@ api_information = {
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, parent: QWidget | None = None):
+    # Emitted from the stats poller thread; queued to the GUI thread.
+    driver_stats_received = Signal(object)
+    # Emitted from the pipeline stages on the acquisition thread; queued to the GUI thread.
+    alert_transitions = Signal(object)
+    anomalies_detected = Signal(object)
+    # Emitted from the pipeline's worker pool, at most once per second.
+    spectrum_updated = Signal(object)
+    # Emitted from the thread the failing pipeline stage runs on.
+    pipeline_error = Signal(str)
+
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        *,
+        sensor: TempSensor | RemoteTempSensor | None = None,
+        acquisition: Optional[AcquisitionOptions] = None,
+        dashboard_sensors: Sequence[tuple[str, RemoteTempSensor]] = (),
+    ):
         super().__init__(parent)
         self.setWindowTitle("Instrument Panel – UI")
 
-        self.temperature = TempSensor()
-        self._stream_worker = _ContinuousStreamWorker(self.temperature, self)
-        self._current_threshold_mc = 0
+        # A RemoteTempSensor attaches to a SampleBroadcaster instead of opening the device.
+        self.temperature = sensor if sensor is not None else TempSensor()
+        # The stream worker is the only reader of the device; every consumer gets its own cursor on the bus.
+        self._sample_bus = SampleBus()
+        # Batch processing happens in the pipeline on the acquisition thread; the GUI only gets results.
+        self._pipeline = SamplePipeline(
+            on_error=lambda stage, exc: self.pipeline_error.emit(f"Processing stage {stage.name} failed: {exc}")
+        )
+        self._anomaly_stage = self._pipeline.add(AnomalyStage())
+        self._alert_stage = self._pipeline.add(AlertStage())
+        self._pipeline.add(BusSink(self._sample_bus))
+        # The spectrum is corrected to the configured period once the driver configuration is read.
+        self._spectrum_stage = self._pipeline.add(SpectrumStage(_DEFAULT_SAMPLE_PERIOD_MS))
+        self._anomaly_stage.add_listener(self.anomalies_detected.emit)
+        self._alert_stage.add_listener(self.alert_transitions.emit)
+        self._spectrum_stage.add_listener(self.spectrum_updated.emit)
+        self._stream_worker = _ContinuousStreamWorker(
+            self.temperature,
+            self._pipeline,
+            self,
+            acquisition=AcquisitionProcess(acquisition) if acquisition is not None else None,
+        )
+        self._pending_alert_state: Optional[bool] = None
+        self._render_scheduler = RenderScheduler(parent=self)
+        # Only display work is shed when frames run late; the file writer and the alerts stay lossless.
+        self._frame_load = FrameLoadMonitor(1.0 / self._render_scheduler.fps)
+        self._frame_ticks = 0
+        self._backpressure = BackpressureMonitor(self._sample_bus)
+        self._next_backpressure_check = 0.0
 
         self.splitter = QSplitter(Qt.Horizontal, self)
         self.side_menu = SideMenu()
         self.work_area = WorkArea()
+        self.work_area.attach_sample_bus(self._sample_bus)
+        self.work_area.add_dashboard_sensor("This sensor", self._sample_bus)
+        # Extra dashboard tiles, each fed by its own reader from a sample broadcaster.
+        self._dashboard_feeds: list[
+            tuple[RemoteTempSensor, _ContinuousStreamWorker, SamplePipeline, SampleBus, QTimer]
+        ] = []
+        for name, remote in dashboard_sensors:
+            self._add_dashboard_feed(name, remote)
 
         self.splitter.addWidget(self.side_menu)
         self.splitter.addWidget(self.work_area)
@@ -107,13 +259,18 @@ class MainWindow(QMainWindow):
         self.work_area.set_settings_page_info(driver_config)
         try:
             threshold_value = driver_config.get("threshold_mc")
-            self._current_threshold_mc = int(threshold_value) if threshold_value is not None else 0
+            self._configure_alerts(threshold_mc=int(threshold_value) if threshold_value is not None else 0)
+        except (TypeError, ValueError):
+            pass
+        try:
+            self._spectrum_stage.set_sample_period_ms(int(driver_config.get("sampling_period_ms")))
         except (TypeError, ValueError):
-            self._current_threshold_mc = 0
+            pass
 
         self.side_menu.signal_show_welcome.connect(lambda: self.work_area.goto("welcome"))
         self.side_menu.signal_show_settings.connect(lambda: self.work_area.goto("settings"))
         self.side_menu.signal_show_logs.connect(lambda: self.work_area.goto("logs"))
+        self.side_menu.signal_show_dashboard.connect(lambda: self.work_area.goto("dashboard"))
         # Continuous logging page
         self.work_area.start_logging_requested.connect(self._handle_start_logging)
         self.work_area.stop_logging_requested.connect(self._handle_stop_logging)
@@ -124,9 +281,31 @@ class MainWindow(QMainWindow):
         # Side menu
         self.side_menu.signal_toggle_menu.connect(self._toggle_menu_width)
 
-        self._stream_worker.sample_ready.connect(self._handle_continuous_sample)
-
         self._stream_worker.error.connect(self._handle_stream_error)
+        self._stream_worker.threshold_alert.connect(self._handle_threshold_alert)
+        self.anomalies_detected.connect(self._handle_anomalies)
+        self.alert_transitions.connect(self._handle_alert_transitions)
+        self.spectrum_updated.connect(self.work_area.set_spectrum_report)
+        self.pipeline_error.connect(lambda message: self.statusBar().showMessage(message, 10000))
+
+        self._render_scheduler.frame.connect(self._render_frame)
+        self._render_scheduler.start()
+
+        self._shed_label = QLabel(self._frame_load.policy.describe())
+        self._backpressure_label = QLabel()
+        self._backpressure_label.setStyleSheet("color: #ff6b6b; font-weight: bold;")
+        self._backpressure_label.setVisible(False)
+        self.statusBar().addPermanentWidget(self._backpressure_label)
+        self.statusBar().addPermanentWidget(self._shed_label)
+        # Kernel-side counters next to the user-space numbers; a remote sensor has no sysfs to poll.
+        self._driver_stats_label = QLabel()
+        self.statusBar().addPermanentWidget(self._driver_stats_label)
+        self._stats_poller: Optional[StatsPoller] = None
+        if isinstance(self.temperature, TempSensor):
+            self._stats_poller = StatsPoller.for_sensor(self.temperature)
+            self._stats_poller.add_listener(self.driver_stats_received.emit)
+            self.driver_stats_received.connect(self._handle_driver_stats)
+            self._stats_poller.start()
 
         try:
             with open("API/styles/app.qss", "r", encoding="utf-8") as f:
@@ -134,15 +313,67 @@ class MainWindow(QMainWindow):
         except FileNotFoundError:
             pass
 
+    def _add_dashboard_feed(self, name: str, sensor: RemoteTempSensor) -> None:
+        bus = SampleBus()
+        pipeline = SamplePipeline([BusSink(bus)])
+        worker = _ContinuousStreamWorker(sensor, pipeline, self)
+        tile = self.work_area.add_dashboard_sensor(name, bus)
+        # A feed that cannot connect, or loses its connection, retries until the window closes.
+        retry = QTimer(self)
+        retry.setSingleShot(True)
+        retry.setInterval(_DASHBOARD_RETRY_MS)
+        retry.timeout.connect(lambda: self._connect_dashboard_feed(name, sensor, worker, tile, retry))
+        worker.error.connect(lambda message: self._dashboard_feed_lost(name, tile, retry, message))
+        self._dashboard_feeds.append((sensor, worker, pipeline, bus, retry))
+        self._connect_dashboard_feed(name, sensor, worker, tile, retry)
+
+    def _connect_dashboard_feed(
+        self, name: str, sensor: RemoteTempSensor, worker: _ContinuousStreamWorker, tile: SensorTile, retry: QTimer
+    ) -> None:
+        # The worker of a lost connection may still be returning; the sensor is reopened after it.
+        worker.stop_stream()
+        sensor.close()
+        try:
+            sensor.open()
+        except SimTempError as exc:
+            self._dashboard_feed_lost(name, tile, retry, str(exc))
+            return
+        tile.set_connected(True)
+        worker.start_stream()
+
+    def _dashboard_feed_lost(self, name: str, tile: SensorTile, retry: QTimer, message: str) -> None:
+        # Report the loss once, not on every failed retry.
+        if tile.connected:
+            self.statusBar().showMessage(f"{name}: {message}; retrying every {_DASHBOARD_RETRY_MS // 1000} s", 10000)
+        tile.set_connected(False, message)
+        retry.start()
+
     def _handle_start_logging(self, settings: dict):
         """Applies settings and starts continuous logging."""
         self._stream_worker.stop_stream()
         self.temperature.stop()
+        self._sample_bus.clear()
         self.work_area.set_threshold_indicator(False)
         self._apply_driver_settings(settings)
         try:
-            if not self.temperature.driver.is_open:
-                self.temperature.open()
+            self._configure_alerts(
+                hysteresis_mc=int(settings.get("alert_hysteresis_mc", 0)),
+                min_dwell_ns=int(settings.get("alert_dwell_ms", 0)) * 1_000_000,
+            )
+        except (TypeError, ValueError):
+            pass
+        if self._alert_stage.config.edge_alerts_filtered:
+            self.statusBar().showMessage(
+                "Threshold 0 only raises single-sample edge alerts; the dwell time filters all of them out.", 10000
+            )
+        self._pipeline.reset()
+        self._pending_alert_state = None
+        try:
+            self._render_scheduler.set_fps(int(settings.get("refresh_fps", self._render_scheduler.fps)))
+        except (TypeError, ValueError):
+            pass
+        try:
+            self.temperature.open()
             self.temperature.start()
         except SimTempError as exc:
             QMessageBox.critical(
@@ -154,12 +385,6 @@ class MainWindow(QMainWindow):
 
         self._stream_worker.start_stream()
         self.work_area.set_threshold_indicator(False)
-        threshold_setting = settings.get("threshold_mc")
-        if threshold_setting is not None:
-            try:
-                self._current_threshold_mc = int(threshold_setting)
-            except (TypeError, ValueError):
-                pass
 
     def _handle_read_now(self):
         """Handle the one-shot read request coming from the UI."""
@@ -167,43 +392,50 @@ class MainWindow(QMainWindow):
             # This is a blocking call; for a more complex UI we could delegate to a QThread.
             sample = self.temperature.read_once(timeout=2.0)
             if sample:
-                self.work_area.on_one_shot_sample_received(asdict(sample))
+                self.work_area.on_one_shot_sample_received(SampleRecord.from_sample(sample))
             else:
                 # Send an empty payload if no sample arrives but no error occurred
-                self.work_area.on_one_shot_sample_received({})
+                self.work_area.on_one_shot_sample_received(None)
         except SimTempError as e:
             # Handle errors (for example a timeout) and notify the user
             QMessageBox.warning(self, "Read Error", f"Failed to read one-shot sample: {e}")
             # Provide an empty payload so the UI can reset its state
-            self.work_area.on_one_shot_sample_received({})
+            self.work_area.on_one_shot_sample_received(None)
 
     def _apply_driver_settings(self, settings: dict):
         """Apply the configuration received from the UI to the driver."""
         errors: list[str] = []
-        for key, value in settings.items():
-            try:
-                if key == "operation_mode":
-                    self.temperature.set_operation_mode(value)
-                elif key == "simulation_mode":
-                    self.temperature.set_simulation_mode(value)
-                elif key == "sampling_period_ms":
-                    self.temperature.set_sampling_period_ms(int(value))
-                elif key == "threshold_mc":
-                    threshold_value = int(value)
-                    self.temperature.set_threshold_mc(threshold_value)
-                    self._current_threshold_mc = threshold_value
-            except SimTempError as exc:
-                errors.append(f"{key}: {exc}")
-                
-        # Refresh the configuration information in the UI after applying the changes
-        self.work_area.set_settings_page_info(self.temperature.driverconfig)
+        unchanged = True
+        try:
+            applied = self.temperature.apply_config(DriverConfig.from_mapping(settings))
+        except ValueError as exc:
+            errors.append(f"invalid value: {exc}")
+        except ConfigApplyError as exc:
+            errors.append(f"{exc.step}: {exc.cause}")
+            errors.extend(f"not undone: {failure}" for failure in exc.rollback_errors)
+            unchanged = exc.unchanged
+        except SimTempError as exc:
+            errors.append(str(exc))
+        else:
+            if applied.threshold_mc is not None:
+                self._configure_alerts(threshold_mc=applied.threshold_mc)
+            if applied.sampling_period_ms:
+                self._spectrum_stage.set_sample_period_ms(applied.sampling_period_ms)
+
+        # Refresh the configuration information in the UI; the config itself is already known.
+        self.work_area.set_settings_page_info(asdict(self.temperature.get_driver_info(refresh=False)))
 
         if errors:
-            QMessageBox.warning(
-                self,
-                "Settings Not Applied",
-                "Some adjustments could not be applied:\n- " + "\n- ".join(errors),
-            )
+            if unchanged:
+                summary = "The driver configuration was left unchanged:"
+            else:
+                # The rollback failed as well; the driver may run with a mix of old and new settings.
+                summary = "The driver configuration could not be restored; check the Settings page:"
+            QMessageBox.warning(self, "Settings Not Applied", summary + "\n- " + "\n- ".join(errors))
+
+    def _configure_alerts(self, **changes) -> None:
+        """Update selected alert parameters, keeping the others."""
+        self._alert_stage.configure(replace(self._alert_stage.config, **changes))
 
     def _toggle_menu_width(self):
         w = self.side_menu.width()
@@ -224,6 +456,7 @@ class MainWindow(QMainWindow):
                 f"Failed to stop the driver correctly: {exc}",
             )
         finally:
+            self._pending_alert_state = None
             self.work_area.set_threshold_indicator(False)
 
     def _handle_stream_error(self, message: str) -> None:
@@ -233,25 +466,102 @@ class MainWindow(QMainWindow):
         except SimTempError:
             pass
         QMessageBox.critical(self, "Continuous Read", message)
+        self._pending_alert_state = None
         self.work_area.set_threshold_indicator(False)
 
-    @Slot(dict)
-    def _handle_continuous_sample(self, sample: dict) -> None:
-        self.work_area.on_continuous_sample_received(sample)
-        flags = sample.get("flags", 0)
-        temp_mc = sample.get("temp_mC")
-        threshold = self._current_threshold_mc
-        above_threshold = (
-            isinstance(temp_mc, (int, float))
-            and isinstance(threshold, (int, float))
-            and threshold > 0
-            and temp_mc >= threshold
+    @Slot(object)
+    def _handle_threshold_alert(self, sample: SampleRecord) -> None:
+        """Show a driver-reported rising crossing at once instead of waiting for the next frame."""
+        config = self._alert_stage.config
+        if config.min_dwell_ns or not self._stream_worker.isRunning():
+            return
+        # A falling crossing is left to the alert engine, which applies the hysteresis band.
+        if config.threshold_mc > 0 and sample.temp_mC < config.threshold_mc:
+            return
+        self.work_area.set_threshold_indicator(True)
+
+    @Slot(object)
+    def _handle_driver_stats(self, snapshot: StatsSnapshot) -> None:
+        self._driver_stats_label.setText(snapshot.summary())
+        self.work_area.record_driver_stats(snapshot)
+
+    @Slot(object)
+    def _handle_alert_transitions(self, transitions: list[AlertTransition]) -> None:
+        # Only the final state before the next frame is visible; intermediate edges collapse.
+        if self._stream_worker.isRunning():
+            self._pending_alert_state = transitions[-1].active
+
+    @Slot(object)
+    def _handle_anomalies(self, events: list[AnomalyEvent]) -> None:
+        latest = events[-1]
+        more = f" (+{len(events) - 1} more)" if len(events) > 1 else ""
+        self.statusBar().showMessage(
+            f"Anomaly: {latest.kind.value} at {latest.temp_mC / 1000.0:.3f} °C, "
+            f"value {latest.value:.1f}{more}",
+            5000,
         )
-        is_alert = bool(flags & SIMTEMP_FLAG_THR_EDGE) or above_threshold
-        self.work_area.set_threshold_indicator(is_alert)
+
+    @Slot()
+    def _render_frame(self) -> None:
+        """Apply everything that accumulated since the previous frame in one pass."""
+        self._frame_ticks += 1
+        if self._frame_ticks % self._frame_load.policy.frame_interval == 0:
+            started = time.perf_counter()
+            self.work_area.render_frame()
+            self._frame_load.set_budget(1.0 / self._render_scheduler.fps)
+            if self._frame_load.record(time.perf_counter() - started):
+                self._apply_shed_policy()
+        # The alert indicator is never shed.
+        if self._pending_alert_state is not None:
+            self.work_area.set_threshold_indicator(self._pending_alert_state)
+            self._pending_alert_state = None
+        now = time.monotonic()
+        if now >= self._next_backpressure_check:
+            self._next_backpressure_check = now + 1.0
+            self._show_backpressure()
+
+    def _apply_shed_policy(self) -> None:
+        policy = self._frame_load.policy
+        self.work_area.set_display_decimation(policy.decimation)
+        self._shed_label.setText(policy.describe())
+        self._shed_label.setToolTip(f"Render load {self._frame_load.load:.0%} of the frame budget")
+
+    def _show_backpressure(self) -> None:
+        """Warn while a lossless consumer (the file writer) is behind enough to hold back acquisition."""
+        alarm = self._backpressure.check()
+        self._backpressure_label.setVisible(alarm is not None)
+        if alarm is not None:
+            self._backpressure_label.setText(f"Logging behind: {alarm.describe()}")
+
+    def changeEvent(self, event) -> None:
+        if event.type() == QEvent.WindowStateChange:
+            self._render_scheduler.set_visible(self.isVisible() and not self.isMinimized())
+        super().changeEvent(event)
+
+    def showEvent(self, event) -> None:
+        self._render_scheduler.set_visible(not self.isMinimized())
+        super().showEvent(event)
+
+    def hideEvent(self, event) -> None:
+        self._render_scheduler.set_visible(False)
+        super().hideEvent(event)
 
     def closeEvent(self, event) -> None:
-        self._stream_worker.stop_stream()
+        self._render_scheduler.stop()
+        if self._stats_poller is not None:
+            self._stats_poller.close()
+        # Finish the capture first so the file writer drains the bus and closes the session files.
+        self.work_area.stop_logging()
+        self._sample_bus.close()
+        self._stream_worker.release()
+        self._pipeline.close()
+        for sensor, worker, pipeline, bus, retry in self._dashboard_feeds:
+            retry.stop()
+            worker.error.disconnect()
+            worker.release()
+            pipeline.close()
+            bus.close()
+            sensor.close()
         try:
             self.temperature.stop()
         except SimTempError:
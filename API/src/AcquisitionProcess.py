@@ -0,0 +1,388 @@
+"""Device reads in a dedicated process, handed over through a shared-memory ring."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import selectors
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Optional
+
+import numpy as np
+
+from API.src.SampleBatch import SampleBatch
+from API.src.SampleRing import SAMPLE_DTYPE
+from kernel.apitest.LxDrTemp import SimTempError
+
+__all__ = ["AcquisitionOptions", "AcquisitionProcess", "SharedSampleRing"]
+
+_HEADER_DTYPE = np.dtype([("total_written", "<u8"), ("capacity", "<u8"), ("write_begin", "<u8")])
+# Child -> parent messages.
+_WAKE = b"W"
+_ERROR = b"E"
+_PAUSED = b"P"
+# Parent -> child commands; closing the command pipe ends the process.
+_PAUSE = b"pause"
+_RESUME = b"resume"
+
+
+class SharedSampleRing:
+    """
+    Overwrite-oldest ring of `SAMPLE_DTYPE` records in shared memory.
+
+    There is one writer. Readers keep their own sequence cursor and copy
+    records out. The writer works like a seqlock: it announces the end of a
+    write (`write_begin`) before touching any slot and publishes
+    `total_written` afterwards. A reader re-reads `write_begin` after its
+    copy; records the writer may have overwritten meanwhile, even partly,
+    are reported as dropped instead of being returned torn.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool, writable: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        self._header = np.ndarray((), dtype=_HEADER_DTYPE, buffer=shm.buf)
+        capacity = int(self._header["capacity"])
+        self._records = np.ndarray(
+            (capacity,), dtype=SAMPLE_DTYPE, buffer=shm.buf, offset=_HEADER_DTYPE.itemsize
+        )
+        if not writable:
+            self._records.flags.writeable = False
+
+    @classmethod
+    def create(cls, capacity: int) -> "SharedSampleRing":
+        """Allocate a ring and return a read-only view of it; the creator unlinks it on close."""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        shm = shared_memory.SharedMemory(
+            create=True, size=_HEADER_DTYPE.itemsize + capacity * SAMPLE_DTYPE.itemsize
+        )
+        header = np.ndarray((), dtype=_HEADER_DTYPE, buffer=shm.buf)
+        header["total_written"] = 0
+        header["capacity"] = capacity
+        header["write_begin"] = 0
+        del header
+        return cls(shm, owner=True, writable=False)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedSampleRing":
+        """Map an existing ring for writing."""
+        return cls(shared_memory.SharedMemory(name=name), owner=False, writable=True)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        return self._records.size
+
+    @property
+    def total_written(self) -> int:
+        return int(self._header["total_written"])
+
+    def write(self, records: np.ndarray) -> None:
+        """Append records through a view returned by `attach()`."""
+        capacity = self._records.size
+        total = self.total_written + max(0, records.size - capacity)
+        records = records[-capacity:]
+        start = total % capacity
+        first = min(records.size, capacity - start)
+        # Announce the slots about to be overwritten before touching any of them.
+        self._header["write_begin"] = total + records.size
+        self._records[start:start + first] = records[:first]
+        self._records[:records.size - first] = records[first:]
+        # Publish the new counter only after the records are in place.
+        self._header["total_written"] = total + records.size
+
+    def read_from(self, sequence: int) -> tuple[np.ndarray, int, int]:
+        """
+        Copy the records from `sequence` on.
+
+        Returns:
+            (records, next sequence, number of records lost to overwrites)
+        """
+        capacity = self._records.size
+        total = self.total_written
+        first_valid = max(sequence, total - capacity)
+        count = total - first_valid
+        if count <= 0:
+            return np.empty(0, dtype=SAMPLE_DTYPE), max(sequence, total), first_valid - sequence
+        start = first_valid % capacity
+        if start + count <= capacity:
+            records = self._records[start:start + count].copy()
+        else:
+            records = np.concatenate((self._records[start:], self._records[:start + count - capacity]))
+        # Anything a write started since then may have reached is possibly torn.
+        overwritten = min(int(self._header["write_begin"]) - capacity - first_valid, records.size)
+        if overwritten > 0:
+            records = records[overwritten:]
+            first_valid += overwritten
+        return records, total, first_valid - sequence
+
+    def close(self) -> None:
+        # Drop the views before closing, the mapping cannot be released while they exist.
+        self._header = None
+        self._records = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+@dataclass(frozen=True)
+class AcquisitionOptions:
+    """How to run the acquisition process."""
+
+    cpus: Optional[frozenset[int]] = None  # CPUs to pin the process to (os.sched_setaffinity)
+    realtime_priority: Optional[int] = None  # SCHED_FIFO priority (needs CAP_SYS_NICE)
+    capacity: int = 1 << 16  # samples held by the shared ring
+    device_path: Optional[str] = None
+    sysfs_base: Optional[str] = None
+
+
+class AcquisitionProcess:
+    """
+    Reads the device in a separate process so GUI work never delays it.
+
+    The child only reads: configuration, start and stop stay with the
+    `TempSensor` of the calling process. Samples arrive through a
+    `SharedSampleRing`; the child signals new batches on a non-blocking
+    pipe, so wakeups coalesce while the parent is not reading. `pause()`
+    makes the child stop reading the device, e.g. so a one-shot read gets
+    its sample, without ending the process. `fileno()` and
+    `read_available()` match `TempSensor`, so the parent can consume this
+    like a sensor.
+    """
+
+    def __init__(self, options: AcquisitionOptions = AcquisitionOptions()) -> None:
+        self._options = options
+        self._context = multiprocessing.get_context("spawn")
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._ring: Optional[SharedSampleRing] = None
+        self._wakeups: Optional[Connection] = None
+        self._commands: Optional[Connection] = None
+        self._paused = False
+        self._cursor = 0
+        self._dropped = 0
+        self._error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @property
+    def dropped(self) -> int:
+        """Return how many samples were overwritten in the ring before they were read."""
+        return self._dropped
+
+    def start(self) -> None:
+        """Spawn the acquisition process with a fresh ring, unless it is already running."""
+        if self.running:
+            return
+        self.close()
+        self._ring = SharedSampleRing.create(self._options.capacity)
+        self._wakeups, child_end = self._context.Pipe(duplex=False)
+        child_commands, self._commands = self._context.Pipe(duplex=False)
+        self._paused = False
+        self._cursor = 0
+        self._dropped = 0
+        self._error = None
+        self._process = self._context.Process(
+            target=_acquisition_main,
+            args=(self._ring.name, child_end, child_commands, self._options),
+            name="simtemp-acquisition",
+            daemon=True,
+        )
+        self._process.start()
+        child_end.close()
+        child_commands.close()
+
+    def pause(self, timeout: float = 2.0) -> None:
+        """
+        Make the process stop reading the device and wait until it has.
+
+        Samples written before the pause stay readable. A process that does
+        not confirm in time is stopped instead, so the device is free either way.
+        """
+        if not self.running or self._paused:
+            return
+        try:
+            self._commands.send_bytes(_PAUSE)
+        except OSError:
+            self.stop()
+            return
+        deadline = time.monotonic() + timeout
+        try:
+            while self._wakeups.poll(max(0.0, deadline - time.monotonic())):
+                if self._receive() == _PAUSED:
+                    self._paused = True
+                    return
+                if time.monotonic() >= deadline:
+                    break
+        except (EOFError, OSError):
+            pass
+        self.stop()
+
+    def resume(self) -> None:
+        """Read the device again after `pause()`; starts the process if it is not running."""
+        if not self.running:
+            self.start()
+            return
+        if self._paused:
+            self._commands.send_bytes(_RESUME)
+            self._paused = False
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the process; samples it already wrote stay readable until `close()` or `start()`."""
+        if self._process is None:
+            return
+        # Closing our end makes the child's command descriptor readable (EOF) at once.
+        self._commands.close()
+        self._commands = None
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._process = None
+
+    def close(self) -> None:
+        """Stop the process and release the ring."""
+        self.stop()
+        if self._wakeups is not None:
+            self._wakeups.close()
+            self._wakeups = None
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    def fileno(self) -> int:
+        """Return the descriptor that becomes readable when samples arrive."""
+        if self._wakeups is None:
+            raise SimTempError("the acquisition process is not running")
+        return self._wakeups.fileno()
+
+    def read_available(self) -> SampleBatch:
+        """
+        Return the samples written since the previous call, without waiting.
+
+        Raises:
+            SimTempError: if the acquisition process reported an error or exited
+                unexpectedly; samples written before that are returned first.
+        """
+        if self._wakeups is None or self._ring is None:
+            raise SimTempError("the acquisition process is not running")
+        exited = False
+        try:
+            while self._wakeups.poll():
+                self._receive()
+        except (EOFError, OSError):
+            exited = True
+        records, self._cursor, lost = self._ring.read_from(self._cursor)
+        self._dropped += lost
+        if records.size:
+            return SampleBatch(records)
+        if self._error is not None:
+            raise SimTempError(self._error)
+        if exited and self._process is not None:
+            raise SimTempError("the acquisition process exited")
+        return SampleBatch(records)
+
+    def _receive(self) -> bytes:
+        message = self._wakeups.recv_bytes()
+        if message.startswith(_ERROR):
+            self._error = message[len(_ERROR):].decode("utf-8", "replace")
+        return message
+
+
+def _acquisition_main(
+    ring_name: str,
+    wakeups: Connection,
+    commands: Connection,
+    options: AcquisitionOptions,
+) -> None:
+    """Entry point of the acquisition process."""
+    # Imported here so the parent never needs the device to create the process object.
+    from API.src.TempSensor import TempSensor
+
+    _tune_scheduling(options)
+    ring = SharedSampleRing.attach(ring_name)
+    sensor: Optional[TempSensor] = None
+    selector = selectors.DefaultSelector()
+    # A wakeup that does not fit is not needed: the pipe is already readable.
+    os.set_blocking(wakeups.fileno(), False)
+    try:
+        sensor = TempSensor(device_path=options.device_path, sysfs_base=options.sysfs_base)
+        device = sensor.fileno()
+        selector.register(device, selectors.EVENT_READ, "device")
+        selector.register(commands, selectors.EVENT_READ, "command")
+        paused = False
+        while True:
+            device_ready = False
+            for key, _ in selector.select():
+                if key.data == "device":
+                    device_ready = True
+                    continue
+                command = commands.recv_bytes()  # EOFError once the parent closes the pipe
+                if command == _PAUSE:
+                    if not paused:
+                        selector.unregister(device)
+                        paused = True
+                    _send_reliably(wakeups, _PAUSED)
+                elif command == _RESUME and paused:
+                    selector.register(device, selectors.EVENT_READ, "device")
+                    paused = False
+            if device_ready and not paused:
+                batch = sensor.read_available()
+                if batch:
+                    ring.write(batch.records)
+                    try:
+                        wakeups.send_bytes(_WAKE)
+                    except BlockingIOError:
+                        pass
+    except SimTempError as exc:
+        try:
+            _send_reliably(wakeups, _ERROR + str(exc).encode("utf-8"))
+        except OSError:
+            pass
+    except (EOFError, BrokenPipeError, KeyboardInterrupt):
+        pass
+    finally:
+        selector.close()
+        if sensor is not None:
+            sensor.close()
+        ring.close()
+        wakeups.close()
+        commands.close()
+
+
+def _send_reliably(wakeups: Connection, message: bytes) -> None:
+    """Send a message that must not be lost, waiting for room in the pipe if needed."""
+    os.set_blocking(wakeups.fileno(), True)
+    try:
+        wakeups.send_bytes(message)
+    finally:
+        os.set_blocking(wakeups.fileno(), False)
+
+
+def _tune_scheduling(options: AcquisitionOptions) -> None:
+    if options.cpus:
+        try:
+            os.sched_setaffinity(0, options.cpus)
+        except (AttributeError, OSError) as exc:
+            print(f"Acquisition: could not set CPU affinity {sorted(options.cpus)}: {exc}", file=sys.stderr)
+    if options.realtime_priority is not None:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(options.realtime_priority))
+        except (AttributeError, OSError) as exc:
+            print(f"Acquisition: could not set SCHED_FIFO priority: {exc}", file=sys.stderr)
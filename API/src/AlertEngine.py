@@ -0,0 +1,155 @@
+"""Batch threshold alert evaluation with hysteresis and dwell filtering."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_THR_EDGE
+
+__all__ = ["AlertEngine", "AlertConfig", "AlertTransition"]
+
+
+@dataclass(frozen=True)
+class AlertConfig:
+    """
+    Alert evaluation parameters.
+
+    A threshold of zero disables the software comparison and only the kernel
+    `SIMTEMP_FLAG_THR_EDGE` flag raises alerts. Such an alert lasts for the
+    flagged sample only, so with a `min_dwell_ns` greater than the sampling
+    period it never commits: edge-only alerting needs a dwell of zero (see
+    `edge_alerts_filtered`).
+    """
+
+    threshold_mc: int = 0
+    hysteresis_mc: int = 0
+    min_dwell_ns: int = 0
+
+    @property
+    def edge_alerts_filtered(self) -> bool:
+        """True if the dwell time suppresses every edge-only alert."""
+        return self.threshold_mc == 0 and self.min_dwell_ns > 0
+
+
+@dataclass(frozen=True)
+class AlertTransition:
+    """A committed change of the alert state."""
+
+    active: bool
+    index: int
+    timestamp_ns: int
+    temp_mC: int
+
+
+class AlertEngine:
+    """
+    Evaluate sample batches against the alert configuration.
+
+    Raw alert states are computed for the whole batch with array operations.
+    A new state is only committed once it has been held for `min_dwell_ns`,
+    so callers receive state transitions instead of per-sample verdicts.
+    Candidates that flip back before their dwell time are dropped without a
+    transition, which includes every single-sample edge alert when the
+    dwell is longer than the sampling period.
+    `AlertTransition.index` counts samples since the last `reset()`.
+    """
+
+    def __init__(self, config: AlertConfig | None = None) -> None:
+        self._config = config or AlertConfig()
+        self.reset()
+
+    @property
+    def config(self) -> AlertConfig:
+        return self._config
+
+    @property
+    def active(self) -> bool:
+        """Return the committed alert state."""
+        return self._active
+
+    @property
+    def samples_seen(self) -> int:
+        return self._count
+
+    def configure(self, config: AlertConfig) -> None:
+        """Replace the configuration and restart evaluation from a clear state."""
+        self._config = config
+        self.reset()
+
+    def reset(self) -> None:
+        self._active = False
+        self._raw = False
+        self._count = 0
+        # Pending state change waiting for its dwell time: (state, index, ts, temp).
+        self._candidate: Optional[tuple[bool, int, int, int]] = None
+
+    def process(self, timestamps_ns, temps_mc, flags) -> list[AlertTransition]:
+        """
+        Evaluate one batch of samples and return the committed transitions.
+
+        Args:
+            timestamps_ns: Kernel timestamps of the samples.
+            temps_mc: Temperatures in milli-degrees Celsius.
+            flags: Sample flag words as reported by the driver.
+        """
+        timestamps = np.asarray(timestamps_ns, dtype=np.int64)
+        temps = np.asarray(temps_mc, dtype=np.int64)
+        flag_words = np.asarray(flags, dtype=np.int64)
+        count = temps.size
+        if count == 0:
+            return []
+
+        previous_raw = self._raw
+        raw = self._raw_states(temps, flag_words)
+        self._raw = bool(raw[-1])
+
+        changed = np.empty(count, dtype=bool)
+        changed[0] = raw[0] != previous_raw
+        np.not_equal(raw[1:], raw[:-1], out=changed[1:])
+        bounds = np.flatnonzero(changed).tolist()
+        segment_starts = bounds if bounds and bounds[0] == 0 else [0] + bounds
+        segment_ends = segment_starts[1:] + [count]
+
+        transitions: list[AlertTransition] = []
+        for start, end in zip(segment_starts, segment_ends):
+            state = bool(raw[start])
+            if changed[start]:
+                if state == self._active:
+                    self._candidate = None
+                else:
+                    self._candidate = (
+                        state,
+                        self._count + start,
+                        int(timestamps[start]),
+                        int(temps[start]),
+                    )
+            if self._candidate is None:
+                continue
+            _, index, first_ts, first_temp = self._candidate
+            if int(timestamps[end - 1]) - first_ts >= self._config.min_dwell_ns:
+                self._active = state
+                self._candidate = None
+                transitions.append(AlertTransition(state, index, first_ts, first_temp))
+
+        self._count += count
+        return transitions
+
+    def _raw_states(self, temps: np.ndarray, flag_words: np.ndarray) -> np.ndarray:
+        """Apply the hysteresis band and return the instantaneous alert state per sample."""
+        edge = (flag_words & SIMTEMP_FLAG_THR_EDGE) != 0
+        threshold = self._config.threshold_mc
+        if threshold > 0:
+            enter = edge | (temps >= threshold)
+            leave = ~enter & (temps < threshold - self._config.hysteresis_mc)
+        else:
+            enter = edge
+            leave = ~edge
+
+        events = enter.astype(np.int8) - leave.astype(np.int8)
+        # Samples inside the band keep the state of the last enter/leave event.
+        last_event = np.where(events != 0, np.arange(events.size), -1)
+        np.maximum.accumulate(last_event, out=last_event)
+        return np.where(last_event >= 0, events[last_event] > 0, self._raw)
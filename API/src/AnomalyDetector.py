@@ -0,0 +1,205 @@
+"""Online anomaly detection (spikes, jumps, drift, stuck values) over sample batches."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+
+__all__ = ["AnomalyDetector", "AnomalyConfig", "AnomalyEvent", "AnomalyKind"]
+
+# Chunk EWMA batches so the decay factors used by the closed form stay above this.
+_MIN_DECAY_POWER = 1e-6
+
+
+class AnomalyKind(str, Enum):
+    SPIKE = "spike"  # sample far from the EWMA mean, in EWMA standard deviations
+    JUMP = "jump"  # EWMA mean changes too fast over `rate_window` samples
+    DRIFT = "drift"  # fast EWMA mean moved away from the slow baseline
+    STUCK = "stuck"  # the same value repeated for `stuck_samples` samples
+
+
+@dataclass(frozen=True)
+class AnomalyConfig:
+    """
+    Detector parameters. A zero limit disables that check.
+
+    `alpha` and `baseline_alpha` are the weights of the newest sample in the
+    fast and the slow EWMA; no anomaly is reported during the first
+    `warmup_samples` samples while the averages settle.
+    """
+
+    alpha: float = 0.05
+    baseline_alpha: float = 0.002
+    warmup_samples: int = 100
+    z_limit: float = 5.0
+    min_std_mc: float = 20.0
+    rate_window: int = 20
+    max_rate_mc_per_s: float = 5000.0
+    drift_mc: int = 1000
+    stuck_samples: int = 200
+
+
+@dataclass(frozen=True)
+class AnomalyEvent:
+    """Start of an anomaly; `value` is the z-score, rate [mC/s], drift [mC] or run length."""
+
+    kind: AnomalyKind
+    index: int
+    timestamp_ns: int
+    temp_mC: int
+    value: float
+
+
+def _ewma(values: np.ndarray, alpha: float, start: float) -> np.ndarray:
+    """Return y with y[i] = (1 - alpha) * y[i - 1] + alpha * values[i] and y[-1] = start."""
+    decay = 1.0 - alpha
+    chunk = max(1, int(math.log(_MIN_DECAY_POWER) / math.log(decay))) if decay > 0 else 1
+    out = np.empty(values.size, dtype=np.float64)
+    previous = start
+    for begin in range(0, values.size, chunk):
+        part = values[begin:begin + chunk] - previous
+        powers = decay ** np.arange(1, part.size + 1, dtype=np.float64)
+        # Closed form of the recursion relative to `previous`: alpha * d^(i+1) * sum(u_k / d^(k+1)).
+        out[begin:begin + part.size] = previous + alpha * powers * np.cumsum(part / powers)
+        previous = float(out[begin + part.size - 1])
+    return out
+
+
+class AnomalyDetector:
+    """
+    Evaluate sample batches for anomalies that a fixed threshold misses.
+
+    EWMA mean/variance and the baseline are computed for the whole batch
+    with a closed form of the recursion, rate-of-change and stuck-value runs
+    with shifted array comparisons, so the work per sample is constant.
+    Like `AlertEngine`, only the start of each anomaly is reported, and
+    `AnomalyEvent.index` counts samples since the last `reset()`.
+    """
+
+    def __init__(self, config: AnomalyConfig | None = None) -> None:
+        self._config = config or AnomalyConfig()
+        self.reset()
+
+    @property
+    def config(self) -> AnomalyConfig:
+        return self._config
+
+    @property
+    def active(self) -> frozenset[AnomalyKind]:
+        """Return the anomalies that are currently ongoing."""
+        return frozenset(kind for kind, active in self._active.items() if active)
+
+    @property
+    def samples_seen(self) -> int:
+        return self._count
+
+    def configure(self, config: AnomalyConfig) -> None:
+        """Replace the configuration and restart detection from a clear state."""
+        self._config = config
+        self.reset()
+
+    def reset(self) -> None:
+        self._count = 0
+        self._mean: Optional[float] = None
+        self._var = 0.0
+        self._baseline = 0.0
+        self._run = 0
+        self._last_value: Optional[float] = None
+        self._tail_t = np.empty(0, dtype=np.int64)
+        self._tail_x = np.empty(0, dtype=np.float64)
+        self._active = {kind: False for kind in AnomalyKind}
+
+    def process(self, timestamps_ns, temps_mc) -> list[AnomalyEvent]:
+        """
+        Evaluate one chronological batch and return the anomalies that started in it.
+
+        Args:
+            timestamps_ns: Kernel timestamps of the samples.
+            temps_mc: Temperatures in milli-degrees Celsius.
+        """
+        t = np.asarray(timestamps_ns, dtype=np.int64)
+        x = np.asarray(temps_mc, dtype=np.float64)
+        count = x.size
+        if count == 0:
+            return []
+        cfg = self._config
+        if self._mean is None:
+            self._mean = self._baseline = float(x[0])
+
+        # EWMA of the mean and the variance; the statistics *before* each sample score it.
+        mean = _ewma(x, cfg.alpha, self._mean)
+        mean_before = np.concatenate(([self._mean], mean[:-1]))
+        deviation = x - mean_before
+        var = _ewma((1.0 - cfg.alpha) * deviation * deviation, cfg.alpha, self._var)
+        var_before = np.concatenate(([self._var], var[:-1]))
+        baseline = _ewma(x, cfg.baseline_alpha, self._baseline)
+
+        conditions: dict[AnomalyKind, Optional[np.ndarray]] = {}
+        values: dict[AnomalyKind, np.ndarray] = {}
+        if cfg.z_limit > 0:
+            values[AnomalyKind.SPIKE] = np.abs(deviation) / np.maximum(np.sqrt(var_before), cfg.min_std_mc)
+            conditions[AnomalyKind.SPIKE] = values[AnomalyKind.SPIKE] > cfg.z_limit
+        if cfg.max_rate_mc_per_s > 0 and cfg.rate_window > 0:
+            # Measured on the EWMA mean: on raw samples the noise alone would look like jumps.
+            values[AnomalyKind.JUMP], conditions[AnomalyKind.JUMP] = self._rates(t, mean)
+        if cfg.drift_mc > 0:
+            values[AnomalyKind.DRIFT] = mean - baseline
+            conditions[AnomalyKind.DRIFT] = np.abs(values[AnomalyKind.DRIFT]) > cfg.drift_mc
+        runs = self._runs(x)
+        if cfg.stuck_samples > 0:
+            values[AnomalyKind.STUCK] = runs
+            conditions[AnomalyKind.STUCK] = runs >= cfg.stuck_samples
+
+        # Ignore everything until the averages have settled.
+        settled = np.arange(self._count, self._count + count) >= cfg.warmup_samples
+        events: list[AnomalyEvent] = []
+        for kind, condition in conditions.items():
+            condition &= settled
+            starts = condition & ~np.concatenate(([self._active[kind]], condition[:-1]))
+            for index in np.flatnonzero(starts).tolist():
+                events.append(
+                    AnomalyEvent(kind, self._count + index, int(t[index]), int(x[index]), float(values[kind][index]))
+                )
+            self._active[kind] = bool(condition[-1])
+
+        self._mean = float(mean[-1])
+        self._var = float(var[-1])
+        self._baseline = float(baseline[-1])
+        self._run = int(runs[-1])
+        self._last_value = float(x[-1])
+        self._count += count
+        events.sort(key=lambda event: event.index)
+        return events
+
+    def _rates(self, t: np.ndarray, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Rate of change [mC/s] of every value against the one `rate_window` samples earlier."""
+        window = self._config.rate_window
+        all_t = np.concatenate((self._tail_t, t))
+        all_x = np.concatenate((self._tail_x, x))
+        offset = self._tail_t.size
+        self._tail_t, self._tail_x = all_t[-window:], all_x[-window:]
+
+        rates = np.zeros(x.size, dtype=np.float64)
+        first = max(0, window - offset)  # samples that already have a full window behind them
+        if first < x.size:
+            current = slice(offset + first, None)
+            earlier = slice(offset + first - window, all_x.size - window)
+            elapsed = (all_t[current] - all_t[earlier]).astype(np.float64)
+            np.divide((all_x[current] - all_x[earlier]) * 1e9, elapsed, out=rates[first:], where=elapsed > 0)
+        return rates, np.abs(rates) > self._config.max_rate_mc_per_s
+
+    def _runs(self, x: np.ndarray) -> np.ndarray:
+        """Length of the run of identical values that ends at every sample."""
+        previous = self._last_value
+        index = np.arange(x.size)
+        changed = np.empty(x.size, dtype=bool)
+        changed[0] = previous is None or x[0] != previous
+        np.not_equal(x[1:], x[:-1], out=changed[1:])
+        last_change = np.where(changed, index, -1)
+        np.maximum.accumulate(last_change, out=last_change)
+        # Before the first change in this batch the run continues the previous batch's run.
+        return np.where(last_change >= 0, index - last_change + 1, self._run + index + 1)
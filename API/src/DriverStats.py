@@ -0,0 +1,222 @@
+"""
+Periodic sampling of the driver `stats` attribute with per-second rates.
+
+The driver reports one line such as
+`samples=1200 overruns=0 alerts=3 alert_pending=0 overflow_pending=0 threshold_mC=45000`.
+`StatsPoller` keeps the attribute open and re-reads it with `pread()`, so a
+poll costs one system call. Run `python -m API.src.DriverStats` to print the
+rates once per interval.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+__all__ = ["COUNTER_FIELDS", "STATS_CSV_HEADER", "StatsSnapshot", "StatsPoller", "parse_stats", "main"]
+
+# Monotonic counters; the other fields are reported as they are.
+COUNTER_FIELDS = ("samples", "overruns", "alerts")
+DEFAULT_STATS_PATH = "/sys/class/misc/nxp_simtemp/stats"
+STATS_CSV_HEADER = ",".join(("monotonic_ns", *COUNTER_FIELDS, *(f"{name}_per_s" for name in COUNTER_FIELDS)))
+_MAX_STATS_BYTES = 4096
+
+
+def parse_stats(text: str) -> dict[str, int]:
+    """Parse the `key=value` pairs of the stats attribute, ignoring malformed ones."""
+    values = {}
+    for item in text.split():
+        key, separator, value = item.partition("=")
+        if not separator:
+            continue
+        try:
+            values[key] = int(value)
+        except ValueError:
+            continue
+    return values
+
+
+@dataclass(frozen=True)
+class StatsSnapshot:
+    """
+    One reading of the stats attribute.
+
+    `rates` holds per-second rates of the counters since the previous
+    reading. It is empty for the first reading and after a reset (a counter
+    went backwards or the attribute had to be reopened, e.g. after the module
+    was reloaded), because the interval the counters cover is unknown then.
+    """
+
+    monotonic_ns: int
+    values: dict[str, int]
+    rates: dict[str, float] = field(default_factory=dict)
+    reset: bool = False
+
+    def csv_row(self) -> str:
+        """Return the snapshot as a row matching `STATS_CSV_HEADER`."""
+        counters = ",".join(str(self.values.get(name, "")) for name in COUNTER_FIELDS)
+        rates = ",".join(f"{self.rates[name]:.3f}" if name in self.rates else "" for name in COUNTER_FIELDS)
+        return f"{self.monotonic_ns},{counters},{rates}"
+
+    def summary(self) -> str:
+        """Return a short human-readable line, e.g. for a status bar."""
+        if not self.rates:
+            return "Driver: " + ", ".join(f"{name} {self.values[name]}" for name in COUNTER_FIELDS if name in self.values)
+        return "Driver: " + ", ".join(f"{self.rates[name]:.1f} {name}/s" for name in COUNTER_FIELDS if name in self.rates)
+
+
+class StatsPoller:
+    """
+    Read the stats attribute every `interval_s` seconds and derive rates.
+
+    `poll()` can be called directly; `start()` runs it on a daemon thread and
+    passes every snapshot to the listeners, which are called on that thread.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_STATS_PATH, *, interval_s: float = 1.0) -> None:
+        if interval_s <= 0:
+            raise ValueError("interval_s must be positive")
+        self._path = Path(path)
+        self._interval_s = interval_s
+        self._fd: Optional[int] = None
+        self._previous: Optional[StatsSnapshot] = None
+        self._listeners: list[Callable[[StatsSnapshot], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @classmethod
+    def for_sensor(cls, sensor, *, interval_s: float = 1.0) -> "StatsPoller":
+        """Create a poller for the stats attribute of a `TempSensor`."""
+        return cls(Path(sensor.driver.sysfs_base) / "stats", interval_s=interval_s)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def interval_s(self) -> float:
+        return self._interval_s
+
+    @property
+    def latest(self) -> Optional[StatsSnapshot]:
+        return self._previous
+
+    @staticmethod
+    def sidecar_path(log_path: str | Path) -> Path:
+        """Return the stats log stored next to a session log."""
+        log_path = Path(log_path)
+        return log_path.with_name(log_path.name + ".stats.csv")
+
+    def add_listener(self, callback: Callable[[StatsSnapshot], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[StatsSnapshot], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def poll(self) -> Optional[StatsSnapshot]:
+        """Read the attribute once; returns None while it cannot be read (module not loaded)."""
+        reopened = self._fd is None
+        try:
+            if self._fd is None:
+                self._fd = os.open(self._path, os.O_RDONLY | os.O_CLOEXEC)
+            data = os.pread(self._fd, _MAX_STATS_BYTES, 0)
+        except OSError:
+            # The attribute goes away with the module; reopen it on the next poll.
+            self._close_fd()
+            return None
+        now = time.monotonic_ns()
+        values = parse_stats(data.decode("ascii", "replace"))
+        if not values:
+            return None
+
+        previous = self._previous
+        reset = previous is not None and (
+            reopened or any(values.get(name, 0) < previous.values.get(name, 0) for name in COUNTER_FIELDS)
+        )
+        rates: dict[str, float] = {}
+        if previous is not None and not reset and now > previous.monotonic_ns:
+            elapsed_s = (now - previous.monotonic_ns) / 1e9
+            rates = {
+                name: (values[name] - previous.values[name]) / elapsed_s
+                for name in COUNTER_FIELDS
+                if name in values and name in previous.values
+            }
+        snapshot = StatsSnapshot(now, values, rates, reset)
+        self._previous = snapshot
+        return snapshot
+
+    def start(self) -> None:
+        """Poll on a background thread until `stop()`."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="simtemp-stats", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        self._close_fd()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            snapshot = self.poll()
+            if snapshot is not None:
+                for callback in list(self._listeners):
+                    callback(snapshot)
+            self._stop_event.wait(self._interval_s)
+
+    def _close_fd(self) -> None:
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Print SimTemp driver counters and their rates.")
+    parser.add_argument("--path", default=DEFAULT_STATS_PATH, help="stats attribute (default: %(default)s)")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between readings")
+    parser.add_argument("--csv", action="store_true", help="print CSV rows instead of summaries")
+    parser.add_argument("--count", type=int, default=None, help="stop after this many readings")
+    args = parser.parse_args(argv)
+
+    poller = StatsPoller(args.path, interval_s=args.interval)
+    if args.csv:
+        print(STATS_CSV_HEADER)
+    printed = 0
+    try:
+        while args.count is None or printed < args.count:
+            snapshot = poller.poll()
+            if snapshot is None:
+                print(f"Cannot read {args.path}", file=sys.stderr)
+            else:
+                print(snapshot.csv_row() if args.csv else snapshot.summary(), flush=True)
+                printed += 1
+            if args.count is None or printed < args.count:
+                time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poller.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
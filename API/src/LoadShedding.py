@@ -0,0 +1,176 @@
+"""
+Display load shedding driven by the measured frame time.
+
+Only display work is shed. Persistence and alerting read the bus losslessly
+(`OverflowPolicy.BLOCK` and the acquisition-thread pipeline), so a thinned
+chart never means an incomplete log. `FrameLoadMonitor` compares the time
+spent rendering with the frame budget and moves between the `SHED_LEVELS`
+with hysteresis; `BackpressureMonitor` watches the lossless bus consumers
+and reports when they fall behind far enough to hold back acquisition.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from API.src.SampleBus import OverflowPolicy, SampleBus
+
+__all__ = ["ShedPolicy", "SHED_LEVELS", "FrameLoadMonitor", "BackpressureAlarm", "BackpressureMonitor"]
+
+
+@dataclass(frozen=True)
+class ShedPolicy:
+    """What the display gives up at one shed level."""
+
+    decimation: int  # plot every n-th sample
+    frame_interval: int  # render every n-th frame tick
+
+    def describe(self) -> str:
+        if self.decimation == 1 and self.frame_interval == 1:
+            return "Display: full rate"
+        parts = []
+        if self.decimation > 1:
+            parts.append(f"1/{self.decimation} of the samples")
+        if self.frame_interval > 1:
+            parts.append(f"every {self.frame_interval}th frame" if self.frame_interval > 2 else "every 2nd frame")
+        return "Display thinned: " + ", ".join(parts) + " (log complete)"
+
+
+SHED_LEVELS = (
+    ShedPolicy(decimation=1, frame_interval=1),
+    ShedPolicy(decimation=2, frame_interval=1),
+    ShedPolicy(decimation=4, frame_interval=2),
+    ShedPolicy(decimation=8, frame_interval=4),
+)
+
+
+class FrameLoadMonitor:
+    """
+    Choose a shed level from the render time of the frames.
+
+    The load is the smoothed render time of a rendered frame divided by the
+    time available for it (budget times the frame interval of the current
+    level). The level goes up once the load exceeds `raise_load`. It goes
+    down only after `settle_frames` frame ticks in which the load expected
+    at the lower level, i.e. scaled by the work that level sheds, stays
+    below `lower_load`, so stepping down cannot push the load straight back
+    over `raise_load`. After a change the average starts over and the level
+    holds for `cooldown_frames`, so the next step is taken on frames
+    rendered at the new level.
+    """
+
+    def __init__(
+        self,
+        budget_s: float,
+        *,
+        raise_load: float = 0.75,
+        lower_load: float = 0.5,
+        alpha: float = 0.25,
+        settle_frames: int = 30,
+        cooldown_frames: int = 5,
+    ) -> None:
+        if not 0 < lower_load < raise_load:
+            raise ValueError("lower_load must be positive and below raise_load")
+        self._budget_s = budget_s
+        self._raise_load = raise_load
+        self._lower_load = lower_load
+        self._alpha = alpha
+        self._settle_frames = settle_frames
+        self._cooldown_frames = cooldown_frames
+        self.reset()
+
+    @property
+    def level(self) -> int:
+        return self._level
+
+    @property
+    def policy(self) -> ShedPolicy:
+        return SHED_LEVELS[self._level]
+
+    @property
+    def load(self) -> float:
+        return self._load
+
+    def set_budget(self, budget_s: float) -> None:
+        """Set the time between frame ticks, e.g. after the frame rate changed."""
+        self._budget_s = budget_s
+
+    def reset(self) -> None:
+        self._level = 0
+        self._load = 0.0
+        self._smoothed_s: Optional[float] = None
+        self._quiet_frames = 0
+        self._cooldown = 0
+
+    def record(self, render_s: float) -> bool:
+        """Add the render time of one rendered frame; returns True if the level changed."""
+        if self._smoothed_s is None:
+            self._smoothed_s = render_s
+        else:
+            self._smoothed_s += self._alpha * (render_s - self._smoothed_s)
+        self._load = self._smoothed_s / (self._budget_s * self.policy.frame_interval)
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return False
+
+        if self._load > self._raise_load and self._level + 1 < len(SHED_LEVELS):
+            self._change_level(self._level + 1)
+            return True
+        if self._level > 0 and self._load * self._work_ratio(self._level - 1) < self._lower_load:
+            self._quiet_frames += 1
+            # Counted in frame ticks, so a level that skips frames does not take longer to recover.
+            if self._quiet_frames * self.policy.frame_interval >= self._settle_frames:
+                self._change_level(self._level - 1)
+                return True
+        else:
+            self._quiet_frames = 0
+        return False
+
+    def _work_ratio(self, level: int) -> float:
+        """Return how much more rendering per frame budget `level` costs than the current level."""
+        current, other = self.policy, SHED_LEVELS[level]
+        return (current.decimation * current.frame_interval) / (other.decimation * other.frame_interval)
+
+    def _change_level(self, level: int) -> None:
+        self._level = level
+        self._smoothed_s = None
+        self._quiet_frames = 0
+        self._cooldown = self._cooldown_frames
+
+
+@dataclass(frozen=True)
+class BackpressureAlarm:
+    consumer: str
+    fill: float  # share of the bus capacity the consumer is behind
+    stalls: int  # publishes that had to wait since the previous check
+
+    def describe(self) -> str:
+        text = f"{self.consumer} is {self.fill:.0%} behind"
+        if self.stalls:
+            text += f", acquisition waited {self.stalls}×"
+        return text
+
+
+class BackpressureMonitor:
+    """Report lossless (`BLOCK`) consumers that fill more than `high_water` of the bus."""
+
+    def __init__(self, bus: SampleBus, *, high_water: float = 0.5) -> None:
+        self._bus = bus
+        self._high_water = high_water
+        self._seen_stalls = bus.stalls
+
+    def check(self) -> Optional[BackpressureAlarm]:
+        """Return the worst alarm since the previous check, or None while everything keeps up."""
+        stalls = self._bus.stalls - self._seen_stalls
+        self._seen_stalls = self._bus.stalls
+        worst = None
+        for consumer in self._bus.consumers:
+            if consumer.policy is not OverflowPolicy.BLOCK or consumer.closed:
+                continue
+            fill = consumer.lag / self._bus.capacity
+            if worst is None or fill > worst.fill:
+                worst = BackpressureAlarm(consumer.name, fill, stalls)
+        if worst is None or (worst.fill < self._high_water and not stalls):
+            return None
+        return worst
@@ -0,0 +1,299 @@
+"""Parallel statistics over sample logs (CSV or binary session files)."""
+
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from API.src.SampleCsv import DEFAULT_BLOCK_BYTES, parse_csv_block
+from API.src.SampleRing import SAMPLE_DTYPE
+from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_THR_EDGE
+
+__all__ = ["LogStats", "analyze_log", "split_csv", "split_binary"]
+
+CSV_SUFFIXES = (".csv", ".txt")
+MIN_PART_BYTES = 4 << 20
+
+
+@dataclass(frozen=True)
+class _AnalysisParams:
+    threshold_c: Optional[float]
+    hist_range: tuple[float, float]
+    hist_bins: int
+
+
+@dataclass
+class LogStats:
+    """
+    Mergeable summary of a run of samples.
+
+    Moments use Welford/Chan updates, so partial results from consecutive
+    pieces of a log merge into the same values as a single pass. The
+    histogram has fixed edges for the same reason.
+    """
+
+    count: int = 0
+    min_c: float = math.inf
+    max_c: float = -math.inf
+    mean_c: float = 0.0
+    m2: float = 0.0
+    hist_range: tuple[float, float] = (-40.0, 150.0)
+    histogram: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    underflow: int = 0
+    overflow: int = 0
+    interval_count: int = 0
+    interval_mean_ns: float = 0.0
+    interval_m2: float = 0.0
+    interval_min_ns: int = 0
+    interval_max_ns: int = 0
+    crossings: int = 0
+    alert_edges: int = 0
+    first_timestamp_ns: int = 0
+    last_timestamp_ns: int = 0
+    first_above: bool = False
+    last_above: bool = False
+
+    @property
+    def std_c(self) -> float:
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    @property
+    def duration_s(self) -> float:
+        return (self.last_timestamp_ns - self.first_timestamp_ns) / 1e9 if self.count else 0.0
+
+    @property
+    def period_ms(self) -> float:
+        return self.interval_mean_ns / 1e6
+
+    @property
+    def jitter_ms(self) -> float:
+        """Return the standard deviation of the sampling period."""
+        if not self.interval_count:
+            return 0.0
+        return math.sqrt(self.interval_m2 / self.interval_count) / 1e6
+
+    def merge(self, later: "LogStats") -> "LogStats":
+        """Combine with the statistics of the piece that directly follows this one."""
+        if not later.count:
+            return self
+        if not self.count:
+            return later
+
+        count = self.count + later.count
+        delta = later.mean_c - self.mean_c
+        mean = self.mean_c + delta * later.count / count
+        m2 = self.m2 + later.m2 + delta * delta * self.count * later.count / count
+
+        # The interval spanning the boundary belongs to neither piece.
+        boundary = later.first_timestamp_ns - self.last_timestamp_ns
+        intervals = [
+            (
+                self.interval_count,
+                self.interval_mean_ns,
+                self.interval_m2,
+                self.interval_min_ns,
+                self.interval_max_ns,
+            ),
+            (1, float(boundary), 0.0, boundary, boundary),
+            (
+                later.interval_count,
+                later.interval_mean_ns,
+                later.interval_m2,
+                later.interval_min_ns,
+                later.interval_max_ns,
+            ),
+        ]
+        n_acc, mean_acc, m2_acc, low_acc, high_acc = 0, 0.0, 0.0, 0, 0
+        for n, i_mean, i_m2, low, high in intervals:
+            if not n:
+                continue
+            total = n_acc + n
+            i_delta = i_mean - mean_acc
+            mean_acc += i_delta * n / total
+            m2_acc += i_m2 + i_delta * i_delta * n_acc * n / total
+            low_acc = low if not n_acc else min(low_acc, low)
+            high_acc = high if not n_acc else max(high_acc, high)
+            n_acc = total
+
+        return LogStats(
+            count=count,
+            min_c=min(self.min_c, later.min_c),
+            max_c=max(self.max_c, later.max_c),
+            mean_c=mean,
+            m2=m2,
+            hist_range=self.hist_range,
+            histogram=self.histogram + later.histogram,
+            underflow=self.underflow + later.underflow,
+            overflow=self.overflow + later.overflow,
+            interval_count=n_acc,
+            interval_mean_ns=mean_acc,
+            interval_m2=m2_acc,
+            interval_min_ns=low_acc,
+            interval_max_ns=high_acc,
+            crossings=self.crossings + later.crossings + int(self.last_above != later.first_above),
+            alert_edges=self.alert_edges + later.alert_edges,
+            first_timestamp_ns=self.first_timestamp_ns,
+            last_timestamp_ns=later.last_timestamp_ns,
+            first_above=self.first_above,
+            last_above=later.last_above,
+        )
+
+
+def split_csv(path: str | Path, parts: int) -> list[tuple[int, int]]:
+    """
+    Split a CSV file into byte ranges.
+
+    Boundaries are nominal: a range owns every line that starts inside it, so
+    readers skip the partial line at their start and finish the one that
+    crosses their end.
+    """
+    size = Path(path).stat().st_size
+    parts = max(1, min(parts, size // MIN_PART_BYTES or 1))
+    edges = [size * i // parts for i in range(parts + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def split_binary(path: str | Path, parts: int) -> list[tuple[int, int]]:
+    """Split a binary session file into record ranges."""
+    records = Path(path).stat().st_size // SAMPLE_DTYPE.itemsize
+    parts = max(1, min(parts, records * SAMPLE_DTYPE.itemsize // MIN_PART_BYTES or 1))
+    edges = [records * i // parts for i in range(parts + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def analyze_log(
+    path: str | Path,
+    *,
+    threshold_c: Optional[float] = None,
+    workers: Optional[int] = None,
+    hist_range: tuple[float, float] = (-40.0, 150.0),
+    hist_bins: int = 19000,
+) -> LogStats:
+    """
+    Compute `LogStats` for a log, spreading the work over a process pool.
+
+    CSV files (`timestamp_ns,temperature_c`) are split into line-aligned byte
+    ranges; other files are read as binary `simtemp_sample_v1` records and
+    split by record offset. Each worker returns a partial result and the
+    partials are merged in file order.
+    """
+    path = Path(path)
+    workers = workers or os.cpu_count() or 1
+    params = _AnalysisParams(threshold_c, hist_range, hist_bins)
+    is_csv = path.suffix.lower() in CSV_SUFFIXES
+    # A few pieces per worker keep the pool busy when pieces finish unevenly.
+    ranges = (split_csv if is_csv else split_binary)(path, workers * 4)
+    task = _analyze_csv_range if is_csv else _analyze_binary_range
+
+    if workers == 1 or len(ranges) == 1:
+        partials = [task(str(path), start, end, params) for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(
+                pool.map(
+                    task,
+                    [str(path)] * len(ranges),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                    [params] * len(ranges),
+                )
+            )
+
+    result = LogStats(hist_range=hist_range, histogram=np.zeros(hist_bins, dtype=np.int64))
+    for partial in partials:
+        result = result.merge(partial)
+    return result
+
+
+def _analyze_csv_range(path: str, start: int, end: int, params: _AnalysisParams) -> LogStats:
+    stats = _partial_stats(np.empty(0, np.int64), np.empty(0), None, params)
+    with open(path, "rb") as handle:
+        if start > 0:
+            # Skip up to the first line starting at or after `start`; the one before belongs to the previous range.
+            handle.seek(start - 1)
+            handle.readline()
+        else:
+            header = handle.readline()
+            if header[:1].isdigit() or header[:1] == b"-":
+                handle.seek(0)
+        # Parse the range in blocks of whole lines to bound memory per worker.
+        while handle.tell() < end:
+            data = handle.read(min(DEFAULT_BLOCK_BYTES, end - handle.tell()))
+            if not data:
+                break
+            if not data.endswith(b"\n"):
+                data += handle.readline()
+            timestamps, temps = parse_csv_block(data)
+            stats = stats.merge(_partial_stats(timestamps, temps, None, params))
+    return stats
+
+
+def _analyze_binary_range(path: str, start: int, end: int, params: _AnalysisParams) -> LogStats:
+    count = end - start
+    if count <= 0:
+        return _partial_stats(np.empty(0, np.int64), np.empty(0), None, params)
+    records = np.memmap(
+        path,
+        dtype=SAMPLE_DTYPE,
+        mode="r",
+        offset=start * SAMPLE_DTYPE.itemsize,
+        shape=(count,),
+    )
+    return _partial_stats(
+        records["timestamp_ns"].astype(np.int64),
+        records["temp_mC"] / 1000.0,
+        records["flags"],
+        params,
+    )
+
+
+def _partial_stats(
+    timestamps: np.ndarray,
+    temps_c: np.ndarray,
+    flags: Optional[np.ndarray],
+    params: _AnalysisParams,
+) -> LogStats:
+    """Vectorized statistics for one contiguous piece of a log."""
+    low, high = params.hist_range
+    stats = LogStats(hist_range=params.hist_range, histogram=np.zeros(params.hist_bins, dtype=np.int64))
+    count = temps_c.size
+    if count == 0:
+        return stats
+
+    mean = float(temps_c.mean())
+    stats.count = count
+    stats.min_c = float(temps_c.min())
+    stats.max_c = float(temps_c.max())
+    stats.mean_c = mean
+    stats.m2 = float(np.square(temps_c - mean).sum())
+
+    stats.histogram = np.histogram(temps_c, bins=params.hist_bins, range=(low, high))[0].astype(np.int64)
+    stats.underflow = int(np.count_nonzero(temps_c < low))
+    stats.overflow = int(np.count_nonzero(temps_c > high))
+
+    intervals = np.diff(timestamps)
+    if intervals.size:
+        interval_mean = float(intervals.mean())
+        stats.interval_count = intervals.size
+        stats.interval_mean_ns = interval_mean
+        stats.interval_m2 = float(np.square(intervals - interval_mean).sum())
+        stats.interval_min_ns = int(intervals.min())
+        stats.interval_max_ns = int(intervals.max())
+
+    if params.threshold_c is not None:
+        above = temps_c >= params.threshold_c
+        stats.crossings = int(np.count_nonzero(above[1:] != above[:-1]))
+        stats.first_above = bool(above[0])
+        stats.last_above = bool(above[-1])
+    if flags is not None:
+        stats.alert_edges = int(np.count_nonzero(flags & SIMTEMP_FLAG_THR_EDGE))
+
+    stats.first_timestamp_ns = int(timestamps[0])
+    stats.last_timestamp_ns = int(timestamps[-1])
+    return stats
@@ -0,0 +1,220 @@
+"""Incremental min/max mipmap over a sample stream for zoomable charts."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+__all__ = ["MinMaxPyramid"]
+
+
+class _Level:
+    """Growable columns holding the buckets of one pyramid level."""
+
+    def __init__(self, capacity: int) -> None:
+        self.t = np.empty(capacity, dtype=np.int64)
+        self.lo = np.empty(capacity, dtype=np.int32)
+        self.hi = np.empty(capacity, dtype=np.int32)
+        self.size = 0
+        self.dropped = 0  # buckets evicted from the front; bucket i is the (dropped + i)-th of the level
+
+    @property
+    def total(self) -> int:
+        return self.dropped + self.size
+
+    def extend(self, t: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> None:
+        needed = self.size + t.size
+        if needed > self.t.size:
+            capacity = max(needed, 2 * self.t.size)
+            for name in ("t", "lo", "hi"):
+                grown = np.empty(capacity, dtype=getattr(self, name).dtype)
+                grown[:self.size] = getattr(self, name)[:self.size]
+                setattr(self, name, grown)
+        self.t[self.size:needed] = t
+        self.lo[self.size:needed] = lo
+        self.hi[self.size:needed] = hi
+        self.size = needed
+
+    def view(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.t[:self.size], self.lo[:self.size], self.hi[:self.size]
+
+    def trim(self, keep: int) -> None:
+        """Evict the oldest buckets once more than twice `keep` are held, so eviction is amortized O(1)."""
+        if self.size <= 2 * keep:
+            return
+        evict = self.size - keep
+        for column in (self.t, self.lo, self.hi):
+            column[:keep] = column[evict:self.size]
+        self.size = keep
+        self.dropped += evict
+
+
+class MinMaxPyramid:
+    """
+    Min/max pyramid of a temperature series.
+
+    Level 0 holds the raw samples; every bucket of level N+1 covers two
+    buckets of level N and keeps their first timestamp, minimum and maximum.
+    Appending a batch touches each level once with array operations, so the
+    pyramid is maintained in amortized O(1) per sample, and `query()` returns
+    at most `max_points` buckets regardless of how many samples are covered.
+
+    With `max_samples` the pyramid only covers the most recent samples: every
+    level keeps the buckets of the last `max_samples` (up to twice as many
+    between evictions), so memory stays flat however long the stream runs.
+    Older spans are left to the session file and its rollups.
+    """
+
+    def __init__(self, capacity_hint: int = 4096, *, max_samples: Optional[int] = None) -> None:
+        if max_samples is not None and max_samples < 2:
+            raise ValueError("max_samples must be at least 2")
+        self._capacity_hint = max(2, capacity_hint)
+        self._max_samples = max_samples
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._levels[0].size
+
+    @property
+    def levels(self) -> int:
+        return len(self._levels)
+
+    @property
+    def max_samples(self) -> Optional[int]:
+        return self._max_samples
+
+    def clear(self) -> None:
+        self._levels = [_Level(self._capacity_hint)]
+
+    def level(self, index: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return read-only views (timestamp_ns, min_mC, max_mC) of one level."""
+        t, lo, hi = self._levels[index].view()
+        for column in (t, lo, hi):
+            column.flags.writeable = False
+        return t, lo, hi
+
+    def append(self, timestamps_ns, temps_mc) -> None:
+        """Add a chronological batch of samples and update every level."""
+        t = np.asarray(timestamps_ns, dtype=np.int64)
+        temps = np.asarray(temps_mc, dtype=np.int32)
+        if t.size == 0:
+            return
+        self._levels[0].extend(t, temps, temps)
+        self._fold()
+        if self._max_samples is not None:
+            # Trim only after folding: at most one bucket per level is still waiting for its pair.
+            for index, level in enumerate(self._levels):
+                level.trim(self._level_keep(index))
+
+    def _fold(self) -> None:
+        index = 0
+        while True:
+            below = self._levels[index]
+            if index + 1 == len(self._levels):
+                if below.size < 2 or (self._max_samples is not None and self._level_keep(index + 1) < 2):
+                    return
+                self._levels.append(_Level(max(2, self._capacity_hint >> (index + 1))))
+            above = self._levels[index + 1]
+            start = 2 * above.total - below.dropped
+            stop = below.size - (below.size - start) % 2
+            if stop <= start:
+                return
+            t_pairs = below.t[start:stop:2]
+            lo = np.minimum(below.lo[start:stop:2], below.lo[start + 1:stop:2])
+            hi = np.maximum(below.hi[start:stop:2], below.hi[start + 1:stop:2])
+            above.extend(t_pairs, lo, hi)
+            index += 1
+
+    def _level_keep(self, index: int) -> int:
+        """Buckets of level `index` that cover the last `max_samples` samples."""
+        return self._max_samples >> index
+
+    def select_level(self, t_start: int, t_end: int, max_points: int) -> int:
+        """Return the finest level that draws [t_start, t_end] in at most `max_points` buckets."""
+        for index, level in enumerate(self._levels):
+            t = level.t[:level.size]
+            first, last = np.searchsorted(t, (t_start, t_end), side="right")
+            if last - first <= max_points:
+                return index
+        return len(self._levels) - 1
+
+    def query(
+        self,
+        t_start: int,
+        t_end: int,
+        max_points: int,
+    ) -> tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return (level, timestamp_ns, min_mC, max_mC) covering [t_start, t_end].
+
+        The bucket that started before `t_start` is included so lines reach the
+        left edge, and samples not yet folded into the chosen level are merged
+        into one trailing partial bucket.
+        """
+        level_index = self.select_level(t_start, t_end, max_points)
+        level = self._levels[level_index]
+        t, lo, hi = level.view()
+        first = max(0, int(np.searchsorted(t, t_start, side="right")) - 1)
+        last = int(np.searchsorted(t, t_end, side="right"))
+        t, lo, hi = t[first:last], lo[first:last], hi[first:last]
+
+        tail = self._pending_tail(level_index)
+        if tail is not None and t_start <= tail[0] <= t_end:
+            t = np.append(t, tail[0])
+            lo = np.append(lo, tail[1])
+            hi = np.append(hi, tail[2])
+        return level_index, t, lo, hi
+
+    def save(self, path: str | Path) -> None:
+        """Persist all levels, as far as they are kept in memory, to a compressed `.npz` file."""
+        columns = {}
+        for index, level in enumerate(self._levels):
+            t, lo, hi = level.view()
+            columns[f"t{index}"] = t
+            columns[f"lo{index}"] = lo
+            columns[f"hi{index}"] = hi
+            columns[f"dropped{index}"] = np.int64(level.dropped)
+        with open(path, "wb") as handle:
+            np.savez_compressed(handle, **columns)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "MinMaxPyramid":
+        """Load a pyramid previously written by `save()`."""
+        pyramid = cls()
+        with np.load(path) as data:
+            levels = []
+            index = 0
+            while f"t{index}" in data:
+                t = data[f"t{index}"]
+                level = _Level(max(2, t.size))
+                level.extend(t, data[f"lo{index}"], data[f"hi{index}"])
+                if f"dropped{index}" in data:
+                    level.dropped = int(data[f"dropped{index}"])
+                levels.append(level)
+                index += 1
+        if levels:
+            pyramid._levels = levels
+        return pyramid
+
+    @staticmethod
+    def sidecar_path(log_path: str | Path) -> Path:
+        """Return the pyramid file stored next to a session log."""
+        log_path = Path(log_path)
+        return log_path.with_name(log_path.name + ".pyramid.npz")
+
+    def _pending_tail(self, level_index: int) -> tuple[int, int, int] | None:
+        """Merge the buckets of finer levels that are not yet covered by `level_index`."""
+        tail = None
+        # Each finer level has at most one bucket left over; coarser leftovers are older.
+        for index in range(level_index - 1, -1, -1):
+            level = self._levels[index]
+            covered = 2 * self._levels[index + 1].total - level.dropped
+            if level.size > covered:
+                t, lo, hi = int(level.t[covered]), int(level.lo[covered]), int(level.hi[covered])
+                if tail is None:
+                    tail = (t, lo, hi)
+                else:
+                    tail = (tail[0], min(tail[1], lo), max(tail[2], hi))
+        return tail
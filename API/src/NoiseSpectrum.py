@@ -0,0 +1,249 @@
+"""
+Incremental Welch noise spectrum of the sample stream.
+
+The stream is cut into overlapping Hann-windowed segments as samples
+arrive; the periodograms of the most recent segments are averaged into a
+power spectral density in °C²/Hz, with the configured sampling period as
+the sample rate. From it `WelchSpectrum` reports the noise floor, the RMS
+noise and the dominant frequencies, e.g. interference from another timer
+on the board. `SpectrumStage` runs it as a pipeline stage on the pool.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from API.src.SampleBatch import SampleBatch
+from API.src.SamplePipeline import PipelineStage, StageCost
+
+__all__ = ["SpectrumPeak", "SpectrumReport", "WelchSpectrum", "SpectrumStage"]
+
+# A segment whose timestamps span more than this many periods per sample contains a gap.
+_MAX_GAP_FACTOR = 1.5
+# Stands in for an exactly zero density so it can be drawn on a log axis.
+_MIN_DENSITY = 1e-12
+
+
+@dataclass(frozen=True)
+class SpectrumPeak:
+    frequency_hz: float
+    density_c2_per_hz: float
+    above_floor_db: float
+
+
+@dataclass(frozen=True)
+class SpectrumReport:
+    """Averaged spectrum of the last `segments` segments."""
+
+    frequencies_hz: np.ndarray
+    density_c2_per_hz: np.ndarray
+    sample_rate_hz: float
+    segments: int
+    noise_floor_c2_per_hz: float  # median density, without the DC bin
+    noise_rms_c: float  # density integrated over all bins but DC, i.e. the AC σ
+    peaks: tuple[SpectrumPeak, ...]
+
+    def summary(self) -> str:
+        """Return a short human-readable line, e.g. for a label."""
+        text = (
+            f"Noise floor {self.noise_floor_c2_per_hz:.3g} °C²/Hz, "
+            f"RMS {self.noise_rms_c * 1000:.1f} m°C over {self.segments} segments"
+        )
+        if self.peaks:
+            text += "; peaks " + ", ".join(
+                f"{peak.frequency_hz:.3g} Hz (+{peak.above_floor_db:.0f} dB)" for peak in self.peaks
+            )
+        return text
+
+
+class WelchSpectrum:
+    """
+    Welch power spectral density maintained over a sample stream.
+
+    `append()` keeps the samples that do not fill a segment yet and computes
+    the periodograms of all completed segments with one `np.fft.rfft` call.
+    The most recent `average` periodograms are kept and averaged, so the
+    spectrum follows changes of the noise. Segments that contain a sampling
+    gap are skipped, since they break the uniform spacing the FFT assumes.
+    """
+
+    def __init__(
+        self,
+        sample_period_ms: float,
+        *,
+        segment: int = 256,
+        overlap: float = 0.5,
+        average: int = 16,
+        peak_threshold_db: float = 10.0,
+        max_peaks: int = 3,
+    ) -> None:
+        if segment < 8:
+            raise ValueError("segment must hold at least 8 samples")
+        if not 0.0 <= overlap < 1.0:
+            raise ValueError("overlap must be in [0, 1)")
+        if average <= 0:
+            raise ValueError("average must be positive")
+        self._segment = segment
+        self._step = max(1, int(round(segment * (1.0 - overlap))))
+        self._average = average
+        self._peak_ratio = 10.0 ** (peak_threshold_db / 10.0)
+        self._max_peaks = max_peaks
+        # Periodic Hann window; its power normalizes the periodograms to a density.
+        self._window = 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(segment) / segment)
+        self._window_power = float(np.sum(self._window ** 2))
+        self._sample_period_ms = 0.0
+        self.set_sample_period_ms(sample_period_ms)
+
+    @property
+    def sample_rate_hz(self) -> float:
+        return 1000.0 / self._sample_period_ms
+
+    @property
+    def segments(self) -> int:
+        return self._filled
+
+    @property
+    def skipped(self) -> int:
+        """Return how many segments were skipped because of sampling gaps."""
+        return self._skipped
+
+    def set_sample_period_ms(self, sample_period_ms: float) -> None:
+        """Change the sampling period; the spectrum starts over because old segments used another rate."""
+        if sample_period_ms <= 0:
+            raise ValueError("sample_period_ms must be positive")
+        self._sample_period_ms = float(sample_period_ms)
+        self.reset()
+
+    def reset(self) -> None:
+        self._pending_t = np.empty(0, dtype=np.int64)
+        self._pending_x = np.empty(0, dtype=np.float64)
+        self._periodograms = np.zeros((self._average, self._segment // 2 + 1), dtype=np.float64)
+        self._next = 0
+        self._filled = 0
+        self._skipped = 0
+
+    def append(self, timestamps_ns, temps_mc) -> int:
+        """Add chronological samples and return how many new segments entered the average."""
+        t = np.concatenate((self._pending_t, np.asarray(timestamps_ns, dtype=np.int64)))
+        x = np.concatenate((self._pending_x, np.asarray(temps_mc, dtype=np.float64) / 1000.0))
+        if x.size < self._segment:
+            self._pending_t, self._pending_x = t, x
+            return 0
+        count = (x.size - self._segment) // self._step + 1
+        starts = np.arange(count) * self._step
+        self._pending_t, self._pending_x = t[count * self._step:], x[count * self._step:]
+
+        span_ns = t[starts + self._segment - 1] - t[starts]
+        limit_ns = (self._segment - 1) * self._sample_period_ms * 1e6 * _MAX_GAP_FACTOR
+        regular = span_ns <= limit_ns
+        self._skipped += int(count - np.count_nonzero(regular))
+        segments = sliding_window_view(x, self._segment)[starts[regular]]
+        if segments.shape[0] == 0:
+            return 0
+
+        detrended = segments - segments.mean(axis=1, keepdims=True)
+        spectra = np.abs(np.fft.rfft(detrended * self._window, axis=1)) ** 2
+        spectra /= self.sample_rate_hz * self._window_power
+        # One-sided density: every bin but DC (and Nyquist for even lengths) holds two sides.
+        spectra[:, 1:(self._segment + 1) // 2] *= 2.0
+        for spectrum in spectra[-self._average:]:
+            self._periodograms[self._next] = spectrum
+            self._next = (self._next + 1) % self._average
+        self._filled = min(self._average, self._filled + spectra.shape[0])
+        return spectra.shape[0]
+
+    def report(self) -> Optional[SpectrumReport]:
+        """Return the averaged spectrum, or None before the first complete segment."""
+        if self._filled == 0:
+            return None
+        # The ring fills from row 0, so the first `_filled` rows are the valid ones.
+        density = self._periodograms[:self._filled].mean(axis=0)
+        frequencies = np.fft.rfftfreq(self._segment, d=self._sample_period_ms / 1000.0)
+        ac = density[1:]
+        floor = max(float(np.median(ac)), _MIN_DENSITY)
+        rms = math.sqrt(float(np.sum(ac)) * (frequencies[1] - frequencies[0]))
+        return SpectrumReport(
+            frequencies_hz=frequencies,
+            density_c2_per_hz=density,
+            sample_rate_hz=self.sample_rate_hz,
+            segments=self._filled,
+            noise_floor_c2_per_hz=floor,
+            noise_rms_c=rms,
+            peaks=self._peaks(frequencies, density, floor),
+        )
+
+    def _peaks(self, frequencies: np.ndarray, density: np.ndarray, floor: float) -> tuple[SpectrumPeak, ...]:
+        if self._max_peaks <= 0 or density.size < 3:
+            return ()
+        inner = density[1:-1]
+        local_max = (inner > density[:-2]) & (inner >= density[2:]) & (inner > floor * self._peak_ratio)
+        candidates = np.flatnonzero(local_max) + 1
+        strongest = candidates[np.argsort(density[candidates])[::-1][:self._max_peaks]]
+        return tuple(
+            SpectrumPeak(float(frequencies[i]), float(density[i]), 10.0 * math.log10(density[i] / floor))
+            for i in strongest
+        )
+
+
+class SpectrumStage(PipelineStage):
+    """
+    Pipeline stage maintaining a `WelchSpectrum` and emitting a `SpectrumReport`.
+
+    Reports are emitted at most once per `report_interval_s` and only when
+    new segments arrived, so listeners see a low, steady update rate.
+    """
+
+    name = "spectrum"
+    cost = StageCost.POOL
+
+    def __init__(self, sample_period_ms: float, *, report_interval_s: float = 1.0, **welch_options) -> None:
+        super().__init__()
+        self._spectrum = WelchSpectrum(sample_period_ms, **welch_options)
+        self._report_interval_ns = int(report_interval_s * 1e9)
+        self._last_report_ns: Optional[int] = None
+        self._new_segments = 0
+        self._lock = threading.Lock()
+        self._pending_period_ms: Optional[float] = None
+
+    @property
+    def spectrum(self) -> WelchSpectrum:
+        return self._spectrum
+
+    def set_sample_period_ms(self, sample_period_ms: float) -> None:
+        """Change the sampling period; may be called from any thread and applies from the next batch."""
+        if sample_period_ms <= 0:
+            raise ValueError("sample_period_ms must be positive")
+        with self._lock:
+            self._pending_period_ms = float(sample_period_ms)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._apply_pending()
+        self._spectrum.reset()
+        self._last_report_ns = None
+        self._new_segments = 0
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        with self._lock:
+            self._apply_pending()
+        self._new_segments += self._spectrum.append(batch.timestamps_ns, batch.temps_mc)
+        now = time.monotonic_ns()
+        if self._new_segments and (
+            self._last_report_ns is None or now - self._last_report_ns >= self._report_interval_ns
+        ):
+            self._last_report_ns = now
+            self._new_segments = 0
+            self._emit(self._spectrum.report())
+        return None
+
+    def _apply_pending(self) -> None:
+        if self._pending_period_ms is not None:
+            self._spectrum.set_sample_period_ms(self._pending_period_ms)
+            self._pending_period_ms = None
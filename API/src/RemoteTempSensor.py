@@ -0,0 +1,244 @@
+"""Client for `SampleBroadcaster` with the streaming API of `TempSensor`."""
+
+from __future__ import annotations
+
+import json
+import select
+import socket
+from collections.abc import Generator, Iterable
+from typing import Any, Optional
+
+import numpy as np
+
+from API.src.SampleBatch import SampleBatch, SampleRecord
+from API.src.SampleBroadcaster import DEFAULT_SOCKET_PATH, PROTOCOL_VERSION
+from API.src.SampleRing import SAMPLE_DTYPE
+from API.src.TempSensor import DriverConfig, DriverInfo
+from kernel.apitest.LxDrTemp import SimTempError, SimTempTimeoutError
+
+__all__ = ["RemoteTempSensor"]
+
+_RECV_BYTES = 64 * 1024
+
+
+class RemoteTempSensor:
+    """
+    Read-only view of a sensor shared by a `SampleBroadcaster`.
+
+    Streaming calls (`stream`, `iter_samples`, `read_available`, `fileno`)
+    behave like their `TempSensor` counterparts. The broadcaster owns the
+    driver configuration, so `apply_config()` only accepts a config that is
+    already active, and one-shot reads are not available.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = DEFAULT_SOCKET_PATH,
+        *,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        decimate: int = 1,
+        auto_open: bool = False,
+    ) -> None:
+        if decimate < 1:
+            raise ValueError("decimate must be at least 1")
+        self._socket_path = socket_path
+        self._address = (host or "127.0.0.1", port) if port is not None else None
+        self._decimate = decimate
+        self._sock: Optional[socket.socket] = None
+        self._buffer = bytearray()
+        self._hello: dict[str, Any] = {}
+        if auto_open:
+            self.open()
+
+    def __enter__(self) -> "RemoteTempSensor":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        return self._sock is not None
+
+    @property
+    def info(self) -> dict[str, str]:
+        """Return metadata about the driver, as reported by the broadcaster."""
+        self._ensure_open()
+        return dict(self._hello.get("info", {}))
+
+    @property
+    def driverconfig(self) -> dict[str, Any]:
+        self._ensure_open()
+        return dict(self._hello.get("driver", {}))
+
+    def get_driver_info(self, *, refresh: bool = True) -> DriverInfo:
+        """Return the driver state announced when the connection was opened."""
+        return DriverInfo(**self.driverconfig)
+
+    def current_config(self, *, refresh: bool = False) -> DriverConfig:
+        info = self.get_driver_info()
+        return DriverConfig(
+            operation_mode=info.operation_mode,
+            simulation_mode=info.simulation_mode,
+            sampling_period_ms=info.sampling_period_ms,
+            threshold_mc=info.threshold_mc,
+        )
+
+    def apply_config(self, config: DriverConfig, *, refresh: bool = False) -> DriverConfig:
+        """
+        Accept `config` if it matches the broadcaster's configuration.
+
+        Raises:
+            SimTempError: if `config` would change a setting.
+        """
+        current = self.current_config()
+        changes = config.changes_from(current)
+        if changes:
+            raise SimTempError(
+                "the broadcaster owns the driver configuration; cannot change " + ", ".join(changes)
+            )
+        return current
+
+    def open(self) -> None:
+        """Connect to the broadcaster and subscribe to the sample stream."""
+        if self._sock is not None:
+            return
+        try:
+            if self._address is not None:
+                sock = socket.create_connection(self._address)
+            else:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self._socket_path)
+        except OSError as exc:
+            raise SimTempError(f"cannot connect to the sample broadcaster: {exc}") from exc
+        received = bytearray()
+        try:
+            sock.sendall(json.dumps({"decimate": self._decimate}).encode("utf-8") + b"\n")
+            # Records may follow the hello line in the same read; keep them.
+            while b"\n" not in received:
+                data = sock.recv(_RECV_BYTES)
+                if not data:
+                    raise OSError("connection closed during handshake")
+                received += data
+            hello_line, _, received = bytes(received).partition(b"\n")
+            hello = json.loads(hello_line)
+        except (OSError, ValueError) as exc:
+            sock.close()
+            raise SimTempError(f"sample broadcaster handshake failed: {exc}") from exc
+        if hello.get("protocol") != PROTOCOL_VERSION or hello.get("record_size") != SAMPLE_DTYPE.itemsize:
+            sock.close()
+            raise SimTempError(f"unsupported sample broadcaster protocol: {hello.get('protocol')}")
+        sock.setblocking(False)
+        self._sock = sock
+        self._hello = hello
+        self._buffer = bytearray(received)
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def start(self) -> None:
+        """Subscribe to the stream; samples broadcast while not subscribed are not received."""
+        self.open()
+
+    def stop(self) -> None:
+        """Unsubscribe so the broadcaster does not queue samples for this client."""
+        self.close()
+
+    def fileno(self) -> int:
+        self._ensure_open()
+        return self._sock.fileno()
+
+    def read_available(self) -> SampleBatch:
+        """
+        Return every complete record that has arrived, without waiting.
+
+        Raises:
+            SimTempError: if the broadcaster closed the connection.
+        """
+        self._ensure_open()
+        while True:
+            try:
+                data = self._sock.recv(_RECV_BYTES)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                self.close()
+                raise SimTempError(f"connection to the sample broadcaster failed: {exc}") from exc
+            if not data:
+                self.close()
+                raise SimTempError("the sample broadcaster closed the connection")
+            self._buffer += data
+        usable = len(self._buffer) - len(self._buffer) % SAMPLE_DTYPE.itemsize
+        records = np.frombuffer(bytes(self._buffer[:usable]), dtype=SAMPLE_DTYPE)
+        del self._buffer[:usable]
+        return SampleBatch(records)
+
+    def read_sample(self, *, timeout: float = 1.0) -> SampleRecord:
+        """
+        Return the next sample.
+
+        Raises:
+            SimTempTimeoutError: if no sample arrives within `timeout` seconds.
+            SimTempError: if the connection fails.
+        """
+        return next(self.stream(limit=1, timeout=timeout))
+
+    def read_once(self, *, timeout: float = 1.0) -> SampleRecord:
+        raise SimTempError("one-shot reads need direct access to the device, not the broadcaster")
+
+    def stream(
+        self,
+        *,
+        limit: Optional[int] = None,
+        timeout: float = 1.0,
+    ) -> Generator[SampleRecord, None, None]:
+        """
+        Stream samples from the broadcaster.
+
+        Args:
+            limit: Stop after yielding this many samples. None means no limit.
+            timeout: Max seconds to wait for each sample.
+
+        Raises:
+            SimTempTimeoutError: if waiting for a sample exceeds the timeout.
+            SimTempError: if the connection fails.
+        """
+        self._ensure_open()
+        count = 0
+        pending: list[SampleRecord] = []
+        try:
+            while limit is None or count < limit:
+                if not pending:
+                    batch = self.read_available()
+                    if not batch:
+                        readable, _, _ = select.select([self._sock], [], [], timeout)
+                        if not readable:
+                            raise SimTempTimeoutError(f"no sample from the broadcaster within {timeout} s")
+                        continue
+                    pending = list(batch)
+                    pending.reverse()
+                yield pending.pop()
+                count += 1
+        finally:
+            if pending and self._sock is not None:
+                # Records already taken off the socket stay available to the next call.
+                self._buffer[:0] = SampleBatch.from_samples(reversed(pending)).records.tobytes()
+
+    def iter_samples(
+        self,
+        count: int,
+        *,
+        timeout: float = 1.0,
+    ) -> Iterable[SampleRecord]:
+        """Convenience wrapper that collects a bounded number of samples."""
+        if count <= 0:
+            return []
+        return list(self.stream(limit=count, timeout=timeout))
+
+    def _ensure_open(self) -> None:
+        if self._sock is None:
+            self.open()
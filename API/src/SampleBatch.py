@@ -0,0 +1,140 @@
+"""Compact sample records and zero-copy batches used as signal payloads."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Any, Union, overload
+
+import numpy as np
+
+from API.src.SampleRing import SAMPLE_DTYPE
+
+__all__ = ["SampleRecord", "SampleBatch"]
+
+
+class SampleRecord:
+    """
+    One `simtemp_sample_v1` reading with the same read API as `SimTempSample`.
+
+    A plain `__slots__` object: no per-instance dict and no dataclass
+    machinery, so creating one costs a single allocation.
+    """
+
+    __slots__ = ("timestamp_ns", "temp_mC", "flags")
+
+    def __init__(self, timestamp_ns: int, temp_mC: int, flags: int) -> None:
+        self.timestamp_ns = timestamp_ns
+        self.temp_mC = temp_mC
+        self.flags = flags
+
+    @classmethod
+    def from_sample(cls, sample: Any) -> "SampleRecord":
+        """Copy the fields of a `SimTempSample` (or any object with the same attributes)."""
+        return cls(sample.timestamp_ns, sample.temp_mC, sample.flags)
+
+    @property
+    def temp_c(self) -> float:
+        return self.temp_mC / 1000.0
+
+    def has_flag(self, flag: int) -> bool:
+        return bool(self.flags & flag)
+
+    def to_dict(self) -> dict[str, int]:
+        """Return the fields as a dict, matching `dataclasses.asdict(SimTempSample)`."""
+        return {"timestamp_ns": self.timestamp_ns, "temp_mC": self.temp_mC, "flags": self.flags}
+
+    def __iter__(self) -> Iterator[int]:
+        yield self.timestamp_ns
+        yield self.temp_mC
+        yield self.flags
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SampleRecord):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __repr__(self) -> str:
+        return f"SampleRecord(timestamp_ns={self.timestamp_ns}, temp_mC={self.temp_mC}, flags={self.flags:#x})"
+
+
+class SampleBatch:
+    """
+    A chronological batch of samples backed by one `SAMPLE_DTYPE` array.
+
+    Column accessors are views of that array, so consumers that work on
+    whole batches (ring buffers, the alert engine, file writers) never touch
+    individual samples. Indexing or iterating builds `SampleRecord` objects
+    on demand for code that wants one sample at a time.
+    """
+
+    __slots__ = ("_records",)
+
+    def __init__(self, records: np.ndarray) -> None:
+        if records.dtype != SAMPLE_DTYPE:
+            raise TypeError(f"expected {SAMPLE_DTYPE}, got {records.dtype}")
+        self._records = records
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[Any]) -> "SampleBatch":
+        """Pack `SimTempSample`/`SampleRecord` objects into a new batch."""
+        return cls(
+            np.array(
+                [(s.timestamp_ns, s.temp_mC, s.flags) for s in samples],
+                dtype=SAMPLE_DTYPE,
+            )
+        )
+
+    @classmethod
+    def from_buffer(cls, data: Union[bytes, bytearray, memoryview]) -> "SampleBatch":
+        """Wrap raw `simtemp_sample_v1` bytes (e.g. a `read()` of the device) without copying."""
+        return cls(np.frombuffer(data, dtype=SAMPLE_DTYPE))
+
+    @property
+    def records(self) -> np.ndarray:
+        """Return the underlying record array."""
+        return self._records
+
+    @property
+    def timestamps_ns(self) -> np.ndarray:
+        return self._records["timestamp_ns"]
+
+    @property
+    def temps_mc(self) -> np.ndarray:
+        return self._records["temp_mC"]
+
+    @property
+    def flags(self) -> np.ndarray:
+        return self._records["flags"]
+
+    @property
+    def temps_c(self) -> np.ndarray:
+        return self._records["temp_mC"] / 1000.0
+
+    def __len__(self) -> int:
+        return self._records.size
+
+    def __bool__(self) -> bool:
+        return self._records.size > 0
+
+    @overload
+    def __getitem__(self, index: int) -> SampleRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "SampleBatch": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SampleBatch(self._records[index])
+        timestamp_ns, temp_mc, flags = self._records[index].item()
+        return SampleRecord(timestamp_ns, temp_mc, flags)
+
+    def __iter__(self) -> Iterator[SampleRecord]:
+        for timestamp_ns, temp_mc, flags in self._records.tolist():
+            yield SampleRecord(timestamp_ns, temp_mc, flags)
+
+    def to_dicts(self) -> list[dict[str, int]]:
+        """Return the samples as dicts, for callers that still expect the old payload."""
+        return [record.to_dict() for record in self]
+
+    def __repr__(self) -> str:
+        return f"SampleBatch({len(self)} samples)"
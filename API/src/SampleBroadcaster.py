@@ -0,0 +1,311 @@
+"""
+Share one sensor stream with several local processes.
+
+The broadcaster is the only reader of the device. Clients connect over a
+Unix domain socket (or TCP on localhost), send one JSON request line such as
+`{"decimate": 10}`, receive one JSON hello line describing the driver, and
+then a continuous stream of raw `simtemp_sample_v1` records (16 bytes each,
+little endian), exactly as read from `/dev/nxp_simtemp`.
+
+Run it with `python -m API.src.SampleBroadcaster` and attach clients with
+`RemoteTempSensor`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import selectors
+import socket
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from API.src.SampleRing import SAMPLE_DTYPE
+from API.src.TempSensor import DriverConfig, TempSensor
+from kernel.apitest.LxDrTemp import SimTempError
+
+__all__ = ["SampleBroadcaster", "DEFAULT_SOCKET_PATH", "PROTOCOL_VERSION", "main"]
+
+PROTOCOL_VERSION = 1
+DEFAULT_SOCKET_PATH = str(Path(os.environ.get("XDG_RUNTIME_DIR", "/tmp")) / "simtemp.sock")
+MAX_REQUEST_BYTES = 4096
+
+
+@dataclass(eq=False)
+class _Client:
+    sock: socket.socket
+    name: str
+    request: bytearray = field(default_factory=bytearray)
+    pending: bytearray = field(default_factory=bytearray)
+    decimate: int = 0  # 0 until the request line has been received
+    skip: int = 0  # samples to skip before the next delivered one
+
+
+class SampleBroadcaster:
+    """
+    Single-threaded selector loop that fans device samples out to socket clients.
+
+    Every client has a bounded send queue. A client whose queue would grow
+    beyond `max_queue_bytes` is disconnected, so a stalled reader never
+    delays the device or the other clients.
+    """
+
+    def __init__(
+        self,
+        sensor: TempSensor,
+        *,
+        socket_path: Optional[str] = DEFAULT_SOCKET_PATH,
+        tcp_port: Optional[int] = None,
+        max_queue_bytes: int = 1 << 20,
+    ) -> None:
+        if socket_path is None and tcp_port is None:
+            raise ValueError("at least one of socket_path and tcp_port is required")
+        self._sensor = sensor
+        self._socket_path = socket_path
+        self._tcp_port = tcp_port
+        self._max_queue_bytes = max_queue_bytes
+        self._selector = selectors.DefaultSelector()
+        self._listeners: list[socket.socket] = []
+        self._clients: dict[socket.socket, _Client] = {}
+        # shutdown() may be called from another thread; a byte on this pair wakes the loop.
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._running = False
+
+    @property
+    def addresses(self) -> list[str]:
+        """Return the addresses clients can connect to."""
+        result = []
+        for listener in self._listeners:
+            address = listener.getsockname()
+            result.append(address if isinstance(address, str) else f"{address[0]}:{address[1]}")
+        return result
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def bind(self) -> None:
+        """Create the listening sockets; called by `serve_forever()` if needed."""
+        if self._listeners:
+            return
+        if self._socket_path is not None:
+            path = Path(self._socket_path)
+            if path.is_socket():
+                # A stale socket from a previous run would make bind() fail.
+                path.unlink()
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            listener.bind(str(path))
+            self._listeners.append(listener)
+        if self._tcp_port is not None:
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind(("127.0.0.1", self._tcp_port))
+            self._listeners.append(listener)
+        for listener in self._listeners:
+            listener.listen()
+            listener.setblocking(False)
+
+    def serve_forever(self) -> None:
+        """
+        Forward samples until `shutdown()` is called.
+
+        The sensor must already be configured and started in continuous mode.
+
+        Raises:
+            SimTempError: if reading from the device fails.
+        """
+        self.bind()
+        device_fd = self._sensor.fileno()
+        self._selector.register(device_fd, selectors.EVENT_READ, "device")
+        self._selector.register(self._wake_reader, selectors.EVENT_READ, "wake")
+        for listener in self._listeners:
+            self._selector.register(listener, selectors.EVENT_READ, "listener")
+        self._running = True
+        try:
+            while self._running:
+                for key, mask in self._selector.select():
+                    if key.data == "device":
+                        self._broadcast(self._sensor.read_available().records)
+                    elif key.data == "wake":
+                        self._wake_reader.recv(64)
+                    elif key.data == "listener":
+                        self._accept(key.fileobj)
+                    else:
+                        self._service(key.data, mask)
+        finally:
+            self._running = False
+            self._close_all()
+
+    def shutdown(self) -> None:
+        """Stop `serve_forever()`; safe to call from another thread or a signal handler."""
+        self._running = False
+        try:
+            self._wake_writer.send(b"\0")
+        except OSError:
+            pass
+
+    def _accept(self, listener: socket.socket) -> None:
+        try:
+            sock, address = listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        name = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else f"client-{sock.fileno()}"
+        client = _Client(sock, name)
+        self._clients[sock] = client
+        self._selector.register(sock, selectors.EVENT_READ, client)
+
+    def _service(self, client: _Client, mask: int) -> None:
+        if mask & selectors.EVENT_READ:
+            try:
+                data = client.sock.recv(MAX_REQUEST_BYTES)
+            except (BlockingIOError, InterruptedError):
+                data = None
+            except OSError:
+                data = b""
+            if data == b"":
+                self._drop(client, None)
+                return
+            if data and not client.decimate:
+                self._handle_request(client, data)
+        if mask & selectors.EVENT_WRITE and client.sock in self._clients:
+            self._flush(client)
+
+    def _handle_request(self, client: _Client, data: bytes) -> None:
+        client.request += data
+        line, newline, _ = client.request.partition(b"\n")
+        if not newline:
+            if len(client.request) > MAX_REQUEST_BYTES:
+                self._drop(client, "request line too long")
+            return
+        try:
+            request = json.loads(line or b"{}")
+            decimate = int(request.get("decimate", 1))
+            if decimate < 1:
+                raise ValueError("decimate must be at least 1")
+        except (ValueError, AttributeError, TypeError) as exc:
+            self._drop(client, f"invalid request: {exc}")
+            return
+        client.decimate = decimate
+        client.request.clear()
+        hello = {
+            "protocol": PROTOCOL_VERSION,
+            "record_size": SAMPLE_DTYPE.itemsize,
+            "decimate": decimate,
+            "info": self._sensor.info,
+            "driver": asdict(self._sensor.get_driver_info(refresh=False)),
+        }
+        self._enqueue(client, json.dumps(hello).encode("utf-8") + b"\n")
+
+    def _broadcast(self, records: np.ndarray) -> None:
+        if records.size == 0:
+            return
+        payloads: dict[tuple[int, int], bytes] = {}
+        for client in list(self._clients.values()):
+            if not client.decimate:
+                continue
+            key = (client.decimate, client.skip)
+            if key not in payloads:
+                payloads[key] = records[client.skip::client.decimate].tobytes()
+            client.skip = (client.skip - records.size) % client.decimate
+            if payloads[key]:
+                self._enqueue(client, payloads[key])
+
+    def _enqueue(self, client: _Client, payload: bytes) -> None:
+        if len(client.pending) + len(payload) > self._max_queue_bytes:
+            self._drop(client, "send queue full")
+            return
+        client.pending += payload
+        self._flush(client)
+
+    def _flush(self, client: _Client) -> None:
+        try:
+            sent = client.sock.send(client.pending)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._drop(client, None)
+            return
+        del client.pending[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.pending else 0)
+        self._selector.modify(client.sock, events, client)
+
+    def _drop(self, client: _Client, reason: Optional[str]) -> None:
+        if reason:
+            print(f"Dropping {client.name}: {reason}", file=sys.stderr)
+        self._clients.pop(client.sock, None)
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+    def _close_all(self) -> None:
+        for client in list(self._clients.values()):
+            self._drop(client, None)
+        for listener in self._listeners:
+            listener.close()
+        self._listeners.clear()
+        if self._socket_path is not None:
+            try:
+                Path(self._socket_path).unlink()
+            except OSError:
+                pass
+        self._selector.close()
+        self._selector = selectors.DefaultSelector()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Share the SimTemp sample stream over local sockets.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket path (default: %(default)s)")
+    parser.add_argument("--no-socket", action="store_true", help="do not listen on a Unix socket")
+    parser.add_argument("--tcp-port", type=int, default=None, help="also listen on 127.0.0.1:PORT")
+    parser.add_argument("--max-queue-kb", type=int, default=1024, help="per-client send queue limit")
+    parser.add_argument("--period", type=int, default=None, help="sampling period [ms]")
+    parser.add_argument("--threshold", type=int, default=None, help="alert threshold [mC]")
+    parser.add_argument("--mode", default=None, help="simulation mode (normal, noisy, ramp)")
+    args = parser.parse_args(argv)
+
+    sensor = TempSensor()
+    broadcaster = SampleBroadcaster(
+        sensor,
+        socket_path=None if args.no_socket else args.socket,
+        tcp_port=args.tcp_port,
+        max_queue_bytes=args.max_queue_kb * 1024,
+    )
+    try:
+        sensor.open()
+        sensor.stop()
+        sensor.apply_config(
+            DriverConfig(
+                operation_mode="continuous",
+                simulation_mode=args.mode,
+                sampling_period_ms=args.period,
+                threshold_mc=args.threshold,
+            )
+        )
+        broadcaster.bind()
+        sensor.start()
+        print(f"Broadcasting on {', '.join(broadcaster.addresses)}", file=sys.stderr)
+        broadcaster.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except (SimTempError, OSError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        try:
+            sensor.stop()
+        except SimTempError:
+            pass
+        sensor.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Single-writer sample bus with independent consumer cursors."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from enum import Enum
+from typing import Optional, Union
+
+import numpy as np
+
+from API.src.SampleBatch import SampleBatch
+from API.src.SampleRing import SAMPLE_DTYPE, SampleRing
+
+__all__ = ["SampleBus", "BusConsumer", "OverflowPolicy"]
+
+
+class OverflowPolicy(str, Enum):
+    """What happens when a consumer falls a full ring behind the publisher."""
+
+    BLOCK = "block"  # the publisher waits until the consumer has caught up
+    DROP_OLDEST = "drop-oldest"  # the consumer skips to the oldest retained sample
+    DECIMATE = "decimate"  # like DROP_OLDEST, and backlogs larger than `max_batch` are thinned out
+
+
+class BusConsumer:
+    """
+    A reader of a `SampleBus` with its own position in the sample stream.
+
+    Created by `SampleBus.subscribe()`. Reads never affect other consumers;
+    only a `BLOCK` consumer can hold back the publisher.
+    """
+
+    def __init__(
+        self,
+        bus: "SampleBus",
+        name: str,
+        policy: OverflowPolicy,
+        max_batch: Optional[int],
+        cursor: int,
+    ) -> None:
+        self._bus = bus
+        self.name = name
+        self.policy = OverflowPolicy(policy)
+        self.max_batch = max_batch
+        self._cursor = cursor  # sequence number of the next sample to deliver
+        self._delivered = 0
+        self._dropped = 0
+        self._closed = False
+
+    @property
+    def lag(self) -> int:
+        """Return how many published samples this consumer has not read yet."""
+        return self._bus.total_published - self._cursor
+
+    @property
+    def delivered(self) -> int:
+        return self._delivered
+
+    @property
+    def dropped(self) -> int:
+        """Return how many samples were skipped by overflow or decimation."""
+        return self._dropped
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def read(self, max_count: Optional[int] = None, *, timeout: float = 0.0) -> SampleBatch:
+        """
+        Return the samples published since the previous read.
+
+        Args:
+            max_count: Upper bound on the batch size; defaults to `max_batch`.
+                `DECIMATE` consumers get every n-th sample of a larger backlog
+                instead of the oldest part of it.
+            timeout: Seconds to wait when nothing is pending (0 returns at once).
+
+        Returns:
+            A possibly empty batch; always empty once the consumer is closed.
+        """
+        return self._bus._read(self, max_count if max_count is not None else self.max_batch, timeout)
+
+    def skip_to_latest(self) -> None:
+        """Discard the backlog without counting it as dropped."""
+        with self._bus._condition:
+            self._cursor = self._bus.total_published
+            self._bus._condition.notify_all()
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+    def __repr__(self) -> str:
+        return f"BusConsumer({self.name!r}, {self.policy.value}, lag={self.lag}, dropped={self._dropped})"
+
+
+class SampleBus:
+    """
+    Fan-out of one sample stream to several consumers.
+
+    The acquisition thread publishes every batch once into a shared ring;
+    consumers (renderer, file writer, alert engine, ...) each read from their
+    own cursor at their own pace, so a slow consumer only loses its own
+    samples, according to its `OverflowPolicy`, instead of delaying the
+    others.
+    """
+
+    def __init__(self, capacity: int = 1 << 18) -> None:
+        self._ring = SampleRing(capacity)
+        self._condition = threading.Condition()
+        self._consumers: list[BusConsumer] = []
+        self._closed = False
+        self._stalls = 0
+        self._stalled_ns = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._ring.capacity
+
+    @property
+    def total_published(self) -> int:
+        return self._ring.total_written
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def consumers(self) -> tuple[BusConsumer, ...]:
+        return tuple(self._consumers)
+
+    @property
+    def stalls(self) -> int:
+        """Return how many publishes had to wait for a `BLOCK` consumer."""
+        return self._stalls
+
+    @property
+    def stalled_ns(self) -> int:
+        """Return the total time publishers spent waiting for `BLOCK` consumers."""
+        return self._stalled_ns
+
+    def subscribe(
+        self,
+        name: str,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        *,
+        max_batch: Optional[int] = None,
+    ) -> BusConsumer:
+        """Register a consumer that receives the samples published from now on."""
+        if max_batch is not None and max_batch <= 0:
+            raise ValueError("max_batch must be positive")
+        with self._condition:
+            consumer = BusConsumer(self, name, policy, max_batch, self.total_published)
+            self._consumers.append(consumer)
+            return consumer
+
+    def unsubscribe(self, consumer: BusConsumer) -> None:
+        with self._condition:
+            if consumer in self._consumers:
+                self._consumers.remove(consumer)
+            consumer._closed = True
+            self._condition.notify_all()
+
+    def publish(self, samples: Union[SampleBatch, np.ndarray]) -> None:
+        """
+        Append a chronological batch for every consumer.
+
+        Waits while a `BLOCK` consumer would otherwise lose samples; returns
+        without publishing once the bus is closed.
+        """
+        records = samples.records if isinstance(samples, SampleBatch) else np.asarray(samples, dtype=SAMPLE_DTYPE)
+        capacity = self.capacity
+        with self._condition:
+            for start in range(0, records.size, capacity):
+                chunk = records[start:start + capacity]
+                if not self._has_room(chunk.size):
+                    self._stalls += 1
+                    waited_from = time.monotonic_ns()
+                    self._condition.wait_for(lambda: self._closed or self._has_room(chunk.size))
+                    self._stalled_ns += time.monotonic_ns() - waited_from
+                if self._closed:
+                    return
+                self._ring.append(chunk)
+                self._condition.notify_all()
+
+    def clear(self) -> None:
+        """Drop every retained sample and rewind all consumers, e.g. for a new session."""
+        with self._condition:
+            self._ring.clear()
+            for consumer in self._consumers:
+                consumer._cursor = 0
+                consumer._delivered = 0
+                consumer._dropped = 0
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Wake every waiting reader and publisher; the bus accepts no more samples."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _has_room(self, count: int) -> bool:
+        total = self.total_published
+        return all(
+            total + count - consumer._cursor <= self.capacity
+            for consumer in self._consumers
+            if consumer.policy is OverflowPolicy.BLOCK
+        )
+
+    def _read(self, consumer: BusConsumer, max_count: Optional[int], timeout: float) -> SampleBatch:
+        with self._condition:
+            if timeout > 0:
+                self._condition.wait_for(
+                    lambda: self._closed or consumer._closed or consumer._cursor < self.total_published,
+                    timeout,
+                )
+            if consumer._closed:
+                return SampleBatch(np.empty(0, dtype=SAMPLE_DTYPE))
+
+            first = self._ring.first_sequence
+            if consumer._cursor < first:
+                consumer._dropped += first - consumer._cursor
+                consumer._cursor = first
+            total = self.total_published
+            available = total - consumer._cursor
+            start = consumer._cursor - first
+
+            if max_count is not None and available > max_count:
+                if consumer.policy is OverflowPolicy.DECIMATE:
+                    step = math.ceil(available / max_count)
+                    records = self._ring.slice(start, start + available)[step - 1::step]
+                    consumer._dropped += available - records.size
+                    consumer._cursor = total
+                else:
+                    records = self._ring.slice(start, start + max_count)
+                    consumer._cursor += max_count
+            else:
+                records = self._ring.slice(start, start + available)
+                consumer._cursor = total
+            consumer._delivered += records.size
+
+            if consumer.policy is OverflowPolicy.BLOCK and records.size:
+                self._condition.notify_all()
+        return SampleBatch(records)
@@ -0,0 +1,144 @@
+"""Block-wise vectorized loader for `timestamp_ns,temperature_c` CSV logs."""
+
+from __future__ import annotations
+
+import io
+from collections.abc import Generator
+from pathlib import Path
+
+import numpy as np
+
+__all__ = ["load_csv", "iter_csv_blocks", "parse_csv_block"]
+
+DEFAULT_BLOCK_BYTES = 4 << 20
+
+_NEWLINE, _COMMA, _DOT, _MINUS, _ZERO = (ord(c) for c in "\n,.-0")
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+
+
+class _IrregularBlock(ValueError):
+    """The block does not follow the plain `int,decimal` layout."""
+
+
+def parse_csv_block(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse complete `timestamp_ns,temperature_c` lines.
+
+    The common layout written by the GUI is decoded with array operations on
+    the raw bytes; blocks with anything else (header, CR line endings,
+    exponents, blank lines) fall back to `np.loadtxt`.
+
+    Returns:
+        (timestamp_ns as int64, temperature_c as float64)
+    """
+    if not data:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    try:
+        return _parse_plain(np.frombuffer(data, dtype=np.uint8))
+    except _IrregularBlock:
+        columns = np.loadtxt(
+            io.BytesIO(data),
+            delimiter=",",
+            dtype=[("timestamp_ns", np.int64), ("temperature_c", np.float64)],
+            comments="timestamp",
+            ndmin=1,
+        )
+        return columns["timestamp_ns"], columns["temperature_c"]
+
+
+def iter_csv_blocks(
+    path: str | Path,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+) -> Generator[tuple[np.ndarray, np.ndarray], None, None]:
+    """Yield parsed (timestamps, temperatures) column pairs, one per block of whole lines."""
+    with open(path, "rb") as handle:
+        header = handle.readline()
+        if header[:1].isdigit() or header[:1] == b"-":
+            # No header line; parse the first line as data.
+            handle.seek(0)
+        pending = b""
+        while True:
+            data = handle.read(block_bytes)
+            if not data:
+                break
+            data = pending + data
+            cut = data.rfind(b"\n") + 1
+            pending = data[cut:]
+            if cut:
+                yield parse_csv_block(data[:cut])
+        if pending.strip():
+            yield parse_csv_block(pending)
+
+
+def load_csv(path: str | Path, block_bytes: int = DEFAULT_BLOCK_BYTES) -> tuple[np.ndarray, np.ndarray]:
+    """Load a whole CSV log into (timestamp_ns, temperature_c) arrays."""
+    blocks = list(iter_csv_blocks(path, block_bytes))
+    if not blocks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    return np.concatenate([b[0] for b in blocks]), np.concatenate([b[1] for b in blocks])
+
+
+def _parse_plain(buf: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    newlines = np.flatnonzero(buf == _NEWLINE)
+    commas = np.flatnonzero(buf == _COMMA)
+    dots = np.flatnonzero(buf == _DOT)
+    if commas.size != newlines.size or dots.size != newlines.size:
+        raise _IrregularBlock
+    line_starts = np.empty_like(newlines)
+    line_starts[0] = 0
+    line_starts[1:] = newlines[:-1] + 1
+    if not ((line_starts < commas) & (commas < dots) & (dots < newlines)).all():
+        raise _IrregularBlock
+    value_starts = commas + 1
+    negative = buf[value_starts] == _MINUS
+
+    # Fast path: every line has the same layout, so the block is a (lines, width) matrix.
+    width = int(newlines[0]) + 1
+    comma, dot = int(commas[0]), int(dots[0])
+    if (
+        buf.size == width * newlines.size
+        and not negative.any()
+        and (commas - line_starts == comma).all()
+        and (dots - line_starts == dot).all()
+    ):
+        rows = buf.reshape(-1, width)
+        timestamps = _decode_columns(rows[:, :comma])
+        whole = _decode_columns(rows[:, comma + 1:dot])
+        fraction = _decode_columns(rows[:, dot + 1:width - 1])
+        return timestamps, whole + fraction / _POW10[width - 2 - dot]
+
+    timestamps = _parse_digits(buf, line_starts, commas)
+    value_starts += negative
+    whole = _parse_digits(buf, value_starts, dots)
+    fraction = _parse_digits(buf, dots + 1, newlines)
+    temps = whole + fraction / _POW10[newlines - dots - 1]
+    temps[negative] *= -1
+    return timestamps, temps
+
+
+def _parse_digits(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Decode the unsigned decimal integers stored in buf[starts[i]:ends[i]]."""
+    lengths = ends - starts
+    values = np.empty(starts.size, dtype=np.int64)
+    # Fields of one width form a (rows, width) digit matrix; logs have very few distinct widths.
+    for width in np.unique(lengths).tolist():
+        rows = np.flatnonzero(lengths == width)
+        values[rows] = _decode_columns(buf[starts[rows, None] + np.arange(width)])
+    return values
+
+
+def _decode_columns(digits: np.ndarray) -> np.ndarray:
+    """Decode a (rows, width) matrix of ASCII digits, most significant column first."""
+    width = digits.shape[1]
+    if not 0 < width <= _POW10.size:
+        raise _IrregularBlock
+    values = np.zeros(digits.shape[0], dtype=np.int64)
+    for column in range(width):
+        digit = digits[:, column] - np.uint8(_ZERO)
+        if (digit > 9).any():
+            raise _IrregularBlock
+        values *= 10
+        values += digit
+    return values
@@ -0,0 +1,571 @@
+"""
+Composable processing stages for sample batches.
+
+A `SamplePipeline` passes every batch read from the device through an
+ordered list of `PipelineStage` objects. Stages work on whole batches with
+array operations; a stage either transforms the stream for the stages after
+it (filters, decimation) or observes it and reports results to its
+listeners (statistics, alerts, anomalies, unit conversion) or forwards it
+(sinks such as `BusSink`).
+
+Each stage declares a `StageCost`. `INLINE` stages run in the thread that
+calls `process()`, normally the acquisition thread. A `POOL` stage starts a
+lane on a shared thread pool: it and the inline stages following it run
+there, one batch at a time and in order, and hand their output to the next
+lane. Slow analysis therefore never delays reading the device, and the GUI
+thread only receives results.
+
+Each stage also declares what a lane feeding it may do when it falls
+behind (`overflow`): `DROP_OLDEST` skips old batches and tells the stages
+after the gap through `skip()`, `BLOCK` makes the lane, and every lane
+before it, wait for room instead. Sinks and alerting block, so they are
+lossless whatever runs before them.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from API.src.AlertEngine import AlertConfig, AlertEngine
+from API.src.AnomalyDetector import AnomalyConfig, AnomalyDetector
+from API.src.SampleBatch import SampleBatch
+from API.src.SampleBus import OverflowPolicy, SampleBus
+
+__all__ = [
+    "StageCost",
+    "PipelineStage",
+    "SamplePipeline",
+    "MovingAverage",
+    "MedianFilter",
+    "Decimate",
+    "TemperatureUnit",
+    "ConvertedSamples",
+    "UnitConversion",
+    "RunningStats",
+    "StatsStage",
+    "AlertStage",
+    "AnomalyStage",
+    "BusSink",
+]
+
+
+class StageCost(str, Enum):
+    INLINE = "inline"  # cheap and vectorized: runs in the calling (acquisition) thread
+    POOL = "pool"  # may take a while: runs on the pipeline's worker pool
+
+
+class PipelineStage:
+    """
+    Base class of a pipeline stage.
+
+    Subclasses override `process()` and, if they keep state, `reset()`.
+    `process()` returns a new `SampleBatch` to replace the stream seen by the
+    following stages, or None to pass the batch on unchanged. Results are
+    passed to the listeners with `_emit()`; listeners are called on the
+    thread the stage runs on. Stages that must see every sample set
+    `overflow` to `OverflowPolicy.BLOCK`; the others are told about dropped
+    batches through `skip()`.
+    """
+
+    name = "stage"
+    cost = StageCost.INLINE
+    overflow = OverflowPolicy.DROP_OLDEST
+
+    def __init__(self) -> None:
+        self._listeners: list[Callable[[object], None]] = []
+
+    def add_listener(self, callback: Callable[[object], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[object], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Forget the state carried over from previous batches."""
+
+    def skip(self, samples: int) -> None:
+        """
+        Called before the next batch when a lane dropped `samples` samples ahead of this stage.
+
+        The count is taken where the batches were dropped. Stages whose state
+        assumes a continuous stream override this; the default does nothing.
+        """
+
+    def _emit(self, result: object) -> None:
+        for callback in list(self._listeners):
+            callback(result)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, cost={self.cost.value})"
+
+
+def _with_temps(batch: SampleBatch, temps_mc: np.ndarray) -> SampleBatch:
+    records = batch.records.copy()
+    records["temp_mC"] = np.round(temps_mc)
+    return SampleBatch(records)
+
+
+class MovingAverage(PipelineStage):
+    """Replace every temperature with the mean of the last `window` samples."""
+
+    name = "moving-average"
+
+    def __init__(self, window: int, *, cost: StageCost = StageCost.INLINE) -> None:
+        super().__init__()
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self._window = window
+        self.cost = cost
+        self.reset()
+
+    def reset(self) -> None:
+        self._tail = np.empty(0, dtype=np.int64)
+
+    def skip(self, samples: int) -> None:
+        # The window would average across the gap; start over instead.
+        self.reset()
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        values = np.concatenate((self._tail, batch.temps_mc.astype(np.int64)))
+        sums = np.cumsum(values)
+        count = len(batch)
+        end = np.arange(values.size - count, values.size)
+        start = end - self._window
+        # Samples before the first window is full average over what has been seen.
+        window_sums = sums[end] - np.where(start >= 0, sums[np.maximum(start, 0)], 0)
+        averages = window_sums / np.minimum(end + 1, self._window)
+        self._tail = values[-(self._window - 1):] if self._window > 1 else values[:0]
+        return _with_temps(batch, averages)
+
+
+class MedianFilter(PipelineStage):
+    """Replace every temperature with the median of the last `window` samples; removes isolated spikes."""
+
+    name = "median"
+
+    def __init__(self, window: int, *, cost: StageCost = StageCost.INLINE) -> None:
+        super().__init__()
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self._window = window
+        self.cost = cost
+        self.reset()
+
+    def reset(self) -> None:
+        self._tail = np.empty(0, dtype=np.int32)
+
+    def skip(self, samples: int) -> None:
+        self.reset()
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        values = np.concatenate((self._tail, batch.temps_mc))
+        count = len(batch)
+        missing = self._window - 1 - (values.size - count)
+        if missing > 0:
+            # Pad the start of the stream with its first value so every sample has a full window.
+            values = np.concatenate((np.full(missing, values[0], dtype=values.dtype), values))
+        medians = np.median(sliding_window_view(values, self._window)[-count:], axis=1)
+        self._tail = values[-(self._window - 1):] if self._window > 1 else values[:0]
+        return _with_temps(batch, medians)
+
+
+class Decimate(PipelineStage):
+    """Keep every `factor`-th sample, counted across batch boundaries."""
+
+    name = "decimate"
+
+    def __init__(self, factor: int) -> None:
+        super().__init__()
+        if factor <= 0:
+            raise ValueError("factor must be positive")
+        self._factor = factor
+        self.reset()
+
+    def reset(self) -> None:
+        self._phase = 0
+
+    def skip(self, samples: int) -> None:
+        # The count may come from before an upstream filter changed the rate; restart the pattern.
+        self.reset()
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        first = (-self._phase) % self._factor
+        self._phase = (self._phase + len(batch)) % self._factor
+        return SampleBatch(batch.records[first::self._factor])
+
+
+class TemperatureUnit(str, Enum):
+    CELSIUS = "C"
+    FAHRENHEIT = "F"
+    KELVIN = "K"
+
+    def from_mc(self, temps_mc) -> np.ndarray:
+        """Convert milli-degrees Celsius to this unit."""
+        celsius = np.asarray(temps_mc, dtype=np.float64) / 1000.0
+        if self is TemperatureUnit.FAHRENHEIT:
+            return celsius * 1.8 + 32.0
+        if self is TemperatureUnit.KELVIN:
+            return celsius + 273.15
+        return celsius
+
+
+@dataclass(frozen=True)
+class ConvertedSamples:
+    timestamps_ns: np.ndarray
+    values: np.ndarray
+    unit: TemperatureUnit
+
+
+class UnitConversion(PipelineStage):
+    """Report every batch as `ConvertedSamples` in the configured unit."""
+
+    name = "units"
+
+    def __init__(self, unit: TemperatureUnit = TemperatureUnit.CELSIUS) -> None:
+        super().__init__()
+        self._unit = TemperatureUnit(unit)
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        self._emit(ConvertedSamples(batch.timestamps_ns.copy(), self._unit.from_mc(batch.temps_mc), self._unit))
+        return None
+
+
+@dataclass(frozen=True)
+class RunningStats:
+    """Statistics in degrees Celsius over all samples since the last reset."""
+
+    count: int
+    mean_c: float
+    std_c: float
+    min_c: float
+    max_c: float
+
+
+class StatsStage(PipelineStage):
+    """
+    Maintain count, mean, σ, minimum and maximum of the stream.
+
+    Batch moments are merged with Chan's parallel formula, so the result
+    does not depend on how the stream is split into batches.
+    """
+
+    name = "stats"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reset()
+
+    def reset(self) -> None:
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = np.inf
+        self._max = -np.inf
+
+    @property
+    def stats(self) -> Optional[RunningStats]:
+        if self._count == 0:
+            return None
+        std = (self._m2 / (self._count - 1)) ** 0.5 if self._count > 1 else 0.0
+        return RunningStats(self._count, self._mean / 1000.0, std / 1000.0, self._min / 1000.0, self._max / 1000.0)
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        temps = batch.temps_mc.astype(np.float64)
+        count = temps.size
+        mean = float(temps.mean())
+        m2 = float(((temps - mean) ** 2).sum())
+        total = self._count + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta * delta * self._count * count / total
+        self._count = total
+        self._min = min(self._min, float(temps.min()))
+        self._max = max(self._max, float(temps.max()))
+        self._emit(self.stats)
+        return None
+
+
+class AlertStage(PipelineStage):
+    """Run an `AlertEngine` over the stream and report its transitions as lists of `AlertTransition`."""
+
+    name = "alerts"
+    overflow = OverflowPolicy.BLOCK
+
+    def __init__(self, config: AlertConfig | None = None) -> None:
+        super().__init__()
+        self._engine = AlertEngine(config)
+        self._lock = threading.Lock()
+        self._pending_config: Optional[AlertConfig] = None
+
+    @property
+    def config(self) -> AlertConfig:
+        with self._lock:
+            return self._pending_config or self._engine.config
+
+    def configure(self, config: AlertConfig) -> None:
+        """Replace the configuration; may be called from any thread and applies from the next batch."""
+        with self._lock:
+            self._pending_config = config
+
+    def reset(self) -> None:
+        with self._lock:
+            self._apply_pending()
+            self._engine.reset()
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        with self._lock:
+            self._apply_pending()
+        transitions = self._engine.process(batch.timestamps_ns, batch.temps_mc, batch.flags)
+        if transitions:
+            self._emit(transitions)
+        return None
+
+    def _apply_pending(self) -> None:
+        if self._pending_config is not None:
+            self._engine.configure(self._pending_config)
+            self._pending_config = None
+
+
+class AnomalyStage(PipelineStage):
+    """Run an `AnomalyDetector` over the stream and report lists of `AnomalyEvent`."""
+
+    name = "anomalies"
+
+    def __init__(self, config: AnomalyConfig | None = None) -> None:
+        super().__init__()
+        self._detector = AnomalyDetector(config)
+
+    @property
+    def detector(self) -> AnomalyDetector:
+        return self._detector
+
+    def reset(self) -> None:
+        self._detector.reset()
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        events = self._detector.process(batch.timestamps_ns, batch.temps_mc)
+        if events:
+            self._emit(events)
+        return None
+
+
+class BusSink(PipelineStage):
+    """Publish the stream, as transformed by the stages before it, to a `SampleBus`."""
+
+    name = "bus"
+    overflow = OverflowPolicy.BLOCK
+
+    def __init__(self, bus: SampleBus) -> None:
+        super().__init__()
+        self._bus = bus
+
+    def process(self, batch: SampleBatch) -> Optional[SampleBatch]:
+        self._bus.publish(batch)
+        return None
+
+
+class _Lane:
+    """Runs a group of stages on the pool for one batch at a time, in submission order."""
+
+    def __init__(self, stages: list[PipelineStage], pipeline: "SamplePipeline") -> None:
+        self.stages = stages
+        self.next: Optional[_Lane] = None
+        # Set when a BLOCK stage runs in this lane or a later one.
+        self.blocking = False
+        self.dropped = 0
+        self._pipeline = pipeline
+        # Batches with the number of samples dropped just before them.
+        self._queue: deque[tuple[SampleBatch, int]] = deque()
+        self._lock = threading.Lock()
+        self._room = threading.Condition(self._lock)
+        self._scheduled = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self._unreported_skip = 0  # only touched by the draining thread
+
+    def submit(self, batch: SampleBatch, skipped: int = 0) -> None:
+        with self._lock:
+            max_pending = self._pipeline.max_pending
+            if self.blocking:
+                # Like a BLOCK bus consumer: the submitter waits, so nothing after this lane loses data.
+                self._room.wait_for(lambda: len(self._queue) < max_pending)
+            while len(self._queue) >= max_pending:
+                # Like a DROP_OLDEST bus consumer: a lane that falls behind skips old batches.
+                old, old_skipped = self._queue.popleft()
+                self.dropped += len(old)
+                if self._queue:
+                    head, head_skipped = self._queue[0]
+                    self._queue[0] = (head, head_skipped + old_skipped + len(old))
+                else:
+                    skipped += old_skipped + len(old)
+            self._queue.append((batch, skipped))
+            if self._scheduled:
+                return
+            self._scheduled = True
+            self._idle.clear()
+        self._pipeline._executor().submit(self._drain)
+
+    def wait_idle(self, timeout: Optional[float]) -> bool:
+        return self._idle.wait(timeout)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queue.clear()
+            self._room.notify_all()
+        self._unreported_skip = 0
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._scheduled = False
+                    self._idle.set()
+                    return
+                batch, skipped = self._queue.popleft()
+                self._room.notify_all()
+            if skipped:
+                for stage in self.stages:
+                    try:
+                        stage.skip(skipped)
+                    except Exception as exc:  # noqa: BLE001 - a failing stage must not stop the lane
+                        self._pipeline._report_error(stage, exc)
+                self._unreported_skip += skipped
+            output = self._pipeline._run_stages(self.stages, batch)
+            if output is not None and self.next is not None:
+                # The stages of later lanes missed the same samples.
+                self.next.submit(output, self._unreported_skip)
+                self._unreported_skip = 0
+
+
+class SamplePipeline:
+    """
+    Ordered stages applied to every batch passed to `process()`.
+
+    The stages up to the first `POOL` stage run inline; every `POOL` stage
+    starts a lane on a shared `ThreadPoolExecutor` of `workers` threads, at
+    least one per lane so a lane waiting for the next one never starves it.
+    A lane keeps at most `max_pending` batches queued. Beyond that it drops
+    the oldest (see `dropped` and `PipelineStage.skip()`), unless a stage in
+    it or after it declares `OverflowPolicy.BLOCK`; then `process()` waits.
+    A stage that raises is passed to `on_error`, or printed, on whichever
+    thread it runs; the batch goes on to the following stages as it was
+    passed to the failing one, and later batches are not affected.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[PipelineStage] = (),
+        *,
+        workers: int = 2,
+        max_pending: int = 64,
+        on_error: Optional[Callable[[PipelineStage, Exception], None]] = None,
+    ) -> None:
+        if workers <= 0 or max_pending <= 0:
+            raise ValueError("workers and max_pending must be positive")
+        self.max_pending = max_pending
+        self._workers = workers
+        self._on_error = on_error
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._stages: list[PipelineStage] = []
+        self._inline: list[PipelineStage] = []
+        self._lanes: list[_Lane] = []
+        for stage in stages:
+            self.add(stage)
+
+    @property
+    def stages(self) -> tuple[PipelineStage, ...]:
+        return tuple(self._stages)
+
+    @property
+    def dropped(self) -> int:
+        """Return how many samples non-blocking pool lanes skipped because they fell behind."""
+        return sum(lane.dropped for lane in self._lanes)
+
+    def add(self, stage: PipelineStage) -> PipelineStage:
+        """Append a stage and return it, so callers can keep a handle for listeners and configuration."""
+        self._stages.append(stage)
+        if stage.cost is StageCost.POOL:
+            lane = _Lane([stage], self)
+            if self._lanes:
+                self._lanes[-1].next = lane
+            self._lanes.append(lane)
+        elif self._lanes:
+            self._lanes[-1].stages.append(stage)
+        else:
+            self._inline.append(stage)
+        if stage.overflow is OverflowPolicy.BLOCK:
+            # Every lane that feeds this stage has to wait rather than drop.
+            for lane in self._lanes:
+                lane.blocking = True
+        return stage
+
+    def process(self, batch: SampleBatch) -> None:
+        """Run the inline stages on this thread and queue the rest on the pool."""
+        if not batch:
+            return
+        output = self._run_stages(self._inline, batch)
+        if output is not None and self._lanes:
+            self._lanes[0].submit(output)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the pool lanes processed everything queued so far; False on timeout."""
+        # Lanes only receive work from the lane before them, so waiting in order is enough.
+        return all(lane.wait_idle(timeout) for lane in self._lanes)
+
+    def reset(self) -> None:
+        """Drop queued batches and reset every stage, e.g. before a new capture."""
+        for lane in self._lanes:
+            lane.clear()
+        self.flush()
+        for stage in self._stages:
+            stage.reset()
+
+    def close(self) -> None:
+        """Finish the queued batches and stop the worker threads."""
+        self.flush()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=max(self._workers, len(self._lanes)), thread_name_prefix="simtemp-pipeline"
+                )
+            return self._pool
+
+    def _run_stages(self, stages: list[PipelineStage], batch: SampleBatch) -> Optional[SampleBatch]:
+        for stage in stages:
+            try:
+                output = stage.process(batch)
+            except Exception as exc:  # noqa: BLE001 - a failing stage must not stop the stream
+                self._report_error(stage, exc)
+                continue
+            if output is not None:
+                batch = output
+            if not batch:
+                return None
+        return batch
+
+    def _report_error(self, stage: PipelineStage, exc: Exception) -> None:
+        if self._on_error is not None:
+            self._on_error(stage, exc)
+        else:
+            print(f"Pipeline stage {stage.name} failed: {exc}", file=sys.stderr)
@@ -0,0 +1,114 @@
+"""Fixed-capacity in-memory ring of samples stored as a NumPy record array."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+
+__all__ = ["SampleRing", "SAMPLE_DTYPE", "samples_to_records"]
+
+# Same layout as `struct simtemp_sample_v1` (16 bytes, little endian).
+SAMPLE_DTYPE = np.dtype(
+    [
+        ("timestamp_ns", "<u8"),
+        ("temp_mC", "<i4"),
+        ("flags", "<u4"),
+    ]
+)
+
+
+def samples_to_records(samples: Iterable[dict]) -> np.ndarray:
+    """Convert sample dictionaries (the payload format used before `SampleBatch`) to records."""
+    return np.array(
+        [(s.get("timestamp_ns", 0), s.get("temp_mC", 0), s.get("flags", 0)) for s in samples],
+        dtype=SAMPLE_DTYPE,
+    )
+
+
+class SampleRing:
+    """
+    Overwrite-oldest ring buffer of samples.
+
+    Logical index 0 is the oldest retained sample. Every sample also has a
+    sequence number counting all samples ever appended, which stays valid
+    while the sample is retained and lets views track what is new.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._buffer = np.zeros(capacity, dtype=SAMPLE_DTYPE)
+        self._head = 0
+        self._total = 0
+
+    def __len__(self) -> int:
+        return min(self._total, self._buffer.size)
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.size
+
+    @property
+    def total_written(self) -> int:
+        """Return how many samples were appended since the last clear."""
+        return self._total
+
+    @property
+    def first_sequence(self) -> int:
+        """Return the sequence number of the oldest retained sample."""
+        return self._total - len(self)
+
+    def clear(self) -> None:
+        self._head = 0
+        self._total = 0
+
+    def append(self, records: np.ndarray) -> None:
+        """Append a batch of `SAMPLE_DTYPE` records."""
+        records = np.asarray(records, dtype=SAMPLE_DTYPE)
+        capacity = self._buffer.size
+        count = records.size
+        if count >= capacity:
+            self._buffer[:] = records[-capacity:]
+            self._head = 0
+        else:
+            first = min(count, capacity - self._head)
+            self._buffer[self._head:self._head + first] = records[:first]
+            self._buffer[:count - first] = records[first:]
+            self._head = (self._head + count) % capacity
+        self._total += count
+
+    def extend_samples(self, samples: Iterable[dict]) -> None:
+        """Append sample dictionaries; see `samples_to_records`."""
+        self.append(samples_to_records(samples))
+
+    def __getitem__(self, index: int) -> np.void:
+        """Return the record at logical `index` (0 is the oldest)."""
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("sample index out of range")
+        return self._buffer[(self._head - length + index) % self._buffer.size]
+
+    def by_sequence(self, sequence: int) -> np.void:
+        """Return the record with the given sequence number."""
+        return self[sequence - self.first_sequence]
+
+    def latest(self, count: int) -> np.ndarray:
+        """Return a chronological copy of the newest `count` samples."""
+        return self.slice(max(0, len(self) - count), len(self))
+
+    def slice(self, start: int, stop: int) -> np.ndarray:
+        """Return a chronological copy of logical range [start, stop)."""
+        length = len(self)
+        start = max(0, start)
+        stop = min(stop, length)
+        if stop <= start:
+            return np.empty(0, dtype=SAMPLE_DTYPE)
+        capacity = self._buffer.size
+        first = (self._head - length + start) % capacity
+        count = stop - start
+        if first + count <= capacity:
+            return self._buffer[first:first + count].copy()
+        return np.concatenate((self._buffer[first:], self._buffer[:first + count - capacity]))
@@ -0,0 +1,200 @@
+"""Streaming time-bucket summaries (min/max/mean/count/alerts) of a sample stream."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from typing import Optional
+
+import numpy as np
+
+from API.src.SampleRing import SAMPLE_DTYPE
+from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_THR_EDGE
+
+__all__ = [
+    "ROLLUP_DTYPE",
+    "DEFAULT_RESOLUTIONS_NS",
+    "SampleRollup",
+    "summarize",
+    "merge_buckets",
+    "bucket_means_c",
+    "resolution_label",
+    "parse_resolution_label",
+]
+
+# One bucket; the mean is sum_mC / count so buckets can be merged exactly.
+ROLLUP_DTYPE = np.dtype(
+    [
+        ("start_ns", "<u8"),
+        ("count", "<u4"),
+        ("alerts", "<u4"),  # records carrying SIMTEMP_FLAG_THR_EDGE
+        ("min_mC", "<i4"),
+        ("max_mC", "<i4"),
+        ("sum_mC", "<i8"),
+    ]
+)
+
+SECOND_NS = 1_000_000_000
+DEFAULT_RESOLUTIONS_NS = (SECOND_NS, 60 * SECOND_NS, 3600 * SECOND_NS)
+
+_LABEL_UNITS_NS = (("h", 3600 * SECOND_NS), ("m", 60 * SECOND_NS), ("s", SECOND_NS), ("ms", 1_000_000))
+
+
+def resolution_label(resolution_ns: int) -> str:
+    """Return a short name such as "1s" or "15m" for a resolution."""
+    for unit, size in _LABEL_UNITS_NS:
+        if resolution_ns % size == 0:
+            return f"{resolution_ns // size}{unit}"
+    return f"{resolution_ns}ns"
+
+
+def parse_resolution_label(label: str) -> int:
+    """Inverse of `resolution_label()`."""
+    for unit, size in sorted(_LABEL_UNITS_NS + (("ns", 1),), key=lambda item: -len(item[0])):
+        if label.endswith(unit) and label[: -len(unit)].isdigit():
+            return int(label[: -len(unit)]) * size
+    raise ValueError(f"not a rollup resolution: {label!r}")
+
+
+def summarize(records: np.ndarray, resolution_ns: int) -> np.ndarray:
+    """Fold chronological `SAMPLE_DTYPE` records into buckets aligned to `resolution_ns`."""
+    records = np.asarray(records, dtype=SAMPLE_DTYPE)
+    if records.size == 0:
+        return np.empty(0, dtype=ROLLUP_DTYPE)
+    starts = records["timestamp_ns"] // np.uint64(resolution_ns) * np.uint64(resolution_ns)
+    edges = ((records["flags"] & SIMTEMP_FLAG_THR_EDGE) != 0).astype(np.uint32)
+    return _reduce(starts, np.ones(records.size, dtype=np.uint32), edges,
+                   records["temp_mC"], records["temp_mC"], records["temp_mC"].astype(np.int64))
+
+
+def merge_buckets(buckets: np.ndarray, resolution_ns: Optional[int] = None) -> np.ndarray:
+    """
+    Combine chronological buckets that share a start time.
+
+    With `resolution_ns` the buckets are first re-aligned to that (coarser)
+    resolution, which turns e.g. 1 s buckets into 1 min buckets.
+    """
+    if buckets.size == 0:
+        return np.empty(0, dtype=ROLLUP_DTYPE)
+    starts = buckets["start_ns"]
+    if resolution_ns is not None:
+        starts = starts // np.uint64(resolution_ns) * np.uint64(resolution_ns)
+    return _reduce(starts, buckets["count"], buckets["alerts"],
+                   buckets["min_mC"], buckets["max_mC"], buckets["sum_mC"])
+
+
+def bucket_means_c(buckets: np.ndarray) -> np.ndarray:
+    """Return the mean temperature of every bucket in degrees Celsius."""
+    return buckets["sum_mC"] / np.maximum(buckets["count"], 1) / 1000.0
+
+
+def _reduce(starts, counts, alerts, lows, highs, sums) -> np.ndarray:
+    first = np.flatnonzero(np.concatenate(([True], starts[1:] != starts[:-1])))
+    out = np.empty(first.size, dtype=ROLLUP_DTYPE)
+    out["start_ns"] = starts[first]
+    out["count"] = np.add.reduceat(counts, first)
+    out["alerts"] = np.add.reduceat(alerts, first)
+    out["min_mC"] = np.minimum.reduceat(lows, first)
+    out["max_mC"] = np.maximum.reduceat(highs, first)
+    out["sum_mC"] = np.add.reduceat(sums, first)
+    return out
+
+
+class _Level:
+    """Completed buckets of one resolution plus the bucket still being filled."""
+
+    def __init__(self, resolution_ns: int, keep: bool) -> None:
+        self.resolution_ns = resolution_ns
+        self.keep = keep
+        self.done = np.empty(64 if keep else 0, dtype=ROLLUP_DTYPE)
+        self.size = 0
+        self.open = np.empty(0, dtype=ROLLUP_DTYPE)
+
+    def extend(self, buckets: np.ndarray) -> None:
+        needed = self.size + buckets.size
+        if needed > self.done.size:
+            grown = np.empty(max(needed, 2 * self.done.size), dtype=ROLLUP_DTYPE)
+            grown[:self.size] = self.done[:self.size]
+            self.done = grown
+        self.done[self.size:needed] = buckets
+        self.size = needed
+
+
+class SampleRollup:
+    """
+    Incremental summaries of a sample stream at several time resolutions.
+
+    Each resolution keeps one open bucket. A batch is folded in with
+    `np.*.reduceat`, and a bucket is complete as soon as a sample of a later
+    bucket arrives; `append()` returns the newly completed buckets so a
+    writer can persist them. With `keep=False` completed buckets are not
+    retained in memory.
+    """
+
+    def __init__(self, resolutions_ns: Iterable[int] = DEFAULT_RESOLUTIONS_NS, *, keep: bool = True) -> None:
+        resolutions = sorted(set(int(resolution) for resolution in resolutions_ns))
+        if not resolutions or resolutions[0] <= 0:
+            raise ValueError("rollup resolutions must be positive")
+        self._keep = keep
+        self._levels = [_Level(resolution, keep) for resolution in resolutions]
+
+    @property
+    def resolutions_ns(self) -> tuple[int, ...]:
+        return tuple(level.resolution_ns for level in self._levels)
+
+    def clear(self) -> None:
+        self._levels = [_Level(level.resolution_ns, self._keep) for level in self._levels]
+
+    def append(self, records: np.ndarray) -> dict[int, np.ndarray]:
+        """Fold a chronological batch in and return the buckets it completed, per resolution."""
+        completed: dict[int, np.ndarray] = {}
+        if records.size == 0:
+            return completed
+        for level in self._levels:
+            buckets = summarize(records, level.resolution_ns)
+            if level.open.size:
+                buckets = merge_buckets(np.concatenate((level.open, buckets)))
+            level.open = buckets[-1:].copy()
+            done = buckets[:-1]
+            if level.keep and done.size:
+                level.extend(done)
+            completed[level.resolution_ns] = done
+        return completed
+
+    def take_open(self) -> dict[int, np.ndarray]:
+        """Return and forget the partial buckets, e.g. when the stream ends."""
+        open_buckets = {level.resolution_ns: level.open for level in self._levels}
+        for level in self._levels:
+            if level.keep and level.open.size:
+                level.extend(level.open)
+            level.open = np.empty(0, dtype=ROLLUP_DTYPE)
+        return open_buckets
+
+    def buckets(self, resolution_ns: int, *, include_open: bool = True) -> np.ndarray:
+        """Return the retained buckets of one resolution, oldest first."""
+        level = self._level(resolution_ns)
+        done = level.done[:level.size]
+        if include_open and level.open.size:
+            return np.concatenate((done, level.open))
+        return done
+
+    def select_resolution(self, span_ns: int, max_points: int) -> int:
+        """Return the finest resolution that covers `span_ns` in at most `max_points` buckets."""
+        for level in self._levels:
+            if math.ceil(span_ns / level.resolution_ns) <= max_points:
+                return level.resolution_ns
+        return self._levels[-1].resolution_ns
+
+    def query(self, t_start: int, t_end: int, max_points: int) -> tuple[int, np.ndarray]:
+        """Return (resolution_ns, buckets) covering [t_start, t_end] in at most about `max_points` buckets."""
+        resolution = self.select_resolution(t_end - t_start, max_points)
+        buckets = self.buckets(resolution)
+        first = max(0, int(np.searchsorted(buckets["start_ns"], t_start, side="right")) - 1)
+        last = int(np.searchsorted(buckets["start_ns"], t_end, side="right"))
+        return resolution, buckets[first:last]
+
+    def _level(self, resolution_ns: int) -> _Level:
+        for level in self._levels:
+            if level.resolution_ns == resolution_ns:
+                return level
+        raise KeyError(f"no rollup at {resolution_label(resolution_ns)}")
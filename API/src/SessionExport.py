@@ -0,0 +1,174 @@
+"""Chunked, constant-memory export of sample records to CSV or JSON."""
+
+from __future__ import annotations
+
+import gzip
+import os
+import threading
+from collections.abc import Callable, Generator, Iterable
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from API.src.SampleRing import SAMPLE_DTYPE
+from API.src.SessionStore import SessionStore
+from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_THR_EDGE
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "ExportCancelled",
+    "export_chunks",
+    "filter_chunks",
+    "iter_archive_chunks",
+    "iter_record_chunks",
+    "iter_session_chunks",
+]
+
+EXPORT_FORMATS = ("csv", "json")
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled before completion."""
+
+
+def iter_record_chunks(
+    records: np.ndarray,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Generator[np.ndarray, None, None]:
+    """Yield consecutive slices of an in-memory record array (e.g. a ring snapshot)."""
+    for start in range(0, records.size, chunk_size):
+        yield records[start:start + chunk_size]
+
+
+def iter_session_chunks(
+    store: SessionStore,
+    t_start: Optional[int] = None,
+    t_end: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Generator[np.ndarray, None, None]:
+    """Yield memory-mapped slices of a session, restricted to a time range if given."""
+    if t_start is None and t_end is None:
+        records = store.records
+    else:
+        records = store.query(
+            t_start if t_start is not None else 0,
+            t_end if t_end is not None else np.iinfo(np.uint64).max,
+        )
+    yield from iter_record_chunks(records, chunk_size)
+
+
+def iter_archive_chunks(
+    path: str | Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Generator[np.ndarray, None, None]:
+    """Yield records read sequentially from a binary log, gzip-compressed if it ends in `.gz`."""
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    block = chunk_size * SAMPLE_DTYPE.itemsize
+    with opener(path, "rb") as handle:
+        pending = b""
+        while True:
+            data = handle.read(block)
+            if not data:
+                return
+            data = pending + data
+            usable = len(data) - len(data) % SAMPLE_DTYPE.itemsize
+            pending = data[usable:]
+            if usable:
+                yield np.frombuffer(data[:usable], dtype=SAMPLE_DTYPE)
+
+
+def filter_chunks(
+    chunks: Iterable[np.ndarray],
+    *,
+    t_start: Optional[int] = None,
+    t_end: Optional[int] = None,
+    alerts_only: bool = False,
+) -> Generator[np.ndarray, None, None]:
+    """Drop records outside [t_start, t_end] or, optionally, records without an alert edge."""
+    for chunk in chunks:
+        mask = np.ones(chunk.size, dtype=bool)
+        if t_start is not None:
+            mask &= chunk["timestamp_ns"] >= t_start
+        if t_end is not None:
+            mask &= chunk["timestamp_ns"] <= t_end
+        if alerts_only:
+            mask &= (chunk["flags"] & SIMTEMP_FLAG_THR_EDGE) != 0
+        if mask.all():
+            yield chunk
+        elif mask.any():
+            yield chunk[mask]
+
+
+def export_chunks(
+    chunks: Iterable[np.ndarray],
+    path: str | Path,
+    fmt: str = "csv",
+    *,
+    total: int = 0,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    buffer_size: int = 4 << 20,
+) -> int:
+    """
+    Format and write record chunks to `path`, returning the number of rows written.
+
+    Both formats carry the same fields: timestamp, temperature in °C and the
+    driver flag word.
+
+    Only one chunk is formatted at a time and output goes through a large write
+    buffer, so memory use does not depend on the export size. `progress` is
+    called with (records_done, total) after each chunk, where `total` is the
+    caller's estimate (0 if unknown).
+
+    Raises:
+        ExportCancelled: if `cancel_event` is set; the partial file is removed.
+        ValueError: for an unknown format.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unsupported export format: {fmt}")
+    path = Path(path)
+    written = 0
+    try:
+        with open(path, "w", encoding="utf-8", buffering=buffer_size) as handle:
+            handle.write("timestamp_ns,temperature_c,flags\n" if fmt == "csv" else "[\n")
+            for chunk in chunks:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled(f"export to {path} cancelled")
+                if chunk.size == 0:
+                    continue
+                if fmt == "csv":
+                    handle.write(_format_csv(chunk))
+                else:
+                    handle.write(_format_json(chunk, first=written == 0))
+                written += chunk.size
+                if progress is not None:
+                    progress(written, total)
+            if fmt == "json":
+                handle.write("\n]\n")
+    except ExportCancelled:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+def _format_csv(chunk: np.ndarray) -> str:
+    temps = (chunk["temp_mC"] / 1000.0).tolist()
+    return "".join(
+        f"{ts},{temp:.3f},{flags}\n"
+        for ts, temp, flags in zip(chunk["timestamp_ns"].tolist(), temps, chunk["flags"].tolist())
+    )
+
+
+def _format_json(chunk: np.ndarray, *, first: bool) -> str:
+    temps = (chunk["temp_mC"] / 1000.0).tolist()
+    body = ",\n".join(
+        f'  {{"timestamp_ns": {ts}, "temperature_c": {temp:.3f}, "flags": {flags}}}'
+        for ts, temp, flags in zip(chunk["timestamp_ns"].tolist(), temps, chunk["flags"].tolist())
+    )
+    return body if first else ",\n" + body
@@ -0,0 +1,308 @@
+"""Binary session files with a sparse time index and rollups for fast range queries."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import numpy as np
+
+from API.src.SampleRing import SAMPLE_DTYPE
+from API.src.SampleRollup import (
+    DEFAULT_RESOLUTIONS_NS,
+    ROLLUP_DTYPE,
+    SampleRollup,
+    merge_buckets,
+    parse_resolution_label,
+    resolution_label,
+    summarize,
+)
+from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_THR_EDGE
+
+__all__ = ["SessionWriter", "SessionStore", "INDEX_DTYPE"]
+
+# One entry of the `.idx` (every N records) and `.alerts` (THR_EDGE records) files.
+INDEX_DTYPE = np.dtype([("timestamp_ns", "<u8"), ("position", "<u8")])
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx")
+
+
+def _alerts_path(path: Path) -> Path:
+    return path.with_name(path.name + ".alerts")
+
+
+def _rollup_path(path: Path, resolution_ns: int) -> Path:
+    return path.with_name(f"{path.name}.rollup-{resolution_label(resolution_ns)}")
+
+
+class SessionWriter:
+    """
+    Append-only writer for a session sample file.
+
+    Samples are stored as raw `simtemp_sample_v1` records. Every
+    `index_every`-th record and every record carrying `SIMTEMP_FLAG_THR_EDGE`
+    is also listed, with its timestamp, in small sidecar index files.
+    Completed `SampleRollup` buckets go to one `.rollup-<resolution>` file
+    per resolution; the partial ones are written on `close()`.
+    Reopening an existing session continues it.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        index_every: int = 1024,
+        rollup_resolutions_ns: Iterable[int] = DEFAULT_RESOLUTIONS_NS,
+    ) -> None:
+        if index_every <= 0:
+            raise ValueError("index_every must be positive")
+        self._path = Path(path)
+        self._index_every = index_every
+        self._data: BinaryIO = open(self._path, "ab")
+        self._index: BinaryIO = open(_index_path(self._path), "ab")
+        self._alerts: BinaryIO = open(_alerts_path(self._path), "ab")
+        self._rollup = SampleRollup(rollup_resolutions_ns, keep=False)
+        self._rollup_files: dict[int, BinaryIO] = {
+            resolution: open(_rollup_path(self._path, resolution), "ab")
+            for resolution in self._rollup.resolutions_ns
+        }
+        self._count = self._data.tell() // SAMPLE_DTYPE.itemsize
+
+    def __enter__(self) -> "SessionWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def count(self) -> int:
+        """Return how many records the session file holds."""
+        return self._count
+
+    def append(self, records: np.ndarray) -> None:
+        """Append a chronological batch of `SAMPLE_DTYPE` records."""
+        records = np.asarray(records, dtype=SAMPLE_DTYPE)
+        if records.size == 0:
+            return
+        positions = np.arange(self._count, self._count + records.size, dtype=np.uint64)
+
+        indexed = positions % self._index_every == 0
+        edges = (records["flags"] & SIMTEMP_FLAG_THR_EDGE) != 0
+        for mask, handle in ((indexed, self._index), (edges, self._alerts)):
+            if mask.any():
+                entries = np.empty(int(mask.sum()), dtype=INDEX_DTYPE)
+                entries["timestamp_ns"] = records["timestamp_ns"][mask]
+                entries["position"] = positions[mask]
+                handle.write(entries.tobytes())
+
+        self._data.write(records.tobytes())
+        self._count += records.size
+        self._write_rollups(self._rollup.append(records))
+
+    def flush(self) -> None:
+        for handle in self._handles():
+            handle.flush()
+
+    def close(self) -> None:
+        if not self._data.closed:
+            self._write_rollups(self._rollup.take_open())
+        for handle in self._handles():
+            if not handle.closed:
+                handle.close()
+
+    def _handles(self) -> list[BinaryIO]:
+        return [self._data, self._index, self._alerts, *self._rollup_files.values()]
+
+    def _write_rollups(self, buckets: dict[int, np.ndarray]) -> None:
+        for resolution, completed in buckets.items():
+            if completed.size:
+                self._rollup_files[resolution].write(completed.tobytes())
+
+    @staticmethod
+    def sidecar_path(log_path: str | Path) -> Path:
+        """Return the session file stored next to a CSV session log."""
+        log_path = Path(log_path)
+        return log_path.with_name(log_path.name + ".session.bin")
+
+
+class SessionStore:
+    """
+    Read-only access to a session written by `SessionWriter`.
+
+    The sample file is memory-mapped; `query()` finds the range with a binary
+    search over the sparse index and then over at most one index block of
+    timestamps, and returns a slice of the mapping without copying.
+    `overview()` answers zoomed-out queries from the rollup files, so long
+    spans never touch the raw samples.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._data: Optional[np.memmap] = None
+        self.refresh()
+
+    def __len__(self) -> int:
+        return 0 if self._data is None else self._data.size
+
+    def __enter__(self) -> "SessionStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def records(self) -> np.ndarray:
+        """Return every record of the session (memory-mapped)."""
+        return self._data if self._data is not None else np.empty(0, dtype=SAMPLE_DTYPE)
+
+    @property
+    def time_range(self) -> Optional[tuple[int, int]]:
+        """Return the first and last timestamp of the session, if any."""
+        if not len(self):
+            return None
+        return int(self._data[0]["timestamp_ns"]), int(self._data[-1]["timestamp_ns"])
+
+    def refresh(self) -> None:
+        """Re-map the files, picking up records appended since the last call."""
+        count = self._path.stat().st_size // SAMPLE_DTYPE.itemsize
+        self._data = (
+            np.memmap(self._path, dtype=SAMPLE_DTYPE, mode="r", shape=(count,)) if count else None
+        )
+        self._index = self._load_index(_index_path(self._path), count)
+        self._alerts = self._load_index(_alerts_path(self._path), count)
+        self._rollups = self._load_rollups(self._path)
+
+    def close(self) -> None:
+        self._data = None
+
+    def query(self, t_start: int, t_end: int) -> np.ndarray:
+        """Return the records with t_start <= timestamp_ns <= t_end as a zero-copy slice."""
+        first, last = self._locate(t_start, t_end)
+        return self.records[first:last]
+
+    def alerts(self, t_start: int, t_end: int) -> np.ndarray:
+        """Return the records flagged with `SIMTEMP_FLAG_THR_EDGE` inside the range."""
+        times = self._alerts["timestamp_ns"]
+        first = np.searchsorted(times, t_start, side="left")
+        last = np.searchsorted(times, t_end, side="right")
+        positions = self._alerts["position"][first:last].astype(np.intp)
+        return self.records[positions]
+
+    @property
+    def rollup_resolutions_ns(self) -> tuple[int, ...]:
+        return tuple(self._rollups)
+
+    def rollups(self, resolution_ns: int) -> np.ndarray:
+        """
+        Return the stored buckets of one resolution (`ROLLUP_DTYPE`), oldest first.
+
+        A continued session repeats the bucket that was open when the previous
+        writer closed; such repeats are merged, so every start time appears once.
+        """
+        if resolution_ns not in self._rollups:
+            return np.empty(0, dtype=ROLLUP_DTYPE)
+        return self._rollups[resolution_ns]
+
+    def overview(self, t_start: int, t_end: int, max_points: int) -> tuple[int, np.ndarray]:
+        """
+        Return (resolution_ns, buckets) summarizing [t_start, t_end] in about `max_points` buckets.
+
+        Short ranges come from the raw samples (resolution 0 means one bucket
+        per sample); once the finest rollup is coarse enough, the buckets are
+        read from the rollup files, and only the part of the range newer than
+        the last stored bucket is computed from finer data.
+        """
+        if t_end < t_start:
+            return 0, np.empty(0, dtype=ROLLUP_DTYPE)
+        first, last = self._locate(t_start, t_end)
+        if last - first <= max_points:
+            return 0, summarize(self.records[first:last], 1)
+        span = t_end - t_start
+        resolutions = sorted(self._rollups)
+        if not resolutions or span < max_points * resolutions[0]:
+            # Between raw and the finest rollup: summarize the (bounded) raw range on the fly.
+            resolution = max(1, -(-span // max_points))
+            return resolution, summarize(self.records[first:last], resolution)
+        resolution = next((r for r in resolutions if -(-span // r) <= max_points), resolutions[-1])
+        return resolution, self._rollup_range(resolution, t_start, t_end)
+
+    def _rollup_range(self, resolution_ns: int, t_start: int, t_end: int) -> np.ndarray:
+        """
+        Buckets of `resolution_ns` covering [t_start, t_end].
+
+        Stored buckets are sliced from the mapping; the part after the last
+        stored bucket (still open while logging) is merged from the next finer
+        resolution, or from the raw samples below the finest one.
+        """
+        stored = self.rollups(resolution_ns)
+        starts = stored["start_ns"]
+        begin = int(np.searchsorted(starts, t_start - t_start % resolution_ns, side="left"))
+        end = int(np.searchsorted(starts, t_end, side="right"))
+        buckets = np.asarray(stored[begin:end])
+        covered_until = int(starts[-1]) + resolution_ns if starts.size else 0
+        if covered_until > t_end:
+            return buckets
+        tail_start = max(covered_until, t_start - t_start % resolution_ns)
+        finer = [r for r in self._rollups if r < resolution_ns]
+        if finer:
+            tail = self._rollup_range(finer[-1], tail_start, t_end)
+        else:
+            first, last = self._locate(tail_start, t_end)
+            tail = summarize(self.records[first:last], resolution_ns)
+        tail = tail[tail["start_ns"] >= tail_start]
+        if not tail.size:
+            return buckets
+        return merge_buckets(np.concatenate((buckets, tail)), resolution_ns)
+
+    def _locate(self, t_start: int, t_end: int) -> tuple[int, int]:
+        count = len(self)
+        if count == 0 or t_end < t_start:
+            return 0, 0
+        times = self._index["timestamp_ns"]
+        positions = self._index["position"]
+
+        # Narrow each bound to one index block, then search inside that block only.
+        def bound(value: int, side: str) -> int:
+            block = int(np.searchsorted(times, value, side=side))
+            low = int(positions[block - 1]) if block > 0 else 0
+            high = int(positions[block]) if block < times.size else count
+            column = self._data["timestamp_ns"][low:high]
+            return low + int(np.searchsorted(column, value, side=side))
+
+        return bound(t_start, "left"), bound(t_end, "right")
+
+    @staticmethod
+    def _load_rollups(path: Path) -> dict[int, np.ndarray]:
+        rollups = {}
+        for rollup_path in path.parent.glob(f"{path.name}.rollup-*"):
+            try:
+                resolution = parse_resolution_label(rollup_path.name.rsplit(".rollup-", 1)[1])
+                count = rollup_path.stat().st_size // ROLLUP_DTYPE.itemsize
+            except (ValueError, OSError):
+                continue
+            if not count:
+                rollups[resolution] = np.empty(0, dtype=ROLLUP_DTYPE)
+                continue
+            buckets = np.memmap(rollup_path, dtype=ROLLUP_DTYPE, mode="r", shape=(count,))
+            starts = buckets["start_ns"]
+            if np.any(starts[1:] == starts[:-1]):
+                # Sessions continued after a close() repeat a bucket; merge those into memory once.
+                buckets = merge_buckets(np.asarray(buckets))
+            rollups[resolution] = buckets
+        return dict(sorted(rollups.items()))
+
+    @staticmethod
+    def _load_index(path: Path, count: int) -> np.ndarray:
+        try:
+            entries = np.fromfile(path, dtype=INDEX_DTYPE)
+        except (FileNotFoundError, ValueError):
+            return np.empty(0, dtype=INDEX_DTYPE)
+        # Ignore entries for records that were not fully written yet.
+        return entries[entries["position"] < count]
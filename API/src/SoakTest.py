@@ -0,0 +1,349 @@
+"""
+Accelerated soak test of the sample pipeline with memory and latency budgets.
+
+Synthetic `simtemp_sample_v1` batches are pushed through the same objects
+the application uses, as fast as they can be processed, so hours of
+acquisition run in minutes:
+
+- `headless`: the `SamplePipeline` of the main window (anomaly and alert
+  stages, bus sink) with display and file consumers and a `SessionWriter`
+  (rollups included);
+- `gui`: the continuous logging page on the Qt platform of the environment
+  (use `QT_QPA_PLATFORM=offscreen`), fed through the bus and rendered once
+  per batch.
+
+Every report interval records RSS, tracemalloc growth (optional, it slows
+Python down), the number of Qt objects and per-batch latency percentiles.
+After a warm-up, growth and p99 latency are checked against the budgets;
+`main()` exits with status 1 when one is exceeded.
+
+Run it with `python -m API.src.SoakTest --sim-hours 24 --mode gui`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from API.src.AlertEngine import AlertConfig
+from API.src.SampleBatch import SampleBatch
+from API.src.SampleBus import OverflowPolicy, SampleBus
+from API.src.SamplePipeline import AlertStage, AnomalyStage, BusSink, SamplePipeline
+from API.src.SampleRing import SAMPLE_DTYPE
+from API.src.SessionStore import SessionWriter
+from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_NEW_SAMPLE, SIMTEMP_FLAG_THR_EDGE
+
+__all__ = ["SoakBudgets", "SoakPoint", "SoakResult", "synthetic_batches", "run_soak", "main"]
+
+SOAK_CSV_HEADER = "elapsed_s,simulated_s,samples,rss_mb,traced_mb,qt_objects,p50_ms,p99_ms,max_ms"
+
+
+@dataclass(frozen=True)
+class SoakBudgets:
+    """Limits checked between the end of the warm-up and the end of the run."""
+
+    rss_growth_mb: float = 64.0
+    traced_growth_mb: float = 16.0
+    qt_object_growth: int = 100
+    p99_ms: float = 20.0
+
+
+@dataclass(frozen=True)
+class SoakPoint:
+    """Measurements of one report interval; latencies cover the batches of that interval."""
+
+    elapsed_s: float
+    simulated_s: float
+    samples: int
+    rss_mb: float
+    traced_mb: float  # NaN without tracemalloc
+    qt_objects: int  # -1 in headless mode
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+
+    def csv_row(self) -> str:
+        return (
+            f"{self.elapsed_s:.3f},{self.simulated_s:.3f},{self.samples},{self.rss_mb:.2f},"
+            f"{self.traced_mb:.3f},{self.qt_objects},{self.p50_ms:.4f},{self.p99_ms:.4f},{self.max_ms:.4f}"
+        )
+
+
+@dataclass
+class SoakResult:
+    points: list[SoakPoint] = field(default_factory=list)
+    violations: list[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+
+def synthetic_batches(
+    *,
+    period_ms: int = 5,
+    batch_size: int = 20,
+    threshold_mc: int = 25_000,
+    seed: int = 0,
+) -> Iterator[np.ndarray]:
+    """Yield endless chronological batches: a slow sine around the threshold plus noise."""
+    rng = np.random.default_rng(seed)
+    period_ns = period_ms * 1_000_000
+    index = 0
+    above = False
+    while True:
+        positions = np.arange(index, index + batch_size)
+        temps = threshold_mc + 1500 * np.sin(positions * (2 * math.pi / 120_000)) + rng.normal(0, 80, batch_size)
+        temps_mc = np.round(temps).astype(np.int32)
+        is_above = temps_mc >= threshold_mc
+        edges = is_above != np.concatenate(([above], is_above[:-1]))
+        above = bool(is_above[-1])
+
+        batch = np.empty(batch_size, dtype=SAMPLE_DTYPE)
+        batch["timestamp_ns"] = positions.astype(np.uint64) * period_ns
+        batch["temp_mC"] = temps_mc
+        batch["flags"] = SIMTEMP_FLAG_NEW_SAMPLE | np.where(edges, SIMTEMP_FLAG_THR_EDGE, 0)
+        index += batch_size
+        yield batch
+
+
+class _HeadlessStack:
+    """Acquisition-side objects, driven the way the stream worker and consumers drive them."""
+
+    def __init__(self, directory: Path, threshold_mc: int) -> None:
+        self._bus = SampleBus()
+        self._display = self._bus.subscribe("display")
+        self._file = self._bus.subscribe("file", OverflowPolicy.BLOCK)
+        self._session = SessionWriter(directory / "soak.session.bin")
+        self._pipeline = SamplePipeline(
+            [
+                AnomalyStage(),
+                AlertStage(AlertConfig(threshold_mc=threshold_mc, hysteresis_mc=200)),
+                BusSink(self._bus),
+            ]
+        )
+
+    def process(self, records: np.ndarray) -> None:
+        self._pipeline.process(SampleBatch(records))
+        self._display.read()
+        self._session.append(self._file.read().records)
+
+    def qt_objects(self) -> int:
+        return -1
+
+    def close(self) -> None:
+        self._pipeline.close()
+        self._session.close()
+        self._bus.close()
+
+
+class _GuiStack:
+    """The continuous logging page, fed through the bus and rendered once per batch."""
+
+    def __init__(self, directory: Path, threshold_mc: int) -> None:
+        # Imported here so headless runs do not need Qt.
+        from PySide6.QtCore import QObject
+        from PySide6.QtWidgets import QApplication
+
+        from API.views.Logs.logs_continuous_page import LogsContinuousPage
+
+        self._app = QApplication.instance() or QApplication([sys.argv[0]])
+        self._object_type = QObject
+        self._bus = SampleBus()
+        self._page = LogsContinuousPage()
+        self._page.attach_sample_bus(self._bus)
+        self._page.resize(1000, 700)
+        self._page.show()
+        self._headless = _HeadlessStack(directory, threshold_mc)
+
+    def process(self, records: np.ndarray) -> None:
+        self._headless.process(records)
+        self._bus.publish(records)
+        self._page.render_frame()
+        self._app.processEvents()
+
+    def qt_objects(self) -> int:
+        return len(self._page.findChildren(self._object_type))
+
+    def close(self) -> None:
+        self._headless.close()
+        self._page.close()
+        self._bus.close()
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        # Peak instead of current RSS, in KiB on Linux.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_soak(
+    *,
+    mode: str = "headless",
+    sim_hours: float = 1.0,
+    max_seconds: Optional[float] = None,
+    period_ms: int = 5,
+    batch_size: int = 20,
+    report_every_s: float = 600.0,
+    warmup_fraction: float = 0.1,
+    budgets: SoakBudgets = SoakBudgets(),
+    trace: bool = False,
+    out=None,
+) -> SoakResult:
+    """
+    Run the soak and return the measurements and budget violations.
+
+    Args:
+        sim_hours: Acquisition time to simulate.
+        max_seconds: Stop earlier after this much wall-clock time.
+        report_every_s: Simulated seconds per report point.
+        warmup_fraction: Share of the points used to reach a steady state;
+            growth is measured from the last warm-up point.
+        out: Text stream that receives a CSV row per point.
+    """
+    threshold_mc = 25_000
+    total_samples = int(sim_hours * 3600 * 1000 / period_ms)
+    samples_per_point = max(batch_size, int(report_every_s * 1000 / period_ms))
+    result = SoakResult()
+    if trace:
+        tracemalloc.start()
+    if out is not None:
+        print(SOAK_CSV_HEADER, file=out, flush=True)
+
+    with tempfile.TemporaryDirectory(prefix="simtemp-soak-") as directory:
+        stack = (_GuiStack if mode == "gui" else _HeadlessStack)(Path(directory), threshold_mc)
+        started = time.perf_counter()
+        latencies: list[int] = []
+        samples = 0
+        try:
+            for records in synthetic_batches(period_ms=period_ms, batch_size=batch_size, threshold_mc=threshold_mc):
+                begin = time.perf_counter_ns()
+                stack.process(records)
+                latencies.append(time.perf_counter_ns() - begin)
+                samples += records.size
+
+                done = samples >= total_samples
+                timed_out = max_seconds is not None and time.perf_counter() - started >= max_seconds
+                if samples % samples_per_point < batch_size or done or timed_out:
+                    latency_ms = np.array(latencies, dtype=np.float64) / 1e6
+                    latencies.clear()
+                    point = SoakPoint(
+                        elapsed_s=time.perf_counter() - started,
+                        simulated_s=samples * period_ms / 1000,
+                        samples=samples,
+                        rss_mb=_rss_mb(),
+                        traced_mb=tracemalloc.get_traced_memory()[0] / 2**20 if trace else math.nan,
+                        qt_objects=stack.qt_objects(),
+                        p50_ms=float(np.percentile(latency_ms, 50)),
+                        p99_ms=float(np.percentile(latency_ms, 99)),
+                        max_ms=float(latency_ms.max()),
+                    )
+                    result.points.append(point)
+                    if out is not None:
+                        print(point.csv_row(), file=out, flush=True)
+                if done or timed_out:
+                    break
+        finally:
+            stack.close()
+            if trace:
+                tracemalloc.stop()
+
+    result.violations = _check_budgets(result.points, warmup_fraction, budgets)
+    return result
+
+
+def _check_budgets(points: list[SoakPoint], warmup_fraction: float, budgets: SoakBudgets) -> list[str]:
+    if len(points) < 2:
+        return ["too few report points to measure growth; lower --report-every or run longer"]
+    baseline = points[min(len(points) - 2, int(len(points) * warmup_fraction))]
+    steady = points[points.index(baseline) + 1:]
+    final = points[-1]
+    violations = []
+    rss_growth = final.rss_mb - baseline.rss_mb
+    if rss_growth > budgets.rss_growth_mb:
+        violations.append(f"RSS grew by {rss_growth:.1f} MiB (budget {budgets.rss_growth_mb:.1f} MiB)")
+    if not math.isnan(final.traced_mb):
+        traced_growth = final.traced_mb - baseline.traced_mb
+        if traced_growth > budgets.traced_growth_mb:
+            violations.append(
+                f"traced Python memory grew by {traced_growth:.1f} MiB (budget {budgets.traced_growth_mb:.1f} MiB)"
+            )
+    if final.qt_objects >= 0:
+        object_growth = final.qt_objects - baseline.qt_objects
+        if object_growth > budgets.qt_object_growth:
+            violations.append(f"Qt objects grew by {object_growth} (budget {budgets.qt_object_growth})")
+    worst_p99 = max(point.p99_ms for point in steady)
+    if worst_p99 > budgets.p99_ms:
+        violations.append(f"p99 batch latency reached {worst_p99:.2f} ms (budget {budgets.p99_ms:.2f} ms)")
+    return violations
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Accelerated soak test with memory and latency budgets.")
+    parser.add_argument("--mode", choices=("headless", "gui"), default="headless")
+    parser.add_argument("--sim-hours", type=float, default=1.0, help="acquisition time to simulate")
+    parser.add_argument("--max-seconds", type=float, default=None, help="wall-clock limit")
+    parser.add_argument("--period", type=int, default=5, help="simulated sampling period [ms]")
+    parser.add_argument("--batch", type=int, default=20, help="samples per batch")
+    parser.add_argument("--report-every", type=float, default=600.0, help="simulated seconds per report point")
+    parser.add_argument("--tracemalloc", action="store_true", help="also track Python allocations (slower)")
+    parser.add_argument("--csv", default=None, help="write the report points to this CSV file")
+    parser.add_argument("--max-rss-growth", type=float, default=SoakBudgets.rss_growth_mb, help="[MiB]")
+    parser.add_argument("--max-traced-growth", type=float, default=SoakBudgets.traced_growth_mb, help="[MiB]")
+    parser.add_argument("--max-qt-growth", type=int, default=SoakBudgets.qt_object_growth, help="[objects]")
+    parser.add_argument("--max-p99", type=float, default=SoakBudgets.p99_ms, help="per-batch p99 latency [ms]")
+    args = parser.parse_args(argv)
+
+    budgets = SoakBudgets(
+        rss_growth_mb=args.max_rss_growth,
+        traced_growth_mb=args.max_traced_growth,
+        qt_object_growth=args.max_qt_growth,
+        p99_ms=args.max_p99,
+    )
+    out = open(args.csv, "w", encoding="utf-8") if args.csv else sys.stdout
+    try:
+        result = run_soak(
+            mode=args.mode,
+            sim_hours=args.sim_hours,
+            max_seconds=args.max_seconds,
+            period_ms=args.period,
+            batch_size=args.batch,
+            report_every_s=args.report_every,
+            budgets=budgets,
+            trace=args.tracemalloc,
+            out=out,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    final = result.points[-1] if result.points else None
+    if final is not None:
+        print(
+            f"Simulated {final.simulated_s / 3600:.2f} h ({final.samples} samples) in {final.elapsed_s:.1f} s",
+            file=sys.stderr,
+        )
+    for violation in result.violations:
+        print(f"FAIL: {violation}", file=sys.stderr)
+    if result.passed:
+        print("PASS: memory and latency stayed within budget", file=sys.stderr)
+    return 0 if result.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator, Iterable
-from dataclasses import asdict, dataclass
+import select
+from collections.abc import Generator, Iterable, Mapping
+from dataclasses import asdict, dataclass, fields, replace
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
+from API.src.SampleBatch import SampleBatch
+from API.src.SampleRing import SAMPLE_DTYPE
 from kernel.apitest.LxDrTemp import (
     DriverState,
     OperationMode,
@@ -20,7 +25,37 @@ from kernel.apitest.LxDrTemp import (
     SimulationMode,
 )
 
-__all__ = ["TempSensor", "DriverInfo"]
+__all__ = ["TempSensor", "DriverInfo", "DriverConfig", "ConfigApplyError"]
+
+# Settings the driver rejects with -EBUSY while sampling, written first.
+_STOPPED_ONLY_SETTINGS = ("operation_mode", "sampling_period_ms", "simulation_mode")
+# Settings that can be changed while the sampler runs.
+_LIVE_SETTINGS = ("threshold_mc",)
+# Extra room in a duration-bounded capture buffer for timer jitter.
+_CAPTURE_SLACK = 16
+
+
+class ConfigApplyError(SimTempError):
+    """
+    Raised by `TempSensor.apply_config()` when a step of the update fails.
+
+    `step` names the failed step: a setting, "stop" or "restart".
+    `rollback_errors` lists what could not be undone; when it is empty the
+    driver kept its previous configuration (`unchanged`).
+    """
+
+    def __init__(self, step: str, cause: Exception, rollback_errors: Iterable[str] = ()) -> None:
+        self.step = step
+        self.cause = cause
+        self.rollback_errors = tuple(rollback_errors)
+        message = f"{step}: {cause}"
+        if self.rollback_errors:
+            message += " (not undone: " + "; ".join(self.rollback_errors) + ")"
+        super().__init__(message)
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.rollback_errors
 
 
 @dataclass(frozen=True)
@@ -32,7 +67,45 @@ class DriverInfo:
     simulation_mode: Optional[str]
     threshold_mc: Optional[int]
     sampling_period_ms: Optional[int]
-    
+
+
+@dataclass(frozen=True)
+class DriverConfig:
+    """Driver settings to apply together; a None field leaves that setting unchanged."""
+
+    operation_mode: Optional[str] = None
+    simulation_mode: Optional[str] = None
+    sampling_period_ms: Optional[int] = None
+    threshold_mc: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        # Accept enum members and numeric strings, compare plain values.
+        for name in ("operation_mode", "simulation_mode"):
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, str(getattr(value, "value", value)))
+        for name in ("sampling_period_ms", "threshold_mc"):
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, int(value))
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, object]) -> "DriverConfig":
+        """
+        Build a config from a settings dict, ignoring unrelated keys.
+
+        Raises:
+            ValueError: if a numeric setting is not an integer.
+        """
+        return cls(**{f.name: values[f.name] for f in fields(cls) if values.get(f.name) not in (None, "")})
+
+    def changes_from(self, current: "DriverConfig") -> dict[str, object]:
+        """Return the settings of this config that differ from `current`."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if getattr(self, f.name) is not None and getattr(self, f.name) != getattr(current, f.name)
+        }
 
 
 class TempSensor:
@@ -54,6 +127,9 @@ class TempSensor:
             driver_kwargs["sysfs_base"] = sysfs_base
 
         self._driver = SimTempDriver(auto_open=auto_open, **driver_kwargs)
+        # Last known driver configuration, kept in step with every write made through this class.
+        self._config: Optional[DriverConfig] = None
+        self._identity: Optional[tuple[str, str]] = None
         self._info = {
             "name": "SimTempDriver",
             "description": "Simulated temperature sensor driver for Linux.",
@@ -87,31 +163,105 @@ class TempSensor:
         return asdict(config_obj)
 
  
-    def get_driver_info(self) -> DriverInfo:
-        """Collect metadata about the underlying driver using sysfs."""
+    def get_driver_info(self, *, refresh: bool = True) -> DriverInfo:
+        """
+        Collect metadata about the underlying driver using sysfs.
+
+        With `refresh=False` only the sampler state is read; the configuration
+        comes from the cache kept by `apply_config()` and the setters.
+        """
         sysfs_base = Path(self._driver.sysfs_base)
 
-        name = self._read_optional_text(sysfs_base / "name") or sysfs_base.name
-        version = self._driver.get_driver_version()
+        if refresh or self._identity is None:
+            name = self._read_optional_text(sysfs_base / "name") or sysfs_base.name
+            self._identity = (name, self._driver.get_driver_version())
+        name, version = self._identity
 
         state_text = self._read_optional_text(sysfs_base / "state")
         state = self._decode_state(state_text)
-        operation_mode = self._read_optional_text(sysfs_base / "operation_mode")
-        threshold = self._read_optional_int(sysfs_base / "threshold_mC")
-        sampling_period = self._read_optional_int(sysfs_base / "sampling_ms")
-        simulation_mode = self._read_optional_text(sysfs_base / "mode")
-       
+        config = self.current_config(refresh=refresh)
 
         return DriverInfo(
             name=name,
             version=version,
             state=state,
-            operation_mode=operation_mode,
-            threshold_mc=threshold,
-            sampling_period_ms=sampling_period,
-            simulation_mode=simulation_mode,
+            operation_mode=config.operation_mode,
+            threshold_mc=config.threshold_mc,
+            sampling_period_ms=config.sampling_period_ms,
+            simulation_mode=config.simulation_mode,
         )
 
+    def current_config(self, *, refresh: bool = False) -> DriverConfig:
+        """Return the driver configuration, reading it from sysfs if not cached."""
+        if refresh or self._config is None:
+            sysfs_base = Path(self._driver.sysfs_base)
+            self._config = DriverConfig(
+                operation_mode=self._read_optional_text(sysfs_base / "operation_mode"),
+                simulation_mode=self._read_optional_text(sysfs_base / "mode"),
+                sampling_period_ms=self._read_optional_int(sysfs_base / "sampling_ms"),
+                threshold_mc=self._read_optional_int(sysfs_base / "threshold_mC"),
+            )
+        return self._config
+
+    def apply_config(self, config: DriverConfig, *, refresh: bool = False) -> DriverConfig:
+        """
+        Write the settings of `config` that differ from the current ones.
+
+        Settings guarded by the driver's -EBUSY rule are written first, with
+        the sampler stopped once and restarted afterwards if it was running.
+        If a step fails, the settings already written are restored and the
+        sampler restarted before the error is raised, so the driver keeps its
+        previous configuration unless the rollback fails as well.
+
+        Args:
+            config: Settings to apply; None fields are left unchanged.
+            refresh: Re-read the current configuration instead of using the cache,
+                e.g. when another process may have changed it.
+
+        Returns:
+            The configuration now active in the driver.
+
+        Raises:
+            ConfigApplyError: if a setting is rejected or the sampler cannot be
+                stopped or restarted; tells which step failed and what could
+                not be rolled back.
+        """
+        self._ensure_open()
+        current = self.current_config(refresh=refresh)
+        changes = config.changes_from(current)
+        if not changes:
+            return current
+
+        needs_stop = any(name in changes for name in _STOPPED_ONLY_SETTINGS)
+        was_running = needs_stop and self._driver.get_state() == DriverState.RUN
+        written: list[str] = []
+        step = "stop"
+        try:
+            if was_running:
+                self._driver.stop()
+            for name in _STOPPED_ONLY_SETTINGS + _LIVE_SETTINGS:
+                if name in changes:
+                    step = name
+                    self._write_setting(name, changes[name])
+                    written.append(name)
+        except SimTempError as exc:
+            rollback_errors = self._restore_settings(current, written)
+            if was_running:
+                try:
+                    self._driver.start()
+                except SimTempError as restart_exc:
+                    rollback_errors.append(f"restart: {restart_exc}")
+            raise ConfigApplyError(step, exc, rollback_errors) from exc
+
+        self._config = replace(current, **changes)
+        if was_running:
+            try:
+                self._driver.start()
+            except SimTempError as exc:
+                # The new settings are in place; only the sampler is left stopped.
+                raise ConfigApplyError("restart", exc, ["new settings applied, sampler left stopped"]) from exc
+        return self._config
+
     def getinfodriver(self) -> dict[str, str]:
         """Backward-compatible alias returning driver metadata."""
         return self.info
@@ -124,6 +274,28 @@ class TempSensor:
         """Close the underlying device descriptor."""
         self._driver.close()
 
+    def fileno(self) -> int:
+        """Return the device descriptor, for use with `select`/`selectors`."""
+        self._ensure_open()
+        return self._driver.fileno()
+
+    def read_available(self) -> SampleBatch:
+        """
+        Return every sample that is already queued, without waiting.
+
+        Raises:
+            SimTempError: for driver-level failures.
+        """
+        self._ensure_open()
+        batch: list[tuple[int, int, int]] = []
+        while True:
+            try:
+                sample = self._driver.read_sample(timeout=0)
+            except SimTempTimeoutError:
+                break
+            batch.append((sample.timestamp_ns, sample.temp_mC, sample.flags))
+        return SampleBatch(np.array(batch, dtype=SAMPLE_DTYPE))
+
     def start(self) -> None:
         """Start the driver using the current configuration."""
         self._ensure_open()
@@ -177,7 +349,8 @@ class TempSensor:
                     self._driver.start()
             except SimTempError:
                 # Ignore stop failures so the original exception, if any, surfaces.
-                pass
+                # The restore may not have completed, so forget the cached config.
+                self._config = None
 
         if not sample.has_flag(SIMTEMP_FLAG_ONESHOT_DONE):
             raise SimTempError("one-shot measurement completed without DONE flag set")
@@ -217,6 +390,79 @@ class TempSensor:
             # to avoid stopping prematurely if the generator is just paused.
             pass
 
+    def capture(
+        self,
+        *,
+        count: Optional[int] = None,
+        duration_ns: Optional[int] = None,
+        timeout: float = 1.0,
+        discard_backlog: bool = True,
+    ) -> SampleBatch:
+        """
+        Collect an exact window of samples from the running sampler.
+
+        Exactly one bound must be given. With `count` the capture ends at the
+        N-th sample; with `duration_ns` it ends at the first sample whose
+        kernel timestamp is `duration_ns` or more after the first captured
+        sample, which is not included. Samples read past the bound in the
+        same bulk read are discarded.
+
+        Args:
+            count: Number of samples to capture.
+            duration_ns: Length of the window in kernel time.
+            timeout: Max seconds to wait for each sample.
+            discard_backlog: Drop samples queued before the call, so the window
+                starts with the next sample.
+
+        Raises:
+            ValueError: unless exactly one positive bound is given.
+            SimTempTimeoutError: if waiting for a sample exceeds the timeout.
+            SimTempError: for driver-level failures.
+        """
+        if (count is None) == (duration_ns is None):
+            raise ValueError("exactly one of count and duration_ns is required")
+        if (count if count is not None else duration_ns) <= 0:
+            raise ValueError("the capture bound must be positive")
+        fd = self.fileno()
+        if discard_backlog:
+            self.read_available()
+
+        if count is not None:
+            capacity = count
+        else:
+            period_ms = self.current_config().sampling_period_ms
+            capacity = duration_ns // (period_ms * 1_000_000) + _CAPTURE_SLACK if period_ms else 1024
+        buffer = np.empty(capacity, dtype=SAMPLE_DTYPE)
+        filled = 0
+        end_ns: Optional[int] = None
+
+        poller = select.poll()
+        poller.register(fd, select.POLLIN)
+        while True:
+            if not poller.poll(timeout * 1000):
+                raise SimTempTimeoutError(f"no sample within {timeout} s after {filled} captured")
+            records = self.read_available().records
+            if records.size == 0:
+                continue
+            if count is not None:
+                done = filled + records.size >= count
+                records = records[:count - filled]
+            else:
+                if end_ns is None:
+                    end_ns = int(records["timestamp_ns"][0]) + duration_ns
+                inside = int(np.searchsorted(records["timestamp_ns"], end_ns, side="left"))
+                done = inside < records.size
+                records = records[:inside]
+            if filled + records.size > buffer.size:
+                # Only a duration capture can outgrow its estimate, e.g. after a period change.
+                grown = np.empty(max(2 * buffer.size, filled + records.size), dtype=SAMPLE_DTYPE)
+                grown[:filled] = buffer[:filled]
+                buffer = grown
+            buffer[filled:filled + records.size] = records
+            filled += records.size
+            if done:
+                return SampleBatch(buffer[:filled])
+
     def iter_samples(
         self,
         count: int,
@@ -237,21 +483,47 @@ class TempSensor:
         """Proxy to the driver for adjusting simulation characteristics."""
         self._ensure_open()
         self._driver.set_simulation_mode(mode)
+        self._remember("simulation_mode", mode)
 
     def set_sampling_period_ms(self, period_ms: int) -> None:
         """Adjust the continuous sampling period."""
         self._ensure_open()
         self._driver.set_sampling_period_ms(period_ms)
+        self._remember("sampling_period_ms", period_ms)
 
     def set_threshold_mc(self, threshold_mc: int) -> None:
         """Configure the temperature threshold for alert notifications."""
         self._ensure_open()
         self._driver.set_threshold_mc(threshold_mc)
+        self._remember("threshold_mc", threshold_mc)
 
     def set_operation_mode(self, mode: str) -> None:
         """Set the driver's operation mode ('one-shot' or 'continuous')."""
         self._ensure_open()
         self._driver.set_operation_mode(mode)
+        self._remember("operation_mode", mode)
+
+    def _write_setting(self, name: str, value: object) -> None:
+        getattr(self._driver, f"set_{name}")(value)
+
+    def _restore_settings(self, previous: DriverConfig, written: list[str]) -> list[str]:
+        """Write back the previous values of `written`, newest first; returns the settings left changed."""
+        failures: list[str] = []
+        for name in reversed(written):
+            value = getattr(previous, name)
+            if value is None:
+                failures.append(f"{name}: previous value unknown")
+                continue
+            try:
+                self._write_setting(name, value)
+            except SimTempError as exc:
+                failures.append(f"{name}: {exc}")
+        self._config = None if failures else previous
+        return failures
+
+    def _remember(self, name: str, value: object) -> None:
+        if self._config is not None:
+            self._config = replace(self._config, **{name: value})
 
     @staticmethod
     def _read_optional_text(path: Path) -> Optional[str]:
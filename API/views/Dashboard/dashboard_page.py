@@ -0,0 +1,227 @@
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QGridLayout,
+    QLabel,
+    QFrame,
+    QScrollArea,
+    QToolButton,
+)
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QColor, QPainter, QPolygonF
+
+import numpy as np
+
+from API.src.SampleBus import BusConsumer, SampleBus
+
+# Samples kept per tile and the number of min/max columns they are reduced to.
+_TILE_SAMPLES = 512
+_TILE_COLUMNS = 128
+_SAMPLES_PER_COLUMN = _TILE_SAMPLES // _TILE_COLUMNS
+
+
+class _Sparkline(QWidget):
+    """Min/max band of the recent samples, painted from precomputed columns only."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(60)
+        self._lo = np.empty(0)
+        self._hi = np.empty(0)
+        self._range = (0.0, 1.0)
+        self._color = QColor("#4fc3f7")
+
+    def set_columns(self, lo: np.ndarray, hi: np.ndarray, low: float, high: float) -> None:
+        self._lo, self._hi = lo, hi
+        span = max(high - low, 0.1)
+        self._range = (low - span * 0.1, high + span * 0.1)
+        self.update()
+
+    def paintEvent(self, event):
+        if self._lo.size < 2:
+            return
+        width, height = self.width(), self.height()
+        low, high = self._range
+        xs = np.linspace(0.0, width - 1.0, self._lo.size)
+        scale = (height - 1.0) / (high - low)
+        top = (high - self._hi) * scale
+        bottom = (high - self._lo) * scale
+        # One polygon: the maxima left to right, then the minima back.
+        outline = [QPointF(x, y) for x, y in zip(xs.tolist(), top.tolist())]
+        outline += [QPointF(x, y) for x, y in zip(xs[::-1].tolist(), bottom[::-1].tolist())]
+        painter = QPainter(self)
+        painter.setPen(self._color)
+        painter.setBrush(self._color.darker(150))
+        painter.drawPolygon(QPolygonF(outline))
+        painter.end()
+
+
+class SensorTile(QFrame):
+    """Dashboard tile for one sensor: name, latest value and a sparkline that can be collapsed."""
+
+    def __init__(self, name: str, consumer: BusConsumer, parent=None):
+        super().__init__(parent)
+        self.setObjectName("SensorTile")
+        self.setFrameShape(QFrame.StyledPanel)
+        self._name = name
+        self.consumer = consumer
+        self.filled = 0  # valid samples in the tile's row of the shared buffer
+        self.connected = True
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 6, 8, 6)
+        header = QHBoxLayout()
+        self._collapse_button = QToolButton()
+        self._collapse_button.setCheckable(True)
+        self._collapse_button.setArrowType(Qt.DownArrow)
+        self._collapse_button.setToolTip("Collapse/expand the chart")
+        self._collapse_button.toggled.connect(self._on_collapse_toggled)
+        title = QLabel(name)
+        title.setStyleSheet("font-weight: bold;")
+        self._value_label = QLabel("—")
+        header.addWidget(self._collapse_button)
+        header.addWidget(title)
+        header.addStretch(1)
+        header.addWidget(self._value_label)
+        layout.addLayout(header)
+        self._sparkline = _Sparkline()
+        layout.addWidget(self._sparkline)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def collapsed(self) -> bool:
+        return self._collapse_button.isChecked()
+
+    def is_shown(self) -> bool:
+        """True while the sparkline is expanded and at least partly inside the scroll viewport."""
+        return not self.collapsed and self.isVisible() and not self._sparkline.visibleRegion().isEmpty()
+
+    def show_columns(self, lo: np.ndarray, hi: np.ndarray, low: float, high: float, latest_c: float) -> None:
+        self._value_label.setText(f"{latest_c:.3f} °C")
+        self._sparkline.set_columns(lo, hi, low, high)
+
+    def set_connected(self, connected: bool, reason: str = "") -> None:
+        """Marks the tile's feed as (dis)connected; the last chart stays visible but the value is replaced."""
+        self.connected = connected
+        if connected:
+            self._value_label.setText("—")
+            self._value_label.setStyleSheet("")
+            self._value_label.setToolTip("")
+        else:
+            self._value_label.setText("disconnected")
+            self._value_label.setStyleSheet("color: #ff8a65;")
+            self._value_label.setToolTip(reason)
+
+    def _on_collapse_toggled(self, collapsed: bool) -> None:
+        self._collapse_button.setArrowType(Qt.RightArrow if collapsed else Qt.DownArrow)
+        self._sparkline.setVisible(not collapsed)
+
+
+class DashboardPage(QWidget):
+    """
+    Grid of sensor tiles sharing the application's render tick.
+
+    All tiles keep their recent samples in one array, one row per tile. On a
+    frame only tiles that are shown and have unread samples are touched: their
+    rows are updated, then reduced to min/max columns in a single NumPy pass
+    for all of them. A tile without new data costs a lag check; a collapsed
+    or scrolled-out tile is not read at all until it is shown again.
+    """
+
+    def __init__(self, parent=None, *, columns: int = 4):
+        super().__init__(parent)
+        self.setObjectName("DashboardPage")
+        self.setStyleSheet("background-color: #3a404a; color: white;")
+        self._grid_columns = columns
+        self._tiles: list[SensorTile] = []
+        self._values = np.zeros((0, _TILE_SAMPLES), dtype=np.int32)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        title = QLabel("Sensor Dashboard")
+        title.setStyleSheet("font-size: 24px; font-weight: bold;")
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+        self._empty_label = QLabel("No sensors attached.")
+        self._empty_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self._empty_label)
+
+        grid_host = QWidget()
+        self._grid = QGridLayout(grid_host)
+        self._grid.setAlignment(Qt.AlignTop)
+        self._scroll = QScrollArea()
+        self._scroll.setWidgetResizable(True)
+        self._scroll.setWidget(grid_host)
+        layout.addWidget(self._scroll, 1)
+
+    @property
+    def tiles(self) -> tuple[SensorTile, ...]:
+        return tuple(self._tiles)
+
+    def add_sensor(self, name: str, bus: SampleBus) -> SensorTile:
+        """Adds a tile that follows `bus`; the tile only ever reads the latest samples."""
+        tile = SensorTile(name, bus.subscribe(f"dashboard:{name}"))
+        index = len(self._tiles)
+        self._tiles.append(tile)
+        self._values = np.vstack((self._values, np.zeros((1, _TILE_SAMPLES), dtype=np.int32)))
+        self._grid.addWidget(tile, index // self._grid_columns, index % self._grid_columns)
+        self._empty_label.setVisible(False)
+        return tile
+
+    def remove_sensor(self, name: str) -> None:
+        for index, tile in enumerate(self._tiles):
+            if tile.name == name:
+                tile.consumer.close()
+                self._grid.removeWidget(tile)
+                tile.deleteLater()
+                del self._tiles[index]
+                self._values = np.delete(self._values, index, axis=0)
+                self._relayout()
+                return
+
+    def render_frame(self) -> None:
+        """Updates the shown tiles that received samples since the previous frame."""
+        if not self.isVisible():
+            return
+        changed = []
+        for index, tile in enumerate(self._tiles):
+            if tile.consumer.lag == 0 or not tile.is_shown():
+                continue
+            samples = tile.consumer.read()
+            if not samples:
+                continue
+            self._push(index, tile, samples.temps_mc)
+            changed.append(index)
+        if not changed:
+            return
+
+        rows = np.array(changed)
+        # The shared decimation pass: every changed tile reduced to min/max columns at once.
+        columns = self._values[rows].reshape(rows.size, _TILE_COLUMNS, _SAMPLES_PER_COLUMN)
+        lows = columns.min(axis=2) / 1000.0
+        highs = columns.max(axis=2) / 1000.0
+        for position, index in enumerate(changed):
+            tile = self._tiles[index]
+            # Only columns holding received samples are drawn.
+            valid = max(1, -(-tile.filled // _SAMPLES_PER_COLUMN))
+            lo, hi = lows[position, -valid:], highs[position, -valid:]
+            tile.show_columns(lo, hi, float(lo.min()), float(hi.max()), self._values[index, -1] / 1000.0)
+
+    def _push(self, index: int, tile: SensorTile, temps_mc: np.ndarray) -> None:
+        row = self._values[index]
+        new = temps_mc[-_TILE_SAMPLES:]
+        if tile.filled == 0:
+            # Pad with the first value so empty columns do not stretch the range.
+            row[:] = new[0]
+        row[:-new.size] = row[new.size:]
+        row[-new.size:] = new
+        tile.filled = min(_TILE_SAMPLES, tile.filled + new.size)
+
+    def _relayout(self) -> None:
+        for index, tile in enumerate(self._tiles):
+            self._grid.addWidget(tile, index // self._grid_columns, index % self._grid_columns)
+        self._empty_label.setVisible(not self._tiles)
@@ -4,24 +4,150 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QPushButton,
-    QListWidget,
     QCheckBox,
     QLineEdit,
     QFileDialog,
     QMessageBox,
     QComboBox,
+    QProgressDialog,
 )
-from PySide6.QtCore import Qt, Slot, Signal, QTimer
+from PySide6.QtCore import Qt, Slot, Signal, QTimer, QPointF, QThread
 from PySide6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
 from PySide6.QtGui import QPainter, QIntValidator
 
-from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_THR_EDGE
+import numpy as np
+
+from API.src.DriverStats import STATS_CSV_HEADER, StatsPoller, StatsSnapshot
+from API.src.MinMaxPyramid import MinMaxPyramid
+from API.src.NoiseSpectrum import SpectrumReport
+from API.src.SampleBatch import SampleBatch
+from API.src.SampleBus import BusConsumer, OverflowPolicy, SampleBus
+from API.src.SampleRing import SampleRing
+from API.src.SampleRollup import SampleRollup
+from API.src.SessionExport import (
+    ExportCancelled,
+    export_chunks,
+    filter_chunks,
+    iter_record_chunks,
+    iter_session_chunks,
+)
+from API.src.SessionStore import SessionStore, SessionWriter
+from .sample_history_model import SampleHistoryModel, SampleHistoryView
+from .spectrum_pane import SpectrumPane
 from pathlib import Path
-from collections import deque
 from typing import Optional
+import threading
 import time
 
 
+class _ZoomableChartView(QChartView):
+    """Chart view that turns wheel steps and double clicks into zoom requests."""
+    zoom_requested = Signal(int)
+    zoom_reset_requested = Signal()
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() // 120
+        if steps:
+            self.zoom_requested.emit(steps)
+            event.accept()
+        else:
+            super().wheelEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self.zoom_reset_requested.emit()
+        event.accept()
+
+
+class _ExportWorker(QThread):
+    """Background worker that streams record chunks into an export file and closes the session they come from."""
+
+    progress = Signal(int, int)
+    failed = Signal(str)
+
+    def __init__(self, chunks, path: str, fmt: str, total: int, parent=None, *, store: Optional[SessionStore] = None):
+        super().__init__(parent)
+        self._chunks = chunks
+        self._path = path
+        self._fmt = fmt
+        self._total = total
+        self._store = store
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        try:
+            export_chunks(
+                self._chunks,
+                self._path,
+                self._fmt,
+                total=self._total,
+                progress=self.progress.emit,
+                cancel_event=self._cancel_event,
+            )
+        except ExportCancelled:
+            pass
+        except (OSError, ValueError) as exc:
+            self.failed.emit(f"Failed to export samples: {exc}")
+        finally:
+            # Drop the chunk generator first: it holds the memory map until it is closed.
+            if hasattr(self._chunks, "close"):
+                self._chunks.close()
+            self._chunks = None
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+
+
+class _SampleFileWriter(QThread):
+    """Bus consumer that appends samples to the CSV log and its binary session off the GUI thread."""
+
+    failed = Signal(str)
+
+    def __init__(self, samples: BusConsumer, path: str, parent=None):
+        super().__init__(parent)
+        self._samples = samples
+        self._path = path
+        self._stop_event = threading.Event()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def stop(self) -> None:
+        """Write what is still queued, close the files and wait for the thread to finish."""
+        self._stop_event.set()
+        self.wait()
+
+    def run(self) -> None:
+        try:
+            with open(self._path, "a", encoding="utf-8") as log, SessionWriter(
+                SessionWriter.sidecar_path(self._path)
+            ) as session:
+                while True:
+                    samples = self._samples.read(timeout=0.1)
+                    if not samples:
+                        if self._stop_event.is_set():
+                            break
+                        continue
+                    log.write(
+                        "".join(
+                            f"{ts},{temp:.3f}\n"
+                            for ts, temp in zip(samples.timestamps_ns.tolist(), samples.temps_c.tolist())
+                        )
+                    )
+                    session.append(samples.records)
+                    # Keep both files complete on disk so exports can read them while logging.
+                    log.flush()
+                    session.flush()
+        except OSError as exc:
+            self.failed.emit(f"Error writing to file: {exc}")
+        finally:
+            # Never hold back acquisition once nothing is written any more.
+            self._samples.close()
+
+
 class LogsContinuousPage(QWidget):
     """View for displaying and controlling continuous data logging."""
     start_logging_requested = Signal(dict)
@@ -29,7 +155,19 @@ class LogsContinuousPage(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._samples = deque(maxlen=10)
+        self._history = SampleRing(100_000)
+        # The pyramid covers the samples the history keeps; older spans come from the session file or rollups.
+        self._pyramid = MinMaxPyramid(max_samples=self._history.capacity)
+        # Zoomed out past one pixel per second the chart draws from time-bucket rollups instead.
+        self._rollup = SampleRollup()
+        self._zoom_store: Optional[SessionStore] = None
+        self._zoom_store_refreshed = 0.0
+        self._view_span_ns: Optional[int] = None  # None follows the latest points live
+        self._zoom_dirty = False
+        self._sample_bus: Optional[SampleBus] = None
+        self._display_samples: Optional[BusConsumer] = None
+        self._file_writer: Optional[_SampleFileWriter] = None
+        self._export_worker: Optional[_ExportWorker] = None
         self._is_logging = False
         self._sampling_timer = QTimer(self)
         self._sampling_timer.setSingleShot(True)
@@ -62,14 +200,24 @@ class LogsContinuousPage(QWidget):
         chart.legend().setVisible(True)
         chart.legend().setAlignment(Qt.AlignBottom)
 
-        self._graph_panel = QChartView(chart)
+        self._graph_panel = _ZoomableChartView(chart)
         self._graph_panel.setRenderHint(QPainter.Antialiasing)
-        data_layout.addWidget(self._graph_panel, 3)
+        self._graph_panel.setToolTip("Scroll to zoom through the session, double-click to return to live view")
+        # Optional noise spectrum under the live chart, redrawn at a low rate.
+        self._spectrum_pane = SpectrumPane()
+        self._spectrum_pane.setVisible(False)
+        graph_layout = QVBoxLayout()
+        graph_layout.addWidget(self._graph_panel, 2)
+        graph_layout.addWidget(self._spectrum_pane, 1)
+        data_layout.addLayout(graph_layout, 3)
+        self._graph_panel.zoom_requested.connect(self._on_zoom_requested)
+        self._graph_panel.zoom_reset_requested.connect(self._return_to_live_view)
 
         self._setup_chart_axes(chart)
 
         self._stateButton.clicked.connect(self._on_state_button_clicked)
         self._sample_toggle.toggled.connect(self._on_sample_toggle_changed)
+        self._spectrum_toggle.toggled.connect(self._spectrum_pane.setVisible)
 
     def _create_header_panel(self) -> QWidget:
         """Creates the top panel containing the title, mode, and control buttons."""
@@ -117,6 +265,20 @@ class LogsContinuousPage(QWidget):
         self._thresholdLabel = QLabel("Threshold [mC]:")
         self._threshold = QLineEdit("0") # Default value
         self._threshold.setValidator(QIntValidator(0, 100000, self)) # Range from 1 to 10000
+        # --- Alert filtering ---
+        self._hysteresisLabel = QLabel("Hysteresis [mC]:")
+        self._hysteresis = QLineEdit("0")
+        self._hysteresis.setValidator(QIntValidator(0, 10000, self))
+        self._dwellLabel = QLabel("Alert Dwell [ms]:")
+        self._dwell = QLineEdit("0")
+        self._dwell.setValidator(QIntValidator(0, 10000, self))
+        # --- Display refresh rate ---
+        self._refreshRateLabel = QLabel("Refresh [FPS]:")
+        self._refreshRate = QLineEdit("30")
+        self._refreshRate.setValidator(QIntValidator(10, 60, self))
+        # --- Noise spectrum pane ---
+        self._spectrum_toggle = QCheckBox("Noise Spectrum")
+        self._spectrum_toggle.setToolTip("Show the Welch noise spectrum of the stream, e.g. in noisy mode")
         # --- Combined settings layout ---
         settings_layout.addWidget(self._periodLabel)
         settings_layout.addWidget(self._period)
@@ -128,6 +290,13 @@ class LogsContinuousPage(QWidget):
         settings_layout.addWidget(self._simulationMode)
         settings_layout.addWidget(self._thresholdLabel)
         settings_layout.addWidget(self._threshold)
+        settings_layout.addWidget(self._hysteresisLabel)
+        settings_layout.addWidget(self._hysteresis)
+        settings_layout.addWidget(self._dwellLabel)
+        settings_layout.addWidget(self._dwell)
+        settings_layout.addWidget(self._refreshRateLabel)
+        settings_layout.addWidget(self._refreshRate)
+        settings_layout.addWidget(self._spectrum_toggle)
 
         params_layout.addWidget(mode_label)
         params_layout.addLayout(settings_layout)
@@ -146,11 +315,15 @@ class LogsContinuousPage(QWidget):
         self._path_line_edit.setPlaceholderText("Select a file to save results...")
         self._path_line_edit.setReadOnly(True)
         browse_button = QPushButton("Browse...")
+        self._export_alerts_only = QCheckBox("Alerts Only")
+        self._export_button = QPushButton("Export...")
 
         file_controls_layout.addWidget(self._sample_toggle)
         file_controls_layout.addWidget(QLabel("Save Path:"))
         file_controls_layout.addWidget(self._path_line_edit)
         file_controls_layout.addWidget(browse_button)
+        file_controls_layout.addWidget(self._export_alerts_only)
+        file_controls_layout.addWidget(self._export_button)
 
         panel_layout.addLayout(file_controls_layout)
 
@@ -164,13 +337,14 @@ class LogsContinuousPage(QWidget):
         self._update_state_button_style() # Set initial state
 
         browse_button.clicked.connect(self._on_browse_clicked)
+        self._export_button.clicked.connect(self._on_export_clicked)
         return panel
 
     def _create_sample_panel(self) -> QWidget:
         panel = QWidget()
         layout = QVBoxLayout(panel)
         layout.setContentsMargins(0, 10, 10, 0)
-        title = QLabel("Last 10 Readings")
+        title = QLabel("Reading History")
         title.setStyleSheet("font-weight: bold; font-size: 14px; margin-bottom: 5px;")
         indicator_layout = QHBoxLayout()
         indicator_layout.setContentsMargins(0, 0, 0, 0)
@@ -182,7 +356,9 @@ class LogsContinuousPage(QWidget):
         indicator_layout.addWidget(QLabel("Threshold Alert"), alignment=Qt.AlignLeft)
         indicator_layout.addStretch(1)
         layout.addLayout(indicator_layout)
-        self._history_list = QListWidget()
+        self._history_model = SampleHistoryModel(self._history, parent=self)
+        self._history_list = SampleHistoryView()
+        self._history_list.setModel(self._history_model)
         layout.addWidget(title)
         layout.addWidget(self._history_list)
         return panel
@@ -212,71 +388,189 @@ class LogsContinuousPage(QWidget):
         self._series.attachAxis(self._axis_y)
 
         self._start_time = time.time()
+        self._start_timestamp_ns: Optional[int] = None
+        self._plotted_total = 0
         self._max_graph_points = 100  # Max points to show on the graph
+        self._display_decimation = 1  # Plot every n-th sample of the live view; the log keeps all of them
 
-    @Slot(dict)
-    def add_sample(self, sample: dict):
-        """Adds a new sample to the UI."""
-        if not self._is_logging:
-            return
+    def attach_sample_bus(self, bus: SampleBus) -> None:
+        """Subscribes to the acquisition bus; samples are collected once per frame."""
+        self._sample_bus = bus
+        self._display_samples = bus.subscribe("display")
 
-        self._samples.append(sample)
-        self._add_sample_to_history_list(sample)
+    def _consume_bus(self) -> None:
+        if self._display_samples is not None:
+            self.add_samples(self._display_samples.read())
 
-        current_time = time.time() - self._start_time
-        temp = sample.get("temp_mC", 0) / 1000.0
+    @Slot(object)
+    def add_samples(self, samples: SampleBatch):
+        """Stores a batch of samples; the list and chart pick them up on the next frame."""
+        if not samples:
+            return
 
-        # --- Alert detection use case ---
-        is_alert = bool(sample.get("flags", 0) & SIMTEMP_FLAG_THR_EDGE)
-        if is_alert:
-            # Cambia el color de la serie temporalmente si hay una alerta
-            alert_pen = self._series.pen()
-            alert_pen.setColor(Qt.red)
-            self._series.setPen(alert_pen)
+        # Chart time comes from the kernel timestamps so batched samples keep their spacing.
+        records = samples.records
+        if self._start_timestamp_ns is None:
+            self._start_timestamp_ns = int(records["timestamp_ns"][0])
+        self._history.append(records)
+        self._pyramid.append(records["timestamp_ns"], records["temp_mC"])
+        self._rollup.append(records)
 
-        if self._series.count() > self._max_graph_points:
-            self._series.remove(0)
+    @Slot()
+    def render_frame(self):
+        """Draws everything stored since the previous frame with one chart and axis update."""
+        self._consume_bus()
+        self._history_model.sync()
+        self._spectrum_pane.render_frame()
+
+        total = self._history.total_written
+        if self._view_span_ns is not None:
+            if self._zoom_dirty or total != self._plotted_total:
+                self._render_zoomed_view()
+            return
 
-        self._series.append(current_time, temp)
-        self._update_axes(current_time, temp)
+        step = self._display_decimation
+        new_count = min(total - self._plotted_total, self._max_graph_points * step, len(self._history))
+        if new_count <= 0:
+            return
+        # Keep the samples whose sequence number is a multiple of the step, so the stride holds across frames.
+        recent = self._history.latest(new_count)[(new_count - total) % step::step]
+        self._plotted_total = total
+        if recent.size == 0:
+            return
+        times = (recent["timestamp_ns"].astype(np.int64) - self._start_timestamp_ns) / 1e9
+        temps = recent["temp_mC"] / 1000.0
+        points = [QPointF(x, y) for x, y in zip(times.tolist(), temps.tolist())]
+
+        excess = self._series.count() + len(points) - self._max_graph_points
+        if excess > 0:
+            self._series.removePoints(0, min(excess, self._series.count()))
+        self._series.append(points)
+
+        self._update_axes(points[-1].x(), float(temps.min()), float(temps.max()))
+
+    def _render_zoomed_view(self):
+        """Redraws the visible span from the pyramid level or rollup matching the plot width."""
+        self._zoom_dirty = False
+        self._plotted_total = self._history.total_written
+        if len(self._pyramid) == 0:
+            return
+        end_ns = int(self._pyramid.level(0)[0][-1])
+        start_ns = end_ns - self._view_span_ns
+        max_points = max(100, int(self._graph_panel.chart().plotArea().width()))
+        in_pyramid = start_ns >= int(self._pyramid.level(0)[0][0])
+        if in_pyramid and self._view_span_ns < max_points * self._rollup.resolutions_ns[0]:
+            level, t, lo, hi = self._pyramid.query(start_ns, end_ns, max_points)
+        else:
+            store = None if in_pyramid else self._session_store()
+            if store is not None:
+                # Fine zoom past the in-memory window: raw samples or rollups from the session being written.
+                level, buckets = store.overview(start_ns, end_ns, max_points)
+            else:
+                level, buckets = self._rollup.query(start_ns, end_ns, max_points)
+            t = buckets["start_ns"].astype(np.int64)
+            lo, hi = buckets["min_mC"], buckets["max_mC"]
+        if t.size == 0:
+            return
 
-        if is_alert:
-            original_pen = self._series.pen()
-            original_pen.setColor(Qt.white) # O el color que uses por defecto
-            self._series.setPen(original_pen)
+        times = (t - self._start_timestamp_ns) / 1e9
+        if level == 0:
+            xs, ys = times, lo / 1000.0
+        else:
+            # Draw each bucket as a vertical min/max stroke so peaks stay visible.
+            xs = np.repeat(times, 2)
+            ys = np.column_stack((lo, hi)).ravel() / 1000.0
+        self._series.replace([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
+
+        self._axis_x.setRange(
+            (start_ns - self._start_timestamp_ns) / 1e9,
+            (end_ns - self._start_timestamp_ns) / 1e9,
+        )
+        self._axis_y.setRange(float(lo.min()) / 1000.0 - 1, float(hi.max()) / 1000.0 + 1)
 
-        if self._sample_toggle.isChecked():
-            self._write_sample_to_file(sample)
+    def _on_zoom_requested(self, steps: int):
+        """Halves (wheel up) or doubles (wheel down) the visible time span per step."""
+        if len(self._pyramid) < 2:
+            return
+        timestamps = self._pyramid.level(0)[0]
+        live_span = int(timestamps[-1] - timestamps[max(0, len(timestamps) - self._max_graph_points)])
+        session_span = int(timestamps[-1] - self._start_timestamp_ns)
+        span = self._view_span_ns if self._view_span_ns is not None else live_span
+        span = min(int(span * 2.0 ** -steps), session_span)
+        if span <= live_span:
+            self._return_to_live_view()
+            return
+        self._view_span_ns = span
+        self._zoom_dirty = True
+
+    def _session_store(self) -> Optional[SessionStore]:
+        """Returns the binary session of the current log, re-mapped at most once a second, or None without one."""
+        session_path = self._stored_session_path() if self._sample_toggle.isChecked() else None
+        if session_path is None:
+            self._close_zoom_store()
+            return None
+        now = time.monotonic()
+        try:
+            if self._zoom_store is None:
+                self._zoom_store = SessionStore(session_path)
+            elif now - self._zoom_store_refreshed >= 1.0:
+                self._zoom_store.refresh()
+            else:
+                return self._zoom_store
+        except (OSError, ValueError) as e:
+            print(f"Error reading the session file: {e}")
+            self._close_zoom_store()
+            return None
+        self._zoom_store_refreshed = now
+        return self._zoom_store
+
+    def _close_zoom_store(self):
+        if self._zoom_store is not None:
+            self._zoom_store.close()
+            self._zoom_store = None
+
+    def _stored_session_path(self) -> Optional[Path]:
+        """Returns the binary session next to the log file if it holds any samples."""
+        log_path = self._path_line_edit.text()
+        session_path = SessionWriter.sidecar_path(log_path) if log_path else None
+        if session_path is None or not session_path.exists() or not session_path.stat().st_size:
+            return None
+        return session_path
+
+    def _return_to_live_view(self):
+        """Goes back to following the latest points."""
+        if self._view_span_ns is None:
+            return
+        self._view_span_ns = None
+        self._series.clear()
+        self._axis_y.setRange(20, 30)
+        self._plotted_total = max(0, self._history.total_written - self._max_graph_points)
 
-    def _add_sample_to_history_list(self, sample: dict):
-        """Adds a single sample to the top of the history list."""
-        temp_c = sample.get("temp_mC", 0) / 1000.0
-        is_alert = bool(sample.get("flags", 0) & SIMTEMP_FLAG_THR_EDGE)
-        prefix = "⚠️ " if is_alert else ""
-        self._history_list.insertItem(0, f"{prefix}{temp_c:.3f} °C")
-        
-        if self._history_list.count() > self._samples.maxlen:
-            self._history_list.takeItem(self._history_list.count() - 1)
-    def _update_axes(self, current_time: float, temp: float):
+    def _update_axes(self, current_time: float, low: float, high: float):
         """Adjusts chart axes ranges for better visualization."""
-        if self._series.count() > self._max_graph_points:
-            points = self._series.pointsVector()
-            if points:
-                self._axis_x.setRange(points[0].x(), current_time)
+        if self._series.count() >= self._max_graph_points:
+            self._axis_x.setRange(self._series.at(0).x(), current_time)
         else:
             if current_time > self._axis_x.max():
                 self._axis_x.setMax(current_time)
 
-        if temp < self._axis_y.min() or temp > self._axis_y.max():
+        if low < self._axis_y.min() or high > self._axis_y.max():
             temps = [p.y() for p in self._series.pointsVector()]
             self._axis_y.setRange(min(temps) - 1, max(temps) + 1)
 
     def clear_data(self):
         """Clears all data from the graph and list."""
         self._series.clear()
-        self._samples.clear()
-        self._history_list.clear()
+        self._history.clear()
+        self._history_model.reset()
         self._start_time = time.time()
+        self._start_timestamp_ns = None
+        self._plotted_total = 0
+        self._pyramid.clear()
+        self._rollup.clear()
+        self._close_zoom_store()
+        self._spectrum_pane.clear()
+        self._view_span_ns = None
         self._axis_x.setRange(0, 10)
         self._axis_y.setRange(20, 30)
 
@@ -299,6 +593,11 @@ class LogsContinuousPage(QWidget):
                 if threshold < 0:
                     raise ValueError("Threshold must be zero or greater.")
                 settings["threshold_mc"] = threshold
+
+                # Alert filtering is applied in user space by the alert engine
+                settings["alert_hysteresis_mc"] = int(self._hysteresis.text())
+                settings["alert_dwell_ms"] = int(self._dwell.text())
+                settings["refresh_fps"] = int(self._refreshRate.text())
                 
                 # Configure the sampling time window
                 sampling_time = int(self._samplingTime.text())
@@ -309,6 +608,8 @@ class LogsContinuousPage(QWidget):
                     self._sampling_timer.start(sampling_time)
                 self.set_threshold_indicator(False)
 
+                # The writer subscribes before acquisition starts so the log gets every sample.
+                self._sync_file_writer()
                 self.start_logging_requested.emit(settings)
             except ValueError:
                 QMessageBox.critical(self, "Invalid Input", "Please ensure all settings are valid numbers.")
@@ -316,6 +617,7 @@ class LogsContinuousPage(QWidget):
         else:
             self._sampling_timer.stop()
             self.stop_logging_requested.emit()
+            self._finish_session_files()
             self.set_threshold_indicator(False)
         
         self._update_state_button_style()
@@ -326,6 +628,7 @@ class LogsContinuousPage(QWidget):
             return
         self._is_logging = False # Actualiza el estado primero
         self.stop_logging_requested.emit()
+        self._finish_session_files()
         self._update_state_button_style()
         self.set_threshold_indicator(False)
 
@@ -346,6 +649,7 @@ class LogsContinuousPage(QWidget):
         self._sampling_timer.stop()
         self._is_logging = False
         self.stop_logging_requested.emit()
+        self._finish_session_files()
         self._update_state_button_style()
         self.set_threshold_indicator(False)
 
@@ -360,6 +664,53 @@ class LogsContinuousPage(QWidget):
         if file_path:
             self._path_line_edit.setText(file_path)
 
+    def _on_export_clicked(self):
+        """Exports the recorded session (or the in-memory history) in a background thread."""
+        if self._export_worker is not None and self._export_worker.isRunning():
+            return
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Samples As",
+            str(Path.home() / "exported_samples.csv"),
+            "CSV Files (*.csv);;JSON Files (*.json)"
+        )
+        if not file_path:
+            return
+        fmt = "json" if file_path.endswith(".json") or selected_filter.startswith("JSON") else "csv"
+
+        # Prefer the full binary session; fall back to the samples still held in memory.
+        session_path = self._stored_session_path()
+        alerts_only = self._export_alerts_only.isChecked()
+        store = None
+        if session_path is not None:
+            # Owned by the export worker, which closes it when the export ends.
+            store = SessionStore(session_path)
+            if alerts_only:
+                # The alert index lists the flagged records, so the total is known up front.
+                alerts = store.alerts(0, int(np.iinfo(np.uint64).max))
+                chunks, total = iter_record_chunks(alerts), alerts.size
+            else:
+                chunks, total = iter_session_chunks(store), len(store)
+        else:
+            snapshot = self._history.latest(len(self._history))
+            if alerts_only:
+                snapshot = next(filter_chunks([snapshot], alerts_only=True), snapshot[:0])
+            chunks, total = iter_record_chunks(snapshot), snapshot.size
+
+        progress_dialog = QProgressDialog("Exporting samples...", "Cancel", 0, 1000, self)
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+
+        worker = _ExportWorker(chunks, file_path, fmt, total, self, store=store)
+        worker.progress.connect(
+            lambda done, expected: progress_dialog.setValue(int(1000 * done / expected) if expected else 0)
+        )
+        worker.failed.connect(lambda message: QMessageBox.critical(self, "Export Error", message))
+        worker.finished.connect(progress_dialog.close)
+        progress_dialog.canceled.connect(worker.cancel)
+        self._export_worker = worker
+        worker.start()
+
     def _on_sample_toggle_changed(self, checked: bool):
         """Shows a pop-up to alert about enabling/disabling saving."""
         file_path = self._path_line_edit.text()
@@ -380,22 +731,71 @@ class LogsContinuousPage(QWidget):
                     return
         else:
             message = "Sample storage is now OFF."
+        self._sync_file_writer()
         QMessageBox.information(self, "Sample Storage", message)
 
-    def _write_sample_to_file(self, sample: dict):
-        """Appends a single sample to the log file."""
+    def _sync_file_writer(self):
+        """Starts or stops the background file writer to match the logging and storage state."""
         file_path = self._path_line_edit.text()
-        if not file_path:
+        wanted = (
+            self._is_logging
+            and self._sample_toggle.isChecked()
+            and bool(file_path)
+            and self._sample_bus is not None
+        )
+        if self._file_writer is not None and (not wanted or self._file_writer.path != file_path):
+            self._file_writer.stop()
+            self._file_writer = None
+        if wanted and self._file_writer is None:
+            # BLOCK: the log must stay complete, so a stalled disk holds back the bus instead of losing samples.
+            samples = self._sample_bus.subscribe("file", OverflowPolicy.BLOCK)
+            self._file_writer = _SampleFileWriter(samples, file_path, self)
+            self._file_writer.failed.connect(self._on_file_writer_failed)
+            self._file_writer.start()
+
+    def _on_file_writer_failed(self, message: str):
+        """Turns storage off once the writer gave up, so the toggle does not claim samples are still stored."""
+        # Without the toggle's own handler: one dialog is enough.
+        self._sample_toggle.blockSignals(True)
+        self._sample_toggle.setChecked(False)
+        self._sample_toggle.blockSignals(False)
+        self._sync_file_writer()
+        QMessageBox.critical(self, "File Error", f"{message}\nSample storage has been turned off.")
+
+    def _finish_session_files(self):
+        """Closes the log and binary session and stores the zoom pyramid next to the log file."""
+        self._consume_bus()
+        self._sync_file_writer()
+
+        file_path = self._path_line_edit.text()
+        if not file_path or not self._sample_toggle.isChecked() or len(self._pyramid) == 0:
             return
+        try:
+            self._pyramid.save(MinMaxPyramid.sidecar_path(file_path))
+        except OSError as e:
+            print(f"Error writing zoom pyramid: {e}")
 
-        temp_c = sample.get("temp_mC", 0) / 1000.0
-        timestamp_ns = sample.get("timestamp_ns", 0)
-        line = f"{timestamp_ns},{temp_c:.3f}\n"
+    def record_driver_stats(self, snapshot: StatsSnapshot) -> None:
+        """Appends a driver stats reading to the `.stats.csv` file next to the log being written."""
+        if self._file_writer is None:
+            return
+        path = StatsPoller.sidecar_path(self._file_writer.path)
         try:
-            with open(file_path, "a", encoding="utf-8") as f:
-                f.write(line)
+            new_file = not path.exists()
+            with open(path, "a", encoding="utf-8") as f:
+                if new_file:
+                    f.write(STATS_CSV_HEADER + "\n")
+                f.write(snapshot.csv_row() + "\n")
         except OSError as e:
-            print(f"Error writing to file: {e}")
+            print(f"Error writing driver stats: {e}")
+
+    def set_spectrum_report(self, report: SpectrumReport) -> None:
+        """Hands the latest noise spectrum to the spectrum pane."""
+        self._spectrum_pane.set_report(report)
+
+    def set_display_decimation(self, step: int) -> None:
+        """Plot only every `step`-th sample in the live view; the history list and the session files keep all."""
+        self._display_decimation = max(1, int(step))
 
     @Slot(bool)
     def set_threshold_indicator(self, active: bool) -> None:
@@ -405,3 +805,8 @@ class LogsContinuousPage(QWidget):
             return
         self._indicator_active = active
         self._set_indicator_color(self._indicator_on_color if active else self._indicator_off_color)
+        # The alert engine only reports transitions, so the pen changes once per alert.
+        if hasattr(self, "_series"):
+            pen = self._series.pen()
+            pen.setColor(Qt.red if active else Qt.white)
+            self._series.setPen(pen)
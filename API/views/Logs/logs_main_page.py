@@ -7,6 +7,12 @@ from PySide6.QtWidgets import (
     QLabel,
 )
 from PySide6.QtCore import Qt, Signal, Slot
+from typing import Optional
+
+from API.src.DriverStats import StatsSnapshot
+from API.src.NoiseSpectrum import SpectrumReport
+from API.src.SampleBatch import SampleRecord
+from API.src.SampleBus import SampleBus
 from .logs_oneshot_page import LogsOneShotPage
 from .logs_continuous_page import LogsContinuousPage
  
@@ -49,14 +55,32 @@ class LogsMainPage(QWidget):
         # Switch between the one-shot panel and the chart panel
         self._data_panel_stack.setCurrentWidget(self._continuous_panel if is_continuous else self._oneshot_panel)
 
-    @Slot(dict)
-    def on_sample_received(self, sample: dict):
+    @Slot(object)
+    def on_sample_received(self, sample: Optional[SampleRecord]):
         self._oneshot_panel.display_sample(sample)
 
-    @Slot(dict)
-    def on_continuous_sample_received(self, sample: dict):
-        self._continuous_panel.add_sample(sample)
+    def attach_sample_bus(self, bus: SampleBus) -> None:
+        self._continuous_panel.attach_sample_bus(bus)
+
+    @Slot()
+    def stop_logging(self) -> None:
+        self._continuous_panel.stop_logging_from_external()
+
+    @Slot()
+    def render_frame(self):
+        """Let both data panels draw what accumulated since the previous frame."""
+        self._oneshot_panel.render_frame()
+        self._continuous_panel.render_frame()
 
     @Slot(bool)
     def set_threshold_indicator(self, active: bool) -> None:
         self._continuous_panel.set_threshold_indicator(active)
+
+    def record_driver_stats(self, snapshot: StatsSnapshot) -> None:
+        self._continuous_panel.record_driver_stats(snapshot)
+
+    def set_spectrum_report(self, report: SpectrumReport) -> None:
+        self._continuous_panel.set_spectrum_report(report)
+
+    def set_display_decimation(self, step: int) -> None:
+        self._continuous_panel.set_display_decimation(step)
@@ -4,7 +4,6 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QPushButton,
-    QListWidget,
     QCheckBox,
     QLineEdit,
     QFileDialog,
@@ -12,9 +11,13 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Slot, Signal, QPointF
 from PySide6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
-from PySide6.QtGui import QPainter
+from PySide6.QtGui import QPainter, QIntValidator
 from pathlib import Path
-from collections import deque
+from typing import Optional
+
+from API.src.SampleBatch import SampleBatch, SampleRecord
+from API.src.SampleRing import SampleRing
+from .sample_history_model import SampleHistoryModel, SampleHistoryView
 
 
 class LogsOneShotPage(QWidget):
@@ -23,7 +26,11 @@ class LogsOneShotPage(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._samples = deque(maxlen=10)
+        self._history = SampleRing(10_000)
+        self._chart_points = 10
+        self._plotted_total = 0
+        self._since_rescale = 0
+        self._y_range: Optional[tuple[float, float]] = None
 
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignTop)
@@ -45,6 +52,7 @@ class LogsOneShotPage(QWidget):
 
         self._read_now_button.clicked.connect(self.read_now)
         self._sample_toggle.toggled.connect(self._on_sample_toggle_changed)
+        self._chart_history.editingFinished.connect(self._on_chart_history_changed)
 
     def _create_header_panel(self) -> QWidget:
 
@@ -72,6 +80,12 @@ class LogsOneShotPage(QWidget):
         self._sample_toggle = QCheckBox("Samples")
         self._sample_toggle.setStyleSheet("font-size: 14px;")
 
+        # Number of readings kept on the chart
+        chart_history_label = QLabel("Chart History:")
+        self._chart_history = QLineEdit(str(self._chart_points))
+        self._chart_history.setValidator(QIntValidator(2, self._history.capacity, self))
+        self._chart_history.setMaximumWidth(70)
+
         # Mode label (right)
         mode_label = QLabel("Mode: <b>One-Shot</b>")
         mode_label.setStyleSheet("font-size: 16px; font-style: italic;")
@@ -83,6 +97,8 @@ class LogsOneShotPage(QWidget):
         controls_layout.addStretch(1)
         controls_layout.addWidget(self._read_now_button, alignment=Qt.AlignCenter | Qt.AlignVCenter)
         controls_layout.addStretch(1)
+        controls_layout.addWidget(chart_history_label, alignment=Qt.AlignRight | Qt.AlignVCenter)
+        controls_layout.addWidget(self._chart_history, alignment=Qt.AlignRight | Qt.AlignVCenter)
         controls_layout.addWidget(self._sample_toggle, alignment=Qt.AlignRight | Qt.AlignVCenter)
 
         # --- File saving controls ---
@@ -108,9 +124,11 @@ class LogsOneShotPage(QWidget):
         panel = QWidget()
         layout = QVBoxLayout(panel)
         layout.setContentsMargins(0, 10, 10, 0)
-        title = QLabel("Last 10 Readings")
+        title = QLabel("Reading History")
         title.setStyleSheet("font-weight: bold; font-size: 14px; margin-bottom: 5px;")
-        self._history_list = QListWidget()
+        self._history_model = SampleHistoryModel(self._history, numbered=True, parent=self)
+        self._history_list = SampleHistoryView()
+        self._history_list.setModel(self._history_model)
         layout.addWidget(title)
         layout.addWidget(self._history_list)
         return panel
@@ -144,38 +162,75 @@ class LogsOneShotPage(QWidget):
         self._read_now_button.setEnabled(False)
         self.read_now_requested.emit()
 
-    @Slot(dict)
-    def display_sample(self, sample: dict):
-        """Displays the temperature of the received sample."""
-        
-        if sample and "temp_mC" in sample:
-            self._samples.append(sample)
-            self._update_ui()
-            
+    @Slot(object)
+    def display_sample(self, sample: Optional[SampleRecord]):
+        """Displays the temperature of the received sample (None re-enables the button only)."""
+        self.display_samples(SampleBatch.from_samples([sample] if sample is not None else []))
+
+    @Slot(object)
+    def display_samples(self, samples: SampleBatch):
+        """Stores a burst of readings; the list and chart catch up on the next frame."""
+        if samples:
+            self._history.append(samples.records)
+
             # Write to file if the toggle is enabled
             if self._sample_toggle.isChecked():
-                self._write_sample_to_file(sample)
+                self._write_samples_to_file(samples)
 
         self._read_now_button.setEnabled(True)
 
-    def _update_ui(self):
-        """Updates the history list and the chart with the current data."""
-        # Update list
-        self._history_list.clear()
-        for i, sample in enumerate(reversed(self._samples)):
-            temp_c = sample.get("temp_mC", 0) / 1000.0
-            self._history_list.insertItem(0, f"#{len(self._samples) - i}: {temp_c:.3f} °C")
+    @Slot()
+    def render_frame(self):
+        """Appends the readings received since the previous frame to the list and the chart."""
+        self._history_model.sync()
+
+        total = self._history.total_written
+        new_count = min(total - self._plotted_total, self._chart_points, len(self._history))
+        if new_count <= 0:
+            return
+        recent = self._history.latest(new_count)["temp_mC"] / 1000.0
+        first_number = total - new_count + 1
+        points = [QPointF(first_number + i, t) for i, t in enumerate(recent.tolist())]
 
-        # Update chart
-        points = [ (i, s.get("temp_mC", 0) / 1000.0) for i, s in enumerate(self._samples) ]
-        self._series.replace([QPointF(p[0], p[1]) for p in points])
+        excess = self._series.count() + len(points) - self._chart_points
+        if excess > 0:
+            self._series.removePoints(0, min(excess, self._series.count()))
+        self._series.append(points)
+        self._plotted_total = total
 
         # Adjust axes
-        if points:
-            min_y = min(p[1] for p in points)
-            max_y = max(p[1] for p in points)
-            self._axis_x.setRange(0, max(9, len(points) - 1))
-            self._axis_y.setRange(min_y - 0.5, max_y + 0.5)
+        first_visible = self._series.at(0).x()
+        self._axis_x.setRange(first_visible, max(first_visible + self._chart_points - 1, total))
+        self._update_y_axis(float(recent.min()), float(recent.max()), len(points))
+
+    def _update_y_axis(self, low: float, high: float, added: int):
+        """Grows the Y range immediately; shrinks it once per chart window of new readings."""
+        self._since_rescale += added
+        if self._y_range is not None and self._since_rescale < self._chart_points:
+            current_low, current_high = self._y_range
+            if low >= current_low + 0.5 and high <= current_high - 0.5:
+                return
+            low, high = min(low, current_low + 0.5), max(high, current_high - 0.5)
+        else:
+            visible = self._history.latest(self._series.count())["temp_mC"]
+            low, high = visible.min() / 1000.0, visible.max() / 1000.0
+            self._since_rescale = 0
+        self._y_range = (low - 0.5, high + 0.5)
+        self._axis_y.setRange(*self._y_range)
+
+    def _on_chart_history_changed(self):
+        """Redraws the chart with the newly requested number of readings."""
+        try:
+            points = int(self._chart_history.text())
+        except ValueError:
+            return
+        if points == self._chart_points:
+            return
+        self._chart_points = points
+        self._series.clear()
+        self._y_range = None
+        self._plotted_total = max(0, self._history.total_written - points)
+        self.render_frame()
 
     def _on_browse_clicked(self):
         """Opens a dialog to select a file path for saving."""
@@ -212,18 +267,18 @@ class LogsOneShotPage(QWidget):
             message = "Sample storage is now OFF."
         QMessageBox.information(self, "Sample Storage", message)
 
-    def _write_sample_to_file(self, sample: dict):
-        """Appends a single sample to the log file."""
+    def _write_samples_to_file(self, samples: SampleBatch):
+        """Appends readings to the log file with a single write."""
         file_path = self._path_line_edit.text()
         if not file_path:
             return
 
-        temp_c = sample.get("temp_mC", 0) / 1000.0
-        timestamp_ns = sample.get("timestamp_ns", 0)
-        line = f"{timestamp_ns},{temp_c:.3f}\n"
+        lines = "".join(
+            f"{ts},{temp:.3f}\n" for ts, temp in zip(samples.timestamps_ns.tolist(), samples.temps_c.tolist())
+        )
         try:
             with open(file_path, "a", encoding="utf-8") as f: # 'a' for append
-                f.write(line)
+                f.write(lines)
         except OSError as e:
             print(f"Error writing to file: {e}")
             # Optional: Disable the toggle and notify the user if writing fails repeatedly.
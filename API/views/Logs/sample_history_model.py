@@ -0,0 +1,89 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+from API.src.SampleRing import SampleRing
+from kernel.apitest.LxDrTemp import SIMTEMP_FLAG_THR_EDGE
+
+
+class SampleHistoryModel(QAbstractListModel):
+    """List model exposing a `SampleRing` newest-first without per-row widgets."""
+
+    def __init__(self, ring: SampleRing, *, numbered: bool = False, parent=None):
+        super().__init__(parent)
+        self._ring = ring
+        self._numbered = numbered
+        self._rows = 0
+        self._seen_total = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._rows
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        # Row 0 is the newest sample; text is only formatted for visible rows.
+        sequence = self._seen_total - 1 - index.row()
+        try:
+            record = self._ring.by_sequence(sequence)
+        except IndexError:
+            return None
+        temp_c = int(record["temp_mC"]) / 1000.0
+        if self._numbered:
+            return f"#{sequence + 1}: {temp_c:.3f} °C"
+        prefix = "⚠️ " if int(record["flags"]) & SIMTEMP_FLAG_THR_EDGE else ""
+        return f"{prefix}{temp_c:.3f} °C"
+
+    def reset(self) -> None:
+        """Rebuild the view from the current ring contents (e.g. after a clear)."""
+        self.beginResetModel()
+        self._rows = len(self._ring)
+        self._seen_total = self._ring.total_written
+        self.endResetModel()
+
+    def sync(self) -> None:
+        """Publish the samples appended to the ring since the previous call as one batch."""
+        total = self._ring.total_written
+        new_rows = total - self._seen_total
+        if new_rows == 0:
+            return
+        retained = len(self._ring)
+        if new_rows < 0 or new_rows >= retained:
+            # Ring was cleared or fully overwritten; nothing of the old view survives.
+            self.reset()
+            return
+
+        dropped = self._rows + new_rows - retained
+        if dropped > 0:
+            self.beginRemoveRows(QModelIndex(), self._rows - dropped, self._rows - 1)
+            self._rows -= dropped
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), 0, new_rows - 1)
+        self._rows += new_rows
+        self._seen_total = total
+        self.endInsertRows()
+
+
+class SampleHistoryView(QTableView):
+    """
+    Single-column view for `SampleHistoryModel`.
+
+    A `QListView` lays out every row again whenever rows are inserted, which
+    made each frame slower as the history filled up; table rows of a fixed
+    height are positioned arithmetically, so an insert costs the same at
+    100 or 100 000 rows.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.horizontalHeader().hide()
+        self.horizontalHeader().setStretchLastSection(True)
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 4)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
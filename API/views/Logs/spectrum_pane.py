@@ -0,0 +1,81 @@
+from PySide6.QtCharts import QChart, QChartView, QLineSeries, QLogValueAxis, QValueAxis
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QPainter
+from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+import numpy as np
+
+from API.src.NoiseSpectrum import SpectrumReport
+
+import time
+from typing import Optional
+
+
+class SpectrumPane(QWidget):
+    """Noise spectrum chart; keeps only the latest report and redraws it a few times per second at most."""
+
+    def __init__(self, parent=None, *, min_redraw_interval_s: float = 0.5):
+        super().__init__(parent)
+        self._min_redraw_interval_s = min_redraw_interval_s
+        self._report: Optional[SpectrumReport] = None
+        self._dirty = False
+        self._last_redraw = 0.0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self._series = QLineSeries()
+        self._series.setName("Noise PSD")
+        chart = QChart()
+        chart.addSeries(self._series)
+        chart.setTitle("Noise Spectrum (Welch)")
+        chart.setTheme(QChart.ChartThemeDark)
+        chart.legend().setVisible(False)
+
+        self._axis_x = QValueAxis()
+        self._axis_x.setTitleText("Frequency [Hz]")
+        self._axis_x.setLabelFormat("%.1f")
+        self._axis_y = QLogValueAxis()
+        self._axis_y.setTitleText("PSD [°C²/Hz]")
+        self._axis_y.setLabelFormat("%.0e")
+        chart.addAxis(self._axis_x, Qt.AlignBottom)
+        chart.addAxis(self._axis_y, Qt.AlignLeft)
+        self._series.attachAxis(self._axis_x)
+        self._series.attachAxis(self._axis_y)
+
+        self._chart_view = QChartView(chart)
+        self._chart_view.setRenderHint(QPainter.Antialiasing)
+        self._summary = QLabel("Waiting for enough samples to fill a segment…")
+        self._summary.setWordWrap(True)
+        layout.addWidget(self._chart_view, 1)
+        layout.addWidget(self._summary)
+
+    def set_report(self, report: SpectrumReport) -> None:
+        """Stores the latest report; it is drawn on a later frame."""
+        self._report = report
+        self._dirty = True
+
+    def clear(self) -> None:
+        self._report = None
+        self._dirty = False
+        self._series.clear()
+        self._summary.setText("Waiting for enough samples to fill a segment…")
+
+    def render_frame(self) -> None:
+        """Redraws the latest report if it changed and the pane is visible, rate-limited."""
+        if not self._dirty or not self.isVisible():
+            return
+        now = time.monotonic()
+        if now - self._last_redraw < self._min_redraw_interval_s:
+            return
+        self._last_redraw = now
+        self._dirty = False
+
+        report = self._report
+        # The DC bin only holds what is left of the removed segment mean.
+        frequencies = report.frequencies_hz[1:]
+        density = np.maximum(report.density_c2_per_hz[1:], report.noise_floor_c2_per_hz * 1e-3)
+        self._series.replace([QPointF(x, y) for x, y in zip(frequencies.tolist(), density.tolist())])
+        self._axis_x.setRange(0.0, report.sample_rate_hz / 2.0)
+        self._axis_y.setRange(float(density.min()) / 2.0, float(density.max()) * 2.0)
+        self._summary.setText(report.summary())
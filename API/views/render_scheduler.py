@@ -0,0 +1,56 @@
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class RenderScheduler(QObject):
+    """Frame clock that decouples UI repaints from the sample rate.
+
+    Producers only store data; consumers connected to `frame` pull whatever
+    accumulated since the previous tick and redraw it in one pass.
+    """
+
+    frame = Signal()
+
+    MIN_FPS = 10
+    MAX_FPS = 60
+
+    def __init__(self, fps: int = 30, hidden_fps: int = 2, parent=None):
+        super().__init__(parent)
+        self._fps = self._clamp(fps)
+        self._hidden_fps = max(1, hidden_fps)
+        self._visible = True
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.frame.emit)
+        self._apply_interval()
+
+    @property
+    def fps(self) -> int:
+        """Return the frame rate currently in effect."""
+        return self._fps if self._visible else min(self._fps, self._hidden_fps)
+
+    def start(self) -> None:
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def set_fps(self, fps: int) -> None:
+        """Set the visible frame rate, clamped to the supported range."""
+        self._fps = self._clamp(fps)
+        self._apply_interval()
+
+    def set_visible(self, visible: bool) -> None:
+        """Throttle rendering while the window is hidden or minimized."""
+        if visible == self._visible:
+            return
+        self._visible = visible
+        self._apply_interval()
+        if visible and self._timer.isActive():
+            # Catch up immediately instead of waiting for the next slow tick.
+            self.frame.emit()
+
+    def _apply_interval(self) -> None:
+        self._timer.setInterval(round(1000 / self.fps))
+
+    @classmethod
+    def _clamp(cls, fps: int) -> int:
+        return max(cls.MIN_FPS, min(cls.MAX_FPS, int(fps)))
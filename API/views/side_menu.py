@@ -5,6 +5,7 @@ class SideMenu(QWidget):
     signal_show_welcome = Signal()
     signal_show_logs = Signal()
     signal_show_settings = Signal()
+    signal_show_dashboard = Signal()
     signal_toggle_menu = Signal()
     
 
@@ -26,8 +27,9 @@ class SideMenu(QWidget):
         btn_welcome = QPushButton("Welcome")
         btn_logs = QPushButton("Logs")
         btn_settings = QPushButton("Settings")
+        btn_dashboard = QPushButton("Dashboard")
 
-        for b in (btn_welcome, btn_logs, btn_settings):
+        for b in (btn_welcome, btn_logs, btn_settings, btn_dashboard):
             b.setObjectName("MenuButton")
             b.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
             b.setMinimumHeight(36)
@@ -46,6 +48,7 @@ class SideMenu(QWidget):
         layout.addWidget(btn_welcome)
         layout.addWidget(btn_settings)
         layout.addWidget(btn_logs)
+        layout.addWidget(btn_dashboard)
         layout.addSpacing(6)
         layout.addWidget(sep)
         layout.addWidget(btn_collapse, alignment=Qt.AlignHCenter)
@@ -54,4 +57,5 @@ class SideMenu(QWidget):
         btn_welcome.clicked.connect(self.signal_show_welcome.emit)
         btn_logs.clicked.connect(self.signal_show_logs.emit)
         btn_settings.clicked.connect(self.signal_show_settings.emit)
+        btn_dashboard.clicked.connect(self.signal_show_dashboard.emit)
         btn_collapse.clicked.connect(self.signal_toggle_menu.emit)
@@ -1,8 +1,15 @@
 from PySide6.QtWidgets import QWidget, QStackedWidget, QVBoxLayout, QLabel
 from PySide6.QtCore import Qt, Signal
+from typing import Optional
+
+from API.src.DriverStats import StatsSnapshot
+from API.src.NoiseSpectrum import SpectrumReport
+from API.src.SampleBatch import SampleRecord
+from API.src.SampleBus import SampleBus
 from .Welcome.welcome_page import WelcomePage
 from .Settings.settings_page import SettingsPage
 from .Logs.logs_main_page import LogsMainPage
+from .Dashboard.dashboard_page import DashboardPage, SensorTile
 
 class  WorkArea(QWidget):
 
@@ -29,10 +36,12 @@ class  WorkArea(QWidget):
         self._welcome_page = WelcomePage()
         self._settings_page = SettingsPage()
         self._logs_main_page = LogsMainPage()
+        self._dashboard_page = DashboardPage()
 
         self._add_page("welcome", self._welcome_page)
         self._add_page("settings", self._settings_page)
         self._add_page("logs", self._logs_main_page)
+        self._add_page("dashboard", self._dashboard_page)
 
         # Connect the signal from the settings page to this class's signal
         self._settings_page.settings_to_write.connect(self.settings_to_write)
@@ -68,13 +77,38 @@ class  WorkArea(QWidget):
         if name in self._pages:
             self.stack.setCurrentIndex(self._pages[name])
 
-    def on_one_shot_sample_received(self, sample: dict):
+    def on_one_shot_sample_received(self, sample: Optional[SampleRecord]):
         """Forward the received sample to the logs page."""
         self._logs_main_page.on_sample_received(sample)
 
-    def on_continuous_sample_received(self, sample: dict):
-        """Forward continuous samples to the logs page."""
-        self._logs_main_page.on_continuous_sample_received(sample)
+    def attach_sample_bus(self, bus: SampleBus) -> None:
+        """Let the logs page consume continuous samples from the acquisition bus."""
+        self._logs_main_page.attach_sample_bus(bus)
+
+    def add_dashboard_sensor(self, name: str, bus: SampleBus) -> SensorTile:
+        """Show a sensor's sample bus as a tile on the dashboard page."""
+        return self._dashboard_page.add_sensor(name, bus)
+
+    def stop_logging(self) -> None:
+        """Stop a running continuous capture as if the user pressed Stop."""
+        self._logs_main_page.stop_logging()
+
+    def render_frame(self) -> None:
+        """Forward a render tick to the pages that show live data."""
+        self._logs_main_page.render_frame()
+        self._dashboard_page.render_frame()
+
+    def set_display_decimation(self, step: int) -> None:
+        """Thin out the live chart while the display is shedding load."""
+        self._logs_main_page.set_display_decimation(step)
 
     def set_threshold_indicator(self, active: bool) -> None:
         self._logs_main_page.set_threshold_indicator(active)
+
+    def record_driver_stats(self, snapshot: StatsSnapshot) -> None:
+        """Forward a driver stats reading to the running session log."""
+        self._logs_main_page.record_driver_stats(snapshot)
+
+    def set_spectrum_report(self, report: SpectrumReport) -> None:
+        """Forward the latest noise spectrum to the continuous logging page."""
+        self._logs_main_page.set_spectrum_report(report)
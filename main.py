@@ -1,14 +1,68 @@
 from PySide6.QtWidgets import QApplication
 from API.main_window import MainWindow
+from API.src.AcquisitionProcess import AcquisitionOptions
+from API.src.RemoteTempSensor import RemoteTempSensor
+from API.src.SampleBroadcaster import DEFAULT_SOCKET_PATH
+import argparse
 import sys
 
+def _remote_sensor(address: str) -> RemoteTempSensor:
+    """Broadcaster given as a UNIX socket path or as HOST:PORT."""
+    host, separator, port = address.rpartition(":")
+    if separator and port.isdigit() and "/" not in address:
+        return RemoteTempSensor(None, host=host or None, port=int(port))
+    return RemoteTempSensor(address)
+
 def main():
-    app = QApplication(sys.argv)
-    win = MainWindow()
+    parser = argparse.ArgumentParser(description="SimTemp instrument panel")
+    parser.add_argument(
+        "--remote",
+        nargs="?",
+        const=DEFAULT_SOCKET_PATH,
+        metavar="SOCKET",
+        help="attach to a running sample broadcaster instead of the device",
+    )
+    parser.add_argument("--decimate", type=int, default=1, help="with --remote, receive every n-th sample")
+    parser.add_argument(
+        "--acquisition-process",
+        action="store_true",
+        help="read the device in a separate process so a busy UI cannot delay it",
+    )
+    parser.add_argument(
+        "--acquisition-cpus",
+        type=lambda text: frozenset(int(cpu) for cpu in text.split(",")),
+        default=None,
+        metavar="CPU[,CPU...]",
+        help="pin the acquisition process to these CPUs",
+    )
+    parser.add_argument(
+        "--acquisition-priority",
+        type=int,
+        default=None,
+        metavar="PRIO",
+        help="run the acquisition process with SCHED_FIFO priority PRIO (needs CAP_SYS_NICE)",
+    )
+    parser.add_argument(
+        "--dashboard",
+        action="append",
+        default=[],
+        metavar="SOCKET|HOST:PORT",
+        help="add a dashboard tile for another sample broadcaster (repeatable)",
+    )
+    args, qt_args = parser.parse_known_args()
+    if args.remote and args.acquisition_process:
+        parser.error("--acquisition-process reads the device directly and cannot be combined with --remote")
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    sensor = RemoteTempSensor(args.remote, decimate=args.decimate) if args.remote else None
+    acquisition = None
+    if args.acquisition_process:
+        acquisition = AcquisitionOptions(cpus=args.acquisition_cpus, realtime_priority=args.acquisition_priority)
+    dashboard_sensors = [(address, _remote_sensor(address)) for address in args.dashboard]
+    win = MainWindow(sensor=sensor, acquisition=acquisition, dashboard_sensors=dashboard_sensors)
     win.resize(800, 600)
     win.show()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
     main()
-    
\ No newline at end of file
@@ -0,0 +1,38 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+usage() {
+	cat <<'EOF_USAGE'
+Usage: report.sh [options] <log> [<log> ...]
+
+Print sample count, duration, min/max/mean/σ and period jitter for CSV
+(timestamp_ns,temperature_c) or binary session logs.
+
+Options:
+  --threshold <°C>   Also count crossings of this temperature.
+  --workers <n>      Number of worker processes (default: CPU count).
+  --summary          Print a one-sentence summary for DESIGN/TESTPLAN evidence.
+  -h, --help         Show this message and exit.
+EOF_USAGE
+}
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+if [[ $# -eq 0 ]]; then
+	usage >&2
+	exit 1
+fi
+case "$1" in
+	-h|--help)
+		usage
+		exit 0
+		;;
+esac
+
+PYTHON_BIN="${PYTHON_BIN:-python3}"
+if [[ -x "${ROOT_DIR}/.venv/bin/python" ]]; then
+	PYTHON_BIN="${ROOT_DIR}/.venv/bin/python"
+fi
+
+cd "${ROOT_DIR}"
+exec "${PYTHON_BIN}" -m API.src.EvidenceReport "$@"
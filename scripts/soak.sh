@@ -0,0 +1,45 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+usage() {
+	cat <<'EOF_USAGE'
+Usage: soak.sh [options]
+
+Push synthetic samples through the acquisition stack (or the GUI on an
+offscreen display) at an accelerated rate and fail if memory or per-batch
+latency exceed their budgets.
+
+Options:
+  --mode <headless|gui>    Stack to exercise (default: headless).
+  --sim-hours <h>          Acquisition time to simulate (default: 1).
+  --max-seconds <s>        Stop earlier after this much wall-clock time.
+  --report-every <s>       Simulated seconds per report point (default: 600).
+  --tracemalloc            Also track Python allocations (slower).
+  --csv <file>             Write the report points to a CSV file.
+  --max-rss-growth <MiB>   RSS growth budget after warm-up (default: 64).
+  --max-traced-growth <MiB>
+                           tracemalloc growth budget (default: 16).
+  --max-qt-growth <n>      Qt object growth budget (default: 100).
+  --max-p99 <ms>           Per-batch p99 latency budget (default: 20).
+  -h, --help               Show this message and exit.
+EOF_USAGE
+}
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+case "${1:-}" in
+	-h|--help)
+		usage
+		exit 0
+		;;
+esac
+
+PYTHON_BIN="${PYTHON_BIN:-python3}"
+if [[ -x "${ROOT_DIR}/.venv/bin/python" ]]; then
+	PYTHON_BIN="${ROOT_DIR}/.venv/bin/python"
+fi
+
+export QT_QPA_PLATFORM="${QT_QPA_PLATFORM:-offscreen}"
+
+cd "${ROOT_DIR}"
+exec "${PYTHON_BIN}" -m API.src.SoakTest "$@"
@@ -0,0 +1,54 @@
+"""Tests for the bounded `MinMaxPyramid` window."""
+
+import numpy as np
+
+from API.src.MinMaxPyramid import MinMaxPyramid
+
+
+def _feed(pyramids, batches: int, *, seed: int = 1, t0: int = 0) -> int:
+    """Append the same random batches, 5 ns apart, to every pyramid; return the last timestamp."""
+    rng = np.random.default_rng(seed)
+    for _ in range(batches):
+        count = int(rng.integers(1, 40))
+        timestamps = t0 + np.arange(count) * 5
+        temps = rng.integers(20_000, 30_000, count)
+        for pyramid in pyramids:
+            pyramid.append(timestamps, temps)
+        t0 += 5 * count
+    return t0 - 5
+
+
+def test_bounded_pyramid_matches_unbounded_inside_window():
+    full = MinMaxPyramid()
+    bounded = MinMaxPyramid(max_samples=1_000)
+    end = _feed((full, bounded), 3_000)
+    for span in (500, 2_000, 4_995):
+        for max_points in (50, 100, 600, 2_000):
+            expected = full.query(end - span, end, max_points)
+            actual = bounded.query(end - span, end, max_points)
+            assert actual[0] == expected[0]
+            for column, reference in zip(actual[1:], expected[1:]):
+                np.testing.assert_array_equal(column, reference)
+
+
+def test_bounded_pyramid_memory_stays_flat():
+    pyramid = MinMaxPyramid(max_samples=1_000)
+    _feed((pyramid,), 3_000)
+    for index in range(pyramid.levels):
+        assert len(pyramid.level(index)[0]) <= 2 * (1_000 >> index)
+
+
+def test_save_and_load_keep_folding_a_trimmed_pyramid(tmp_path):
+    full = MinMaxPyramid()
+    bounded = MinMaxPyramid(max_samples=1_000)
+    end = _feed((full, bounded), 3_000)
+    path = tmp_path / "log.csv.pyramid.npz"
+    bounded.save(path)
+    loaded = MinMaxPyramid.load(path)
+    end = _feed((full, loaded), 50, seed=2, t0=end + 5)
+    for max_points in (100, 600):
+        expected = full.query(end - 2_000, end, max_points)
+        actual = loaded.query(end - 2_000, end, max_points)
+        assert actual[0] == expected[0]
+        for column, reference in zip(actual[1:], expected[1:]):
+            np.testing.assert_array_equal(column, reference)
@@ -0,0 +1,57 @@
+"""Regression tests for continued sessions in `SessionStore`."""
+
+import numpy as np
+
+from API.src.SampleRing import SAMPLE_DTYPE
+from API.src.SampleRollup import SECOND_NS
+from API.src.SessionStore import SessionStore, SessionWriter
+
+HOUR_NS = 3600 * SECOND_NS
+
+
+def _records(start_ns: int, count: int, period_ns: int) -> np.ndarray:
+    records = np.zeros(count, dtype=SAMPLE_DTYPE)
+    records["timestamp_ns"] = start_ns + np.arange(count, dtype=np.uint64) * period_ns
+    records["temp_mC"] = 25_000 + np.arange(count) % 500
+    return records
+
+
+def _write_in_sessions(path, parts) -> np.ndarray:
+    """Write each part with its own writer, as a logging session that is stopped and continued."""
+    for part in parts:
+        with SessionWriter(path) as writer:
+            writer.append(part)
+    return np.concatenate(parts)
+
+
+def test_overview_counts_every_session_of_a_continued_bucket(tmp_path):
+    path = tmp_path / "log.session.bin"
+    period_ns = 100_000_000
+    # Three sessions inside the same hour; each close() stores the open 1 h (and 1 min, 1 s) bucket.
+    parts = [_records(HOUR_NS + i * 1200 * SECOND_NS, 12_000, period_ns) for i in range(3)]
+    records = _write_in_sessions(path, parts)
+
+    with SessionStore(path) as store:
+        t_start = HOUR_NS + 100 * SECOND_NS
+        t_end = int(records["timestamp_ns"][-1])
+        resolution, buckets = store.overview(t_start, t_end, 10)
+
+    assert resolution == HOUR_NS
+    assert buckets.size == 1
+    assert int(buckets["count"][0]) == records.size
+    assert int(buckets["sum_mC"][0]) == int(records["temp_mC"].astype(np.int64).sum())
+    assert int(buckets["min_mC"][0]) == int(records["temp_mC"].min())
+    assert int(buckets["max_mC"][0]) == int(records["temp_mC"].max())
+
+
+def test_rollups_merge_the_buckets_repeated_by_a_continued_session(tmp_path):
+    path = tmp_path / "log.session.bin"
+    parts = [_records(HOUR_NS + i * 30 * SECOND_NS, 200, 100_000_000) for i in range(2)]
+    records = _write_in_sessions(path, parts)
+
+    with SessionStore(path) as store:
+        minutes = store.rollups(60 * SECOND_NS)
+
+    starts = minutes["start_ns"]
+    assert np.all(starts[1:] > starts[:-1])
+    assert int(minutes["count"].sum()) == records.size